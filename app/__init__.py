@@ -1,7 +1,32 @@
-"""Voice Translation App package."""
+"""Voice Translation App package.
 
-from .config import SUPPORTED_LANGUAGES, INPUT_DIR, OUTPUT_DIR
-from .stt import default_stt
-from .translator import default_translator
-from .tts import default_tts
-from .utils import cleanup_old_files 
\ No newline at end of file
+The names below are imported from their submodules on first access, so
+``import app`` does not load Whisper, torch or the network clients until
+something actually uses them.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "SUPPORTED_LANGUAGES": "config",
+    "INPUT_DIR": "config",
+    "OUTPUT_DIR": "config",
+    "default_stt": "stt",
+    "default_translator": "translator",
+    "default_tts": "tts",
+    "cleanup_old_files": "utils",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
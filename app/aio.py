@@ -0,0 +1,214 @@
+"""Asyncio API for the Voice Translation App.
+
+The stages underneath stay blocking, so each call runs in an executor:
+
+- Whisper gets its own single-thread executor. The model is CPU-bound and
+  already uses every core through torch, so running transcriptions side by
+  side would only make them contend.
+- Translation and speech requests are network-bound and run on a shared
+  pool of ``ASYNC_IO_WORKERS`` threads, so many of them can wait on their
+  provider at the same time.
+
+One event loop can therefore keep dozens of messages in flight: while one
+message is being transcribed, others are being translated or synthesized.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+from .config import ASYNC_IO_WORKERS, AUTO_LANGUAGE
+from .segmenter import segment_text
+from .stt import default_stt
+from .translator import default_translator
+from .tts import default_tts
+
+@dataclass
+class AsyncTranslation:
+    """Result of translating one voice message."""
+
+    transcript: str
+    translation: str
+    # Spoken language, detected by Whisper when the source was "auto"
+    source_lang: Optional[str]
+    # Translated speech, or None when there was nothing to say
+    audio: Optional[Union[str, bytes, BinaryIO]]
+
+class AsyncVoiceTranslator:
+    """Runs the speech-to-text, translation and text-to-speech stages from asyncio."""
+
+    def __init__(self, stt=None, translator=None, tts=None, io_workers: int = ASYNC_IO_WORKERS):
+        """
+        Initialize the translator. Executors are created on first use.
+
+        Args:
+            stt: Speech-to-text processor (defaults to default_stt)
+            translator: Translator (defaults to default_translator)
+            tts: Text-to-speech processor (defaults to default_tts)
+            io_workers: Threads for translation and speech requests
+        """
+        self.stt = stt or default_stt
+        self.translator = translator or default_translator
+        self.tts = tts or default_tts
+        self.io_workers = io_workers
+        self._whisper_executor = None
+        self._io_executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def whisper_executor(self) -> Executor:
+        """Single thread running Whisper."""
+        with self._lock:
+            if self._whisper_executor is None:
+                self._whisper_executor = ThreadPoolExecutor(1, thread_name_prefix="whisper")
+            return self._whisper_executor
+
+    @property
+    def io_executor(self) -> Executor:
+        """Threads running translation and speech requests."""
+        with self._lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(
+                    max(1, self.io_workers),
+                    thread_name_prefix="async-io"
+                )
+            return self._io_executor
+
+    async def _run(self, executor: Executor, func, *args, **kwargs):
+        """Await a blocking call on an executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    async def transcribe(
+        self,
+        audio: Union[str, Path, bytes],
+        language: Optional[str] = None
+    ) -> tuple[str, Optional[str]]:
+        """
+        Transcribe audio on the Whisper thread.
+
+        Args:
+            audio: Path to the audio file, or its raw bytes
+            language: Language code of the speech; None or "auto" to detect it
+
+        Returns:
+            tuple: (transcribed text, language code of the speech)
+        """
+        return await self._run(
+            self.whisper_executor,
+            self.stt.transcribe_with_language,
+            audio,
+            language=language
+        )
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            str: Translated text
+        """
+        return await self._run(
+            self.io_executor,
+            self.translator.translate_text,
+            text,
+            source_lang=source_lang,
+            target_lang=target_lang
+        )
+
+    async def synthesize(self, text: str, lang_code: str, **kwargs) -> Union[str, bytes, BinaryIO]:
+        """
+        Convert text to speech.
+
+        Args:
+            text: Text to convert
+            lang_code: Language code
+            **kwargs: Additional arguments for synthesize_speech; audio is
+                returned as bytes unless ``return_type`` says otherwise
+
+        Returns:
+            The audio, as chosen by ``return_type``
+        """
+        kwargs.setdefault("return_type", "bytes")
+        return await self._run(self.io_executor, self.tts.synthesize_speech, text, lang_code, **kwargs)
+
+    async def _speak(self, text: str, lang_code: str, **tts_kwargs) -> Union[str, bytes, BinaryIO]:
+        """Synthesize every chunk of ``text`` concurrently and join them in order."""
+        chunks = segment_text(text, lang_code, self.tts.backend.max_chars)
+        if len(chunks) <= 1:
+            return await self.synthesize(text, lang_code, **tts_kwargs)
+
+        output_path = tts_kwargs.pop("output_path", None)
+        return_type = tts_kwargs.pop("return_type", "bytes")
+        parts = await asyncio.gather(*(
+            self.synthesize(chunk, lang_code, return_type="bytes", **tts_kwargs)
+            for chunk in chunks
+        ))
+        return await self._run(
+            self.io_executor,
+            self.tts.combine_audio_files,
+            parts,
+            output_path=output_path,
+            output_format=tts_kwargs.get("output_format", "mp3"),
+            return_type=return_type
+        )
+
+    async def translate_audio(
+        self,
+        audio: Union[str, Path, bytes],
+        source_lang: str,
+        target_lang: str,
+        **tts_kwargs
+    ) -> AsyncTranslation:
+        """
+        Translate a voice message end to end.
+
+        The translated text is split into the chunks the speech provider
+        takes in one request, and the chunks are synthesized concurrently
+        instead of one after another.
+
+        Args:
+            audio: Path to the input audio file, or its raw bytes
+            source_lang: Source language code, or "auto" to detect it
+            target_lang: Target language code
+            **tts_kwargs: Additional arguments for synthesize_speech
+
+        Returns:
+            AsyncTranslation: Transcript, translation and translated speech
+        """
+        language = None if source_lang == AUTO_LANGUAGE else source_lang
+        transcript, spoken = await self.transcribe(audio, language)
+        spoken = spoken or language
+        if not transcript.strip():
+            return AsyncTranslation(transcript, "", spoken, None)
+
+        translation = await self.translate(transcript, spoken, target_lang)
+        speech = None
+        if translation and translation.strip():
+            speech = await self._speak(translation, target_lang, **tts_kwargs)
+        return AsyncTranslation(transcript, translation, spoken, speech)
+
+    def close(self) -> None:
+        """Shut down the executors, waiting for running calls to finish."""
+        with self._lock:
+            executors = (self._whisper_executor, self._io_executor)
+            self._whisper_executor = self._io_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+# Default instance and module-level shortcuts to it
+default_async_translator = AsyncVoiceTranslator()
+
+transcribe = default_async_translator.transcribe
+translate = default_async_translator.translate
+synthesize = default_async_translator.synthesize
+translate_audio = default_async_translator.translate_audio
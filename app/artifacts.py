@@ -0,0 +1,217 @@
+"""Background reaping of audio files created by the Voice Translation App."""
+
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+from .config import (
+    ARTIFACT_MAX_AGE_HOURS,
+    ARTIFACT_MAX_BYTES,
+    ARTIFACT_MAX_FILES,
+    ARTIFACT_REAP_INTERVAL,
+    INPUT_DIR,
+    OUTPUT_DIR,
+)
+
+class ArtifactStore:
+    """In-memory index of created files with age, count and size quotas.
+
+    Files are registered when they are written, so enforcing the quotas
+    never needs a directory scan: the oldest files are at the front of the
+    index and expiry times sit in a heap. A daemon thread removes expired
+    files periodically, and sooner when a quota is exceeded. Files left over
+    from earlier runs are adopted by a single scan in the background thread.
+    """
+
+    def __init__(
+        self,
+        max_age_hours: float = ARTIFACT_MAX_AGE_HOURS,
+        max_files: int = ARTIFACT_MAX_FILES,
+        max_bytes: int = ARTIFACT_MAX_BYTES,
+        interval: float = ARTIFACT_REAP_INTERVAL,
+        adopt_dirs: tuple = (INPUT_DIR, OUTPUT_DIR),
+        exclude_prefixes: tuple = ("tts_cache_", ".")
+    ):
+        """
+        Initialize the store. The reaper thread starts on first registration.
+
+        Args:
+            max_age_hours: Default lifetime of a registered file
+            max_files: Maximum number of tracked files
+            max_bytes: Maximum total size of tracked files
+            interval: Seconds between background sweeps
+            adopt_dirs: Directories whose existing files are tracked on startup
+            exclude_prefixes: Filename prefixes of files managed elsewhere
+        """
+        self.max_age = max_age_hours * 3600
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.adopt_dirs = adopt_dirs
+        self.exclude_prefixes = exclude_prefixes
+        self._entries = OrderedDict()  # path -> (size, expires)
+        self._expiry = []  # heap of (expires, path)
+        self._total = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def register(
+        self,
+        path: Union[str, Path],
+        ttl: Optional[float] = None,
+        size: Optional[int] = None
+    ) -> str:
+        """
+        Track a file so it is removed once it expires or a quota is exceeded.
+
+        Registering a path again refreshes it.
+
+        Args:
+            path: File to track
+            ttl: Lifetime in seconds (defaults to the store's max age)
+            size: File size in bytes, if already known
+
+        Returns:
+            str: The path, for chaining
+        """
+        path = str(path)
+        if size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return path
+        expires = time.time() + (self.max_age if ttl is None else ttl)
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._total -= previous[0]
+            self._entries[path] = (size, expires)
+            self._total += size
+            heapq.heappush(self._expiry, (expires, path))
+            over_quota = len(self._entries) > self.max_files or self._total > self.max_bytes
+
+        self._ensure_started()
+        if over_quota:
+            self._wake.set()
+        return path
+
+    def forget(self, path: Union[str, Path]) -> None:
+        """Stop tracking a file without deleting it."""
+        with self._lock:
+            entry = self._entries.pop(str(path), None)
+            if entry is not None:
+                self._total -= entry[0]
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """
+        Delete expired files and the oldest files beyond the quotas.
+
+        Args:
+            now: Current time (defaults to time.time())
+
+        Returns:
+            int: Number of files removed from the index
+        """
+        now = time.time() if now is None else now
+        doomed = []
+        with self._lock:
+            # Expired entries; heap items for refreshed or forgotten paths are stale
+            while self._expiry and self._expiry[0][0] <= now:
+                expires, path = heapq.heappop(self._expiry)
+                entry = self._entries.get(path)
+                if entry is not None and entry[1] == expires:
+                    del self._entries[path]
+                    self._total -= entry[0]
+                    doomed.append(path)
+
+            # Oldest entries beyond the count and size quotas
+            while self._entries and (
+                len(self._entries) > self.max_files or self._total > self.max_bytes
+            ):
+                path, (size, _) = self._entries.popitem(last=False)
+                self._total -= size
+                doomed.append(path)
+
+            # Drop stale heap items once they dominate the heap
+            if len(self._expiry) > 2 * len(self._entries) + 64:
+                self._expiry = [
+                    (entry[1], path) for path, entry in self._entries.items()
+                ]
+                heapq.heapify(self._expiry)
+
+        # Delete outside the lock so registration is never blocked on disk I/O
+        for path in doomed:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        return len(doomed)
+
+    def adopt(self, directory: Union[str, Path]) -> None:
+        """Track files already present in a directory, aging them from their mtime."""
+        directory = Path(directory)
+        if not directory.exists():
+            return
+        files = []
+        for path in directory.iterdir():
+            if path.name.startswith(self.exclude_prefixes):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                files.append((stat.st_mtime, str(path), stat.st_size))
+
+        with self._lock:
+            # Leftovers predate anything registered since startup, so they go
+            # to the front of the index, newest last among themselves
+            for mtime, path, size in sorted(files, reverse=True):
+                if path in self._entries:
+                    continue
+                expires = mtime + self.max_age
+                self._entries[path] = (size, expires)
+                self._entries.move_to_end(path, last=False)
+                self._total += size
+                heapq.heappush(self._expiry, (expires, path))
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the tracked files."""
+        with self._lock:
+            return self._total
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _ensure_started(self) -> None:
+        """Start the reaper thread once."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="artifact-reaper",
+                daemon=True
+            )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Reaper loop: adopt leftovers once, then sweep periodically."""
+        for directory in self.adopt_dirs:
+            self.adopt(directory)
+        while True:
+            self.reap()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+# Create a default instance; its reaper starts with the first registered file
+default_artifacts = ArtifactStore()
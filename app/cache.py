@@ -0,0 +1,391 @@
+"""Caching helpers for the Voice Translation App."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Union
+from .metrics import record_cache
+
+class LRUCache:
+    """Thread-safe in-process cache that keeps the most recently used entries."""
+
+    def __init__(self, max_entries: int = 1024, name: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries to keep
+            name: Optional name under which hits and misses are counted
+        """
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if the key is not cached
+        """
+        with self._lock:
+            hit = key in self._entries
+            if hit:
+                self._entries.move_to_end(key)
+            value = self._entries.get(key)
+        if self.name:
+            record_cache(self.name, hit)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteCache:
+    """Persistent key/value cache stored in SQLite with LRU eviction.
+
+    Entries record their last access time; once the cache grows past
+    ``max_entries`` (or ``max_bytes`` of stored values) the least recently
+    used entries are deleted. The database is opened lazily on first use and
+    the connection is shared between threads. SQLite connections must not
+    cross a fork, so a forked process opens its own connection on first use.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        name: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of entries to keep
+            max_bytes: Optional cap on the total size of stored values
+            name: Optional name under which hits and misses are counted
+        """
+        self.path = Path(path)
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn = None
+        # Process that opened _conn
+        self._pid = None
+        # Connections inherited through fork. They are kept open because
+        # closing them in the child could disturb the parent's database.
+        self._inherited = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the table on first use in this process."""
+        if self._conn is not None and self._pid != os.getpid():
+            self._inherited.append(self._conn)
+            self._conn = None
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=30,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "accessed REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Union[str, bytes]]:
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The stored value, or None if the key is not cached
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    (time.time(), key)
+                )
+        if self.name:
+            record_cache(self.name, row is not None)
+        return None if row is None else row[0]
+
+    def set(self, key: str, value: Union[str, bytes]) -> None:
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Text or bytes to store
+        """
+        size = len(value.encode("utf-8") if isinstance(value, str) else value)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used entries until the caps are met."""
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+        if self.max_bytes is not None and total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed"
+            ).fetchall()
+            stale = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM entries"
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._connect().execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class FileCache:
+    """Content-addressed files in a directory with a byte budget and LRU eviction.
+
+    Cached files are named ``<prefix><key><extension>``. The index of cached
+    files is built from a single directory scan on first use and then kept
+    in memory. Files may also be removed by someone else (for example
+    ``utils.cleanup_old_files``); such entries are simply dropped from the
+    index when they are next looked up. A hit refreshes the file's
+    modification time so age-based cleanup keeps frequently used entries.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int,
+        prefix: str = "cache_",
+        name: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached files
+            max_bytes: Maximum total size of cached files
+            prefix: Filename prefix marking files owned by this cache
+            name: Optional name under which hits and misses are counted
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self._index = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> OrderedDict:
+        """Scan the directory once to rebuild the index, oldest first."""
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for path in self.directory.glob(f"{self.prefix}*"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.name, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((name, size) for _, name, size in entries)
+            self._total = sum(self._index.values())
+        return self._index
+
+    def path_for(self, key: str, extension: str) -> Path:
+        """Return the path a cached file for ``key`` lives at."""
+        return self.directory / f"{self.prefix}{key}{extension}"
+
+    def get(self, key: str, extension: str) -> Optional[Path]:
+        """
+        Look up a cached file.
+
+        Args:
+            key: Content key
+            extension: File extension including the dot (e.g., ".mp3")
+
+        Returns:
+            Path to the cached file, or None if it is not cached
+        """
+        path = self.path_for(key, extension)
+        with self._lock:
+            index = self._load_index()
+            found = path.name in index
+            if found:
+                try:
+                    os.utime(path)
+                    index.move_to_end(path.name)
+                except OSError:
+                    # Removed behind our back
+                    self._total -= index.pop(path.name)
+                    found = False
+        if self.name:
+            record_cache(self.name, found)
+        return path if found else None
+
+    def put(
+        self,
+        key: str,
+        extension: str,
+        source: Union[str, Path, bytes],
+        move: bool = False
+    ) -> Path:
+        """
+        Add a file to the cache.
+
+        Args:
+            key: Content key
+            extension: File extension including the dot (e.g., ".mp3")
+            source: Existing file with the content to cache, or the content itself
+            move: Whether to move ``source`` into the cache instead of copying it
+
+        Returns:
+            Path to the cached file
+        """
+        path = self.path_for(key, extension)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if move and not isinstance(source, bytes):
+            os.replace(source, path)
+        else:
+            # Write under a unique temporary name so readers never see a
+            # partial file and concurrent puts of one key do not collide
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    if isinstance(source, bytes):
+                        f.write(source)
+                    else:
+                        with open(source, "rb") as src:
+                            shutil.copyfileobj(src, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        size = path.stat().st_size
+
+        with self._lock:
+            index = self._load_index()
+            self._total -= index.pop(path.name, 0)
+            index[path.name] = size
+            self._total += size
+            self._evict(keep=path.name)
+        return path
+
+    def discard(self, key: str, extension: str) -> None:
+        """
+        Drop a file from the index after it was found missing.
+
+        Args:
+            key: Content key
+            extension: File extension including the dot (e.g., ".mp3")
+        """
+        name = self.path_for(key, extension).name
+        with self._lock:
+            index = self._load_index()
+            self._total -= index.pop(name, 0)
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used files until the byte budget is met."""
+        while self._total > self.max_bytes and len(self._index) > 1:
+            name, size = next(iter(self._index.items()))
+            if name == keep:
+                break
+            del self._index[name]
+            self._total -= size
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the files currently in the index."""
+        with self._lock:
+            self._load_index()
+            return self._total
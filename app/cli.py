@@ -0,0 +1,340 @@
+"""Command-line batch translation of voice messages.
+
+Example:
+    python -m app.cli voice_notes/ --source es --target en --output-dir out/
+
+Inputs are audio files found in a directory (recursively) or listed in a
+manifest file, one path per line. Each file is transcribed, translated and
+synthesized on a pool of worker processes. Results are written to the
+output directory together with a ``manifest.jsonl`` file holding one record
+per processed item. Rerunning the same command skips items that already
+succeeded, so an interrupted run can simply be restarted.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+from .config import (
+    AUTO_LANGUAGE,
+    METRICS_LOG_JSON,
+    SUPPORTED_AUDIO_FORMATS,
+    SUPPORTED_LANGUAGES,
+    WHISPER_MODEL,
+    WHISPER_PRECISION,
+    WHISPER_PRECISIONS,
+)
+from .metrics import configure_logging, profiled
+
+# Per-process state, created once by the pool initializer
+_worker = {}
+
+def find_inputs(source: Path) -> list[Path]:
+    """
+    Collect the audio files to process.
+
+    Args:
+        source: Directory to search recursively, or a manifest file listing
+            one audio path per line (relative paths are resolved against
+            the manifest's directory)
+
+    Returns:
+        list[Path]: Audio files in a stable order
+    """
+    if source.is_dir():
+        return sorted(
+            path for path in source.rglob("*")
+            if path.is_file() and path.suffix.lower() in SUPPORTED_AUDIO_FORMATS
+        )
+
+    paths = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = Path(line)
+            if not path.is_absolute():
+                path = source.parent / path
+            paths.append(path)
+    return paths
+
+def load_completed(manifest_path: Path) -> set[str]:
+    """Return the ids of items recorded as successful in an existing manifest."""
+    completed = set()
+    if not manifest_path.exists():
+        return completed
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from a crash
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["id"])
+    return completed
+
+def _end_partial_line(manifest_path: Path) -> None:
+    """Terminate a partially written last record so new records start on their own line."""
+    if not manifest_path.exists():
+        return
+    with open(manifest_path, "rb+") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+def item_id(path: Path, source_lang: str, target_lang: str) -> str:
+    """Identify a unit of work by input file and language pair."""
+    return f"{path.resolve()}:{source_lang}:{target_lang}"
+
+def output_name(path: Path, root: Path) -> str:
+    """Derive a collision-free output file stem from an input path."""
+    try:
+        relative = path.resolve().relative_to(root.resolve())
+    except ValueError:
+        relative = Path(path.name)
+    return "__".join(relative.with_suffix("").parts)
+
+def _init_worker(model_name: str, precision: str, threads: int, log_json: bool) -> None:
+    """Build the processors once per worker process."""
+    configure_logging(log_json)
+    from .stt import SpeechToText, default_stt
+    from .translator import default_translator
+    from .tts import default_tts
+
+    # Share the transcript cache so reruns skip transcriptions already done
+    stt = SpeechToText(
+        model_name=model_name,
+        precision=precision,
+        transcript_cache=default_stt.transcript_cache,
+        parallel_workers=1,
+        threads=threads
+    )
+    stt.model  # Load the model before the first item arrives
+    _worker.update(stt=stt, translator=default_translator, tts=default_tts)
+
+def _process(
+    path: str,
+    name: str,
+    output_dir: str,
+    source_lang: str,
+    target_lang: str
+) -> dict:
+    """Run one file through the pipeline inside a worker process."""
+    with profiled(f"cli-{name}"):
+        return _run_pipeline(path, name, output_dir, source_lang, target_lang)
+
+def _run_pipeline(
+    path: str,
+    name: str,
+    output_dir: str,
+    source_lang: str,
+    target_lang: str
+) -> dict:
+    """Transcribe, translate and synthesize one file."""
+    started = time.perf_counter()
+    transcript, detected_lang = _worker["stt"].transcribe_with_language(path, language=source_lang)
+    translation = _worker["translator"].translate_text(
+        transcript,
+        source_lang=detected_lang,
+        target_lang=target_lang
+    )
+
+    text_path = Path(output_dir) / f"{name}.{target_lang}.txt"
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(translation)
+
+    audio_path = None
+    if translation and translation.strip():
+        audio_path = _worker["tts"].synthesize_speech(
+            translation,
+            lang_code=target_lang,
+            output_path=Path(output_dir) / f"{name}.{target_lang}.mp3"
+        )
+
+    return {
+        "detected": detected_lang,
+        "transcript": transcript,
+        "translation": translation,
+        "text": str(text_path),
+        "audio": audio_path,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+def run_batch(
+    source: Path,
+    output_dir: Path,
+    source_lang: str,
+    target_lang: str,
+    workers: int = 2,
+    model_name: str = WHISPER_MODEL,
+    manifest_path: Optional[Path] = None,
+    precision: str = WHISPER_PRECISION,
+    threads: int = 0,
+    log_json: bool = METRICS_LOG_JSON
+) -> tuple[int, int, int]:
+    """
+    Translate every audio file under ``source``.
+
+    Args:
+        source: Input directory or manifest file
+        output_dir: Directory for translated text, audio and the manifest
+        source_lang: Source language code, or "auto" to detect it per file
+        target_lang: Target language code
+        workers: Number of worker processes
+        model_name: Whisper model to use
+        manifest_path: Results manifest (defaults to output_dir/manifest.jsonl)
+        precision: Whisper inference precision ("fp32", "fp16" or "int8")
+        threads: Torch threads per worker (0 = split the CPUs evenly)
+        log_json: Whether workers write per-stage JSON logs to stderr
+
+    Returns:
+        tuple: (succeeded, failed, skipped) item counts
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = manifest_path or output_dir / "manifest.jsonl"
+    root = source if source.is_dir() else source.parent
+
+    completed = load_completed(manifest_path)
+    pending = []
+    skipped = 0
+    for path in find_inputs(source):
+        key = item_id(path, source_lang, target_lang)
+        if key in completed:
+            skipped += 1
+        else:
+            pending.append((key, path))
+
+    succeeded = failed = 0
+    if not pending:
+        return succeeded, failed, skipped
+
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    _end_partial_line(manifest_path)
+    with open(manifest_path, "a", encoding="utf-8") as manifest, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_name, precision, threads, log_json)
+    ) as executor:
+        futures = {
+            executor.submit(
+                _process,
+                str(path),
+                output_name(path, root),
+                str(output_dir),
+                source_lang,
+                target_lang
+            ): (key, path)
+            for key, path in pending
+        }
+        for future in as_completed(futures):
+            key, path = futures[future]
+            record = {
+                "id": key,
+                "input": str(path),
+                "source": source_lang,
+                "target": target_lang,
+            }
+            try:
+                record.update(future.result())
+                record["status"] = "ok"
+                succeeded += 1
+            except Exception as e:
+                record["status"] = "error"
+                record["error"] = f"{type(e).__name__}: {e}"
+                failed += 1
+
+            # One durable line per item is what makes resuming safe
+            manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            manifest.flush()
+            os.fsync(manifest.fileno())
+            print(
+                f"[{succeeded + failed}/{len(pending)}] {record['status']}: {path}",
+                file=sys.stderr
+            )
+
+    return succeeded, failed, skipped
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for ``python -m app.cli``."""
+    parser = argparse.ArgumentParser(
+        description="Translate a directory or manifest of voice messages."
+    )
+    parser.add_argument("input", type=Path, help="Directory of audio files or manifest file")
+    parser.add_argument(
+        "--source",
+        default=AUTO_LANGUAGE,
+        choices=[AUTO_LANGUAGE, *SUPPORTED_LANGUAGES],
+        help="Source language code (default: detect per file)"
+    )
+    parser.add_argument(
+        "--target",
+        required=True,
+        choices=SUPPORTED_LANGUAGES,
+        help="Target language code"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("translated"),
+        help="Directory for results"
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Results manifest (default: <output-dir>/manifest.jsonl)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 1) // 2),
+        help="Worker processes"
+    )
+    parser.add_argument("--model", default=WHISPER_MODEL, help="Whisper model name")
+    parser.add_argument(
+        "--precision",
+        default=WHISPER_PRECISION,
+        choices=WHISPER_PRECISIONS,
+        help="Whisper inference precision (int8 = quantized, CPU only)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=0,
+        help="Torch threads per worker (default: CPUs / workers)"
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        default=METRICS_LOG_JSON,
+        help="Write per-stage timing records to stderr as JSON lines"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.input.exists():
+        parser.error(f"Input not found: {args.input}")
+
+    succeeded, failed, skipped = run_batch(
+        args.input,
+        args.output_dir,
+        args.source,
+        args.target,
+        workers=max(1, args.workers),
+        model_name=args.model,
+        manifest_path=args.manifest,
+        precision=args.precision,
+        threads=max(0, args.threads),
+        log_json=args.log_json
+    )
+    print(f"Done: {succeeded} succeeded, {failed} failed, {skipped} skipped", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
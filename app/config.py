@@ -2,16 +2,17 @@
 
 import os
 from pathlib import Path
-import streamlit as st
+from dotenv import load_dotenv
 
-# Project paths
+# Project paths; directories are created by the code that writes into them
 BASE_DIR = Path(__file__).parent.parent
+
+# Settings below are read on import, so a .env file is loaded first; it only
+# fills in variables the environment does not already set
+load_dotenv(BASE_DIR / ".env")
 INPUT_DIR = BASE_DIR / "assets" / "input"
 OUTPUT_DIR = BASE_DIR / "assets" / "output"
-
-# Create directories if they don't exist
-INPUT_DIR.mkdir(parents=True, exist_ok=True)
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = BASE_DIR / "assets" / "cache"
 
 # API Keys - Try multiple methods to get the key
 def get_openai_api_key():
@@ -22,6 +23,7 @@ def get_openai_api_key():
         
     # Try streamlit secrets
     try:
+        import streamlit as st
         api_key = st.secrets["OPENAI_API_KEY"]
         if api_key:
             return api_key
@@ -33,11 +35,95 @@ def get_openai_api_key():
         "OpenAI API key not found. Please set it in Streamlit secrets or as an environment variable."
     )
 
-OPENAI_API_KEY = get_openai_api_key()
+def __getattr__(name):
+    # OPENAI_API_KEY is looked up when it is first read, not on import
+    if name == "OPENAI_API_KEY":
+        return get_openai_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Whisper model settings
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+# Inference precisions: fp16 needs a GPU, int8 (quantized) runs on CPU only
+WHISPER_PRECISIONS = ("fp32", "fp16", "int8")
+WHISPER_PRECISION = os.environ.get("WHISPER_PRECISION", "fp32")
+# Torch intra-op threads per process for Whisper (0 = torch's default)
+WHISPER_THREADS = int(os.environ.get("WHISPER_THREADS", "0"))
+# Maximum number of Whisper models kept resident in memory at once
+WHISPER_MAX_RESIDENT_MODELS = int(os.environ.get("WHISPER_MAX_RESIDENT_MODELS", "2"))
+# Recordings at least this long are transcribed in parallel windows
+WHISPER_PARALLEL_MIN_SECONDS = float(os.environ.get("WHISPER_PARALLEL_MIN_SECONDS", "120"))
+# Worker processes for parallel transcription (0 = one per CPU, up to 4)
+WHISPER_PARALLEL_WORKERS = int(os.environ.get("WHISPER_PARALLEL_WORKERS", "0"))
+
+# Transcript cache settings
+TRANSCRIPT_CACHE_PATH = CACHE_DIR / "transcripts.sqlite3"
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_ENTRIES", "5000"))
+
+# Translation engine: "google" (network) or "marian" (local MarianMT models)
+TRANSLATION_BACKEND = os.environ.get("TRANSLATION_BACKEND", "google")
+# Hugging Face model names used by the marian backend
+MARIAN_MODEL_TEMPLATE = os.environ.get("MARIAN_MODEL_TEMPLATE", "Helsinki-NLP/opus-mt-{source}-{target}")
+# Sentences per inference batch for local translation models
+TRANSLATION_BATCH_SIZE = int(os.environ.get("TRANSLATION_BATCH_SIZE", "16"))
+
+# Translation cache settings
+TRANSLATION_MEMORY_CACHE_SIZE = int(os.environ.get("TRANSLATION_MEMORY_CACHE_SIZE", "4096"))
+# Persistent SQLite tier behind the memory cache; off unless a path is set
+TRANSLATION_CACHE_PATH = os.environ.get("TRANSLATION_CACHE_PATH") or None
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.environ.get("TRANSLATION_CACHE_MAX_ENTRIES", "100000"))
+
+# Speech engine: "gtts" (network) or "espeak" (local espeak-ng)
+TTS_BACKEND = os.environ.get("TTS_BACKEND", "gtts")
+# espeak-ng executable used by the espeak backend
+ESPEAK_COMMAND = os.environ.get("ESPEAK_COMMAND", "espeak-ng")
+
+# Engines used while the network provider is failing ("" = none)
+TRANSLATION_FALLBACK_BACKEND = os.environ.get("TRANSLATION_FALLBACK_BACKEND", "")
+TTS_FALLBACK_BACKEND = os.environ.get("TTS_FALLBACK_BACKEND", "")
+
+# External provider (Google Translate, gTTS) client settings
+PROVIDER_POOL_SIZE = int(os.environ.get("PROVIDER_POOL_SIZE", "16"))
+# Requests per second per provider (0 = unlimited) and the allowed burst
+PROVIDER_RATE_LIMIT = float(os.environ.get("PROVIDER_RATE_LIMIT", "10"))
+PROVIDER_BURST = int(os.environ.get("PROVIDER_BURST", "20"))
+PROVIDER_MAX_RETRIES = int(os.environ.get("PROVIDER_MAX_RETRIES", "3"))
+PROVIDER_RETRY_BACKOFF = float(os.environ.get("PROVIDER_RETRY_BACKOFF", "0.5"))
+PROVIDER_TIMEOUT = float(os.environ.get("PROVIDER_TIMEOUT", "10"))
+# Consecutive failures that make a provider fail fast, and for how long
+PROVIDER_FAILURE_THRESHOLD = int(os.environ.get("PROVIDER_FAILURE_THRESHOLD", "5"))
+PROVIDER_RESET_SECONDS = float(os.environ.get("PROVIDER_RESET_SECONDS", "30"))
+
+# Write every stage's JSON record to stderr ("1" to enable); the CLI's
+# --log-json flag does the same
+METRICS_LOG_JSON = os.environ.get("METRICS_LOG_JSON", "").lower() in ("1", "true", "yes")
+# Directory for a cProfile dump of every API job and CLI item (unset = off)
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or None
+
+# Synthesized speech cache settings
+TTS_CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Generated file retention settings
+ARTIFACT_MAX_AGE_HOURS = float(os.environ.get("ARTIFACT_MAX_AGE_HOURS", "24"))
+ARTIFACT_MAX_FILES = int(os.environ.get("ARTIFACT_MAX_FILES", "1000"))
+ARTIFACT_MAX_BYTES = int(os.environ.get("ARTIFACT_MAX_BYTES", str(500 * 1024 * 1024)))
+ARTIFACT_REAP_INTERVAL = float(os.environ.get("ARTIFACT_REAP_INTERVAL", "60"))
+
+# Translation job queue settings
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", "32"))
+# Number of finished jobs kept around for clients to fetch
+JOB_HISTORY_SIZE = int(os.environ.get("JOB_HISTORY_SIZE", "1000"))
+
+# Threads running translation and speech requests for the asyncio API; this
+# bounds how many network calls are in flight at once
+ASYNC_IO_WORKERS = int(os.environ.get("ASYNC_IO_WORKERS", "32"))
 
 # Supported file formats
 SUPPORTED_AUDIO_FORMATS = [".mp3", ".wav", ".m4a"]
 
+# Source language value that asks Whisper to identify the language
+AUTO_LANGUAGE = "auto"
+
 # Supported languages (ISO 639-1 codes)
 SUPPORTED_LANGUAGES = {
     "en": "English",
@@ -0,0 +1,247 @@
+"""In-process job queue for voice translation requests."""
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from .config import (
+    AUTO_LANGUAGE,
+    JOB_HISTORY_SIZE,
+    JOB_QUEUE_SIZE,
+    JOB_WORKERS,
+    OUTPUT_DIR,
+    SUPPORTED_LANGUAGES,
+)
+from .metrics import default_metrics, profiled, record_queue_wait, stage
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+@dataclass
+class Job:
+    """A voice message waiting for or going through translation."""
+
+    id: str
+    source_lang: str
+    target_lang: str
+    audio: Optional[bytes] = None
+    status: str = "queued"
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    detected_lang: Optional[str] = None
+    transcript: Optional[str] = None
+    translation: Optional[str] = None
+    audio_path: Optional[str] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> dict:
+        """Public view of the job, without the input audio."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "source_lang": self.source_lang,
+            "target_lang": self.target_lang,
+            "detected_lang": self.detected_lang,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "transcript": self.transcript,
+            "translation": self.translation,
+            "error": self.error,
+        }
+
+class JobQueue:
+    """Bounded job queue drained by a pool of worker threads.
+
+    Workers share the process's STT, translation and TTS instances, so the
+    Whisper model is loaded once and stays warm across jobs. When the queue
+    is full, ``submit`` raises QueueFullError instead of accepting more work.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_queue: int = JOB_QUEUE_SIZE,
+        max_history: int = JOB_HISTORY_SIZE,
+        stt=None,
+        translator=None,
+        tts=None
+    ):
+        """
+        Initialize the queue. Workers start on the first submitted job.
+
+        Args:
+            workers: Number of worker threads
+            max_queue: Maximum number of jobs waiting to start
+            max_history: Maximum number of jobs remembered for status lookups
+            stt: Speech-to-text processor (defaults to default_stt)
+            translator: Translator (defaults to default_translator)
+            tts: Text-to-speech processor (defaults to default_tts)
+        """
+        self.workers = workers
+        self.max_history = max_history
+        self._stt = stt
+        self._translator = translator
+        self._tts = tts
+        self._queue = queue.Queue(max_queue)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self) -> None:
+        """Start the worker threads and warm up the Whisper model."""
+        with self._lock:
+            if self._threads:
+                return
+            if self._stt is None:
+                from .stt import default_stt
+                self._stt = default_stt
+            if self._translator is None:
+                from .translator import default_translator
+                self._translator = default_translator
+            if self._tts is None:
+                from .tts import default_tts
+                self._tts = default_tts
+
+            threading.Thread(
+                target=lambda: self._stt.model,
+                name="job-warmup",
+                daemon=True
+            ).start()
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"job-worker-{i}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, audio: bytes, source_lang: str, target_lang: str) -> Job:
+        """
+        Enqueue a voice message for translation.
+
+        Args:
+            audio: Raw encoded audio bytes
+            source_lang: Source language code (e.g., "en", "es"), or "auto"
+            target_lang: Target language code
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            ValueError: If a language code is not supported
+            QueueFullError: If the queue is at capacity
+        """
+        if source_lang not in SUPPORTED_LANGUAGES and source_lang != AUTO_LANGUAGE:
+            raise ValueError(f"Unsupported source language: {source_lang}")
+        if target_lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported target language: {target_lang}")
+
+        self.start()
+        job = Job(
+            id=uuid.uuid4().hex,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            audio=audio
+        )
+        with self._lock:
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs once the history is full
+            for old_id in list(self._jobs):
+                if len(self._jobs) <= self.max_history:
+                    break
+                if self._jobs[old_id].done.is_set():
+                    del self._jobs[old_id]
+
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFullError("Translation queue is full") from None
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """
+        Wait for a job to finish.
+
+        Args:
+            job_id: Job id
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            Job: The job (finished unless the timeout expired), or None if unknown
+        """
+        job = self.get(job_id)
+        if job is not None:
+            job.done.wait(timeout)
+        return job
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting to start."""
+        return self._queue.qsize()
+
+    def _work(self) -> None:
+        """Worker loop: run jobs until the process exits."""
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job) -> None:
+        """Take one job through transcription, translation and synthesis."""
+        job.status = "running"
+        job.started = time.time()
+        record_queue_wait("jobs", job.started - job.created)
+        try:
+            with profiled(f"job-{job.id}"), stage("job", job_id=job.id):
+                self._run_stages(job)
+            job.status = "done"
+        except Exception as e:
+            job.status = "error"
+            job.error = str(e)
+        finally:
+            job.audio = None
+            job.finished = time.time()
+            job.done.set()
+            default_metrics.inc("jobs_total", help="Finished jobs by status", status=job.status)
+
+    def _run_stages(self, job: Job) -> None:
+        """Run the pipeline stages for a job, filling in its results."""
+        job.transcript, job.detected_lang = self._stt.transcribe_with_language(
+            job.audio,
+            language=job.source_lang
+        )
+        job.translation = self._translator.translate_text(
+            job.transcript,
+            source_lang=job.detected_lang,
+            target_lang=job.target_lang
+        )
+        if job.translation and job.translation.strip():
+            # Give the job its own copy of the audio; a file in the TTS
+            # cache may be evicted while clients can still fetch the job
+            OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+            job.audio_path = self._tts.synthesize_speech(
+                job.translation,
+                lang_code=job.target_lang,
+                output_path=OUTPUT_DIR / f"job_{job.id}.mp3"
+            )
+            if getattr(self._tts, "artifacts", None) is not None:
+                self._tts.artifacts.register(job.audio_path)
+
+# Create a default instance; worker threads start on first use
+default_job_queue = JobQueue()
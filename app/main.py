@@ -1,17 +1,24 @@
 """Main Streamlit application for the Voice Translation App."""
 
 import os
-import tempfile
 from pathlib import Path
 import streamlit as st
 from pydub import AudioSegment
 import soundfile as sf
 
-from .config import SUPPORTED_LANGUAGES, INPUT_DIR, OUTPUT_DIR
-from .stt import default_stt
+from .config import AUTO_LANGUAGE, SUPPORTED_LANGUAGES, INPUT_DIR
+from .pipeline import default_pipeline
 from .translator import default_translator
 from .tts import default_tts
-from .utils import cleanup_old_files
+from .artifacts import default_artifacts
+from .utils import content_hash, save_audio_file
+from .metrics import configure_logging
+
+# Per-stage JSON logs, when METRICS_LOG_JSON is set
+configure_logging()
+
+# Uploads are only needed while a session is working with them
+UPLOAD_TTL_SECONDS = 2 * 3600
 
 # Set page config
 st.set_page_config(
@@ -54,20 +61,204 @@ def init_session_state():
     """Initialize session state variables."""
     if "audio_path" not in st.session_state:
         st.session_state.audio_path = None
+    if "audio_hash" not in st.session_state:
+        st.session_state.audio_hash = None
     if "transcript" not in st.session_state:
         st.session_state.transcript = None
     if "translation" not in st.session_state:
         st.session_state.translation = None
     if "output_audio" not in st.session_state:
         st.session_state.output_audio = None
+    if "artifacts" not in st.session_state:
+        # Stage results keyed by audio content hash and stage parameters
+        st.session_state.artifacts = {}
+
+def save_audio_input(audio_data: bytes, suffix: str) -> tuple[str, str]:
+    """
+    Store input audio under its content hash and return (hash, path).
+
+    Reruns with the same upload or recording reuse the existing file
+    instead of writing a new one.
+    """
+    audio_hash = content_hash(audio_data)
+    path = INPUT_DIR / f"upload_{audio_hash[:16]}{suffix.lower()}"
+    if not path.exists():
+        save_audio_file(audio_data, filename=path.name, directory=INPUT_DIR)
+    # Each rerun refreshes the upload's lifetime while the session uses it
+    default_artifacts.register(path, ttl=UPLOAD_TTL_SECONDS, size=len(audio_data))
+    return audio_hash, str(path)
+
+def set_audio_input(audio_data: bytes, suffix: str) -> None:
+    """Make the given audio the current input."""
+    audio_hash, path = save_audio_input(audio_data, suffix)
+    st.session_state.audio_hash = audio_hash
+    st.session_state.audio_path = path
+
+def get_artifact(*key):
+    """Return a stored stage result, or None if missing or its file is gone."""
+    value = st.session_state.artifacts.get(key)
+    if key[0] == "audio" and isinstance(value, str) and not Path(value).exists():
+        return None
+    return value
+
+def set_artifact(value, *key) -> None:
+    """Store a stage result."""
+    st.session_state.artifacts[key] = value
+
+def language_label(code: str) -> str:
+    """Human-readable name for a language code, including the auto option."""
+    if code == AUTO_LANGUAGE:
+        return "Auto-detect"
+    return f"{SUPPORTED_LANGUAGES[code]} ({code})"
+
+def run_pipeline(audio_hash: str, source_lang: str, target_lang: str) -> None:
+    """Run every stage, showing results as they stream in, and store them."""
+    st.subheader("Transcript")
+    detected_box = st.empty()
+    transcript_box = st.empty()
+    st.subheader("Translation")
+    translation_box = st.empty()
+    st.subheader("Output Audio")
+    audio_box = st.container()
+
+    transcript_parts = []
+    translation_parts = []
+    audio_parts = []
+    detected_lang = None
+    # Audio stays in memory: it is only played back and offered for download
+    for chunk in default_pipeline.run(
+        st.session_state.audio_path,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        return_type="bytes"
+    ):
+        if source_lang == AUTO_LANGUAGE and detected_lang is None:
+            detected_lang = chunk.source_lang
+            detected_box.caption(f"Detected language: {language_label(detected_lang)}")
+        transcript_parts.append(chunk.transcript)
+        translation_parts.append(chunk.translation)
+        transcript_box.text_area(
+            "Original Text",
+            value=" ".join(transcript_parts),
+            height=100,
+            disabled=True,
+            key=f"transcript_{chunk.index}"
+        )
+        translation_box.text_area(
+            "Translated Text",
+            value=" ".join(translation_parts),
+            height=100,
+            disabled=True,
+            key=f"translation_{chunk.index}"
+        )
+        if chunk.audio_path:
+            audio_parts.append(chunk.audio_path)
+            with audio_box:
+                st.audio(
+                    chunk.audio_path,
+                    format="audio/mp3",
+                    autoplay=len(audio_parts) == 1
+                )
+
+    st.session_state.transcript = " ".join(transcript_parts)
+    st.session_state.translation = " ".join(translation_parts)
+    st.session_state.output_audio = None
+
+    if audio_parts:
+        # Join the parts into one file for download
+        if len(audio_parts) == 1:
+            st.session_state.output_audio = audio_parts[0]
+        else:
+            st.session_state.output_audio = default_tts.combine_audio_files(
+                audio_parts,
+                return_type="bytes"
+            )
+        set_artifact(
+            st.session_state.output_audio,
+            "audio", audio_hash, source_lang, target_lang
+        )
+
+    set_artifact(st.session_state.transcript, "transcript", audio_hash, source_lang)
+    set_artifact(detected_lang or source_lang, "language", audio_hash, source_lang)
+    set_artifact(
+        st.session_state.translation,
+        "translation", audio_hash, source_lang, target_lang
+    )
+
+def run_missing_stages(audio_hash: str, source_lang: str, target_lang: str) -> None:
+    """Redo translation and synthesis if needed, reusing the stored transcript."""
+    transcript = get_artifact("transcript", audio_hash, source_lang)
+    translation = get_artifact("translation", audio_hash, source_lang, target_lang)
+    if translation is None:
+        # With auto-detection, the transcript's language was stored alongside it
+        spoken_lang = get_artifact("language", audio_hash, source_lang) or source_lang
+        if spoken_lang == AUTO_LANGUAGE or not transcript.strip():
+            # Nothing was transcribed, so there is nothing to translate
+            translation = transcript
+        else:
+            translation = default_translator.translate_text(
+                transcript,
+                source_lang=spoken_lang,
+                target_lang=target_lang
+            )
+        set_artifact(translation, "translation", audio_hash, source_lang, target_lang)
+
+    if get_artifact("audio", audio_hash, source_lang, target_lang) is None and translation.strip():
+        output_audio = default_tts.synthesize_speech(
+            translation,
+            lang_code=target_lang,
+            return_type="bytes"
+        )
+        set_artifact(output_audio, "audio", audio_hash, source_lang, target_lang)
+
+def render_results(audio_hash: str, source_lang: str, target_lang: str) -> None:
+    """Show the stored results for the current input and languages."""
+    transcript = get_artifact("transcript", audio_hash, source_lang)
+    translation = get_artifact("translation", audio_hash, source_lang, target_lang)
+    output_audio = get_artifact("audio", audio_hash, source_lang, target_lang)
+
+    st.session_state.transcript = transcript
+    st.session_state.translation = translation
+    st.session_state.output_audio = output_audio
 
-def save_uploaded_file(uploaded_file) -> str:
-    """Save uploaded audio file and return its path."""
-    # Create a temporary file with the same extension
-    suffix = Path(uploaded_file.name).suffix
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        return tmp_file.name
+    if transcript is None or translation is None:
+        return
+
+    # Display transcript
+    st.subheader("Transcript")
+    detected_lang = get_artifact("language", audio_hash, source_lang)
+    if source_lang == AUTO_LANGUAGE and detected_lang not in (None, AUTO_LANGUAGE):
+        st.caption(f"Detected language: {language_label(detected_lang)}")
+    st.text_area(
+        "Original Text",
+        value=transcript,
+        height=100,
+        disabled=True
+    )
+
+    # Display translation
+    st.subheader("Translation")
+    st.text_area(
+        "Translated Text",
+        value=translation,
+        height=100,
+        disabled=True
+    )
+
+    if output_audio:
+        # Display output audio
+        st.subheader("Output Audio")
+        st.audio(output_audio, format="audio/mp3")
+        render_download(output_audio, target_lang)
+
+def render_download(output_audio: bytes, target_lang: str) -> None:
+    """Offer the translated audio for download."""
+    st.download_button(
+        label="Download Translated Audio",
+        data=output_audio,
+        file_name=f"translated_audio_{target_lang}.mp3",
+        mime="audio/mp3"
+    )
 
 def main():
     """Main application function."""
@@ -88,8 +279,8 @@ def main():
         st.subheader("Source Language")
         source_lang = st.selectbox(
             "Select input language",
-            options=list(SUPPORTED_LANGUAGES.keys()),
-            format_func=lambda x: f"{SUPPORTED_LANGUAGES[x]} ({x})",
+            options=[AUTO_LANGUAGE, *SUPPORTED_LANGUAGES],
+            format_func=language_label,
             key="source_lang"
         )
         
@@ -118,7 +309,7 @@ def main():
         
         if uploaded_file:
             st.audio(uploaded_file, format=f"audio/{uploaded_file.type.split('/')[1]}")
-            st.session_state.audio_path = save_uploaded_file(uploaded_file)
+            set_audio_input(uploaded_file.getvalue(), Path(uploaded_file.name).suffix)
             
     else:  # Record Audio
         st.warning("Note: Audio recording requires microphone access")
@@ -129,74 +320,35 @@ def main():
         
         if audio_bytes:
             # Save recorded audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                tmp_file.write(audio_bytes)
-                st.session_state.audio_path = tmp_file.name
+            set_audio_input(audio_bytes, ".wav")
                 
             # Display recorded audio
             st.audio(audio_bytes, format="audio/wav")
+
+    audio_hash = st.session_state.audio_hash
     
     # Process button
     if st.button("Translate Audio", type="primary", disabled=not st.session_state.audio_path):
         with st.spinner("Processing..."):
             try:
-                # Step 1: Speech to Text
-                st.session_state.transcript = default_stt.transcribe_audio(
-                    st.session_state.audio_path,
-                    language=source_lang
-                )
-                
-                # Display transcript
-                st.subheader("Transcript")
-                st.text_area(
-                    "Original Text",
-                    value=st.session_state.transcript,
-                    height=100,
-                    disabled=True
-                )
-                
-                # Step 2: Translation
-                st.session_state.translation = default_translator.translate_text(
-                    st.session_state.transcript,
-                    source_lang=source_lang,
-                    target_lang=target_lang
-                )
-                
-                # Display translation
-                st.subheader("Translation")
-                st.text_area(
-                    "Translated Text",
-                    value=st.session_state.translation,
-                    height=100,
-                    disabled=True
-                )
-                
-                # Step 3: Text to Speech
-                st.session_state.output_audio = default_tts.synthesize_speech(
-                    st.session_state.translation,
-                    lang_code=target_lang
-                )
-                
-                # Display output audio
-                st.subheader("Output Audio")
-                with open(st.session_state.output_audio, 'rb') as audio_file:
-                    audio_bytes = audio_file.read()
-                    st.audio(audio_bytes, format="audio/mp3")
-                    
-                # Add download button
-                st.download_button(
-                    label="Download Translated Audio",
-                    data=audio_bytes,
-                    file_name=f"translated_audio_{target_lang}.mp3",
-                    mime="audio/mp3"
-                )
+                # Only stages whose inputs changed since the last run are redone;
+                # e.g. a new target language reuses the transcript
+                if get_artifact("transcript", audio_hash, source_lang) is None:
+                    # Results stream in while the pipeline runs
+                    run_pipeline(audio_hash, source_lang, target_lang)
+                    output_audio = get_artifact("audio", audio_hash, source_lang, target_lang)
+                    if output_audio:
+                        render_download(output_audio, target_lang)
+                else:
+                    run_missing_stages(audio_hash, source_lang, target_lang)
+                    render_results(audio_hash, source_lang, target_lang)
                 
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
-                
-    # Cleanup old files periodically
-    cleanup_old_files(INPUT_DIR)
-    cleanup_old_files(OUTPUT_DIR)
+    elif audio_hash:
+        # Keep showing results that are still valid across reruns
+        render_results(audio_hash, source_lang, target_lang)
+
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
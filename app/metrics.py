@@ -0,0 +1,337 @@
+"""Per-stage timing, throughput and cache instrumentation.
+
+Every pipeline stage is wrapped in ``stage(...)``, which times it, feeds
+the in-process metrics registry and writes one JSON log line to the
+``app.metrics`` logger. The registry renders in the Prometheus text format
+(served at ``/metrics`` by run_app.py). Setting ``PROFILE_DIR`` additionally
+saves a cProfile dump for every request wrapped in ``profiled(...)``.
+
+The log records are emitted at INFO level, which Python drops unless
+logging is configured; entry points call ``configure_logging`` to write
+them to stderr as JSON lines when ``METRICS_LOG_JSON`` is set.
+"""
+
+import cProfile
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+from .config import METRICS_LOG_JSON, PROFILE_DIR
+
+logger = logging.getLogger("app.metrics")
+
+# Prefix of every exported metric name
+NAMESPACE = "voice_translator"
+
+# Histogram buckets for durations in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Histogram buckets for real-time factors (processing time / audio time)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+
+class Metrics:
+    """Thread-safe registry of counters and histograms with labels."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters = {}  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts, sum, count]
+        self._buckets = {}  # name -> bucket bounds
+        self._help = {}  # name -> description
+
+    def inc(self, name: str, value: float = 1.0, help: str = "", **labels) -> None:
+        """Increase a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: tuple = DURATION_BUCKETS,
+        help: str = "",
+        **labels
+    ) -> None:
+        """Record a value in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            buckets = self._buckets.setdefault(name, buckets)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+            if help:
+                self._help.setdefault(name, help)
+
+    def value(self, name: str, **labels) -> float:
+        """Return a counter's current value (0 if never increased)."""
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: ([*counts], total, count)
+                for key, (counts, total, count) in self._histograms.items()
+            }
+            buckets = dict(self._buckets)
+            descriptions = dict(self._help)
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            full_name = f"{NAMESPACE}_{name}"
+            if name in descriptions:
+                lines.append(f"# HELP {full_name} {descriptions[name]}")
+            lines.append(f"# TYPE {full_name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+
+        for name in sorted({name for name, _ in histograms}):
+            full_name = f"{NAMESPACE}_{name}"
+            if name in descriptions:
+                lines.append(f"# HELP {full_name} {descriptions[name]}")
+            lines.append(f"# TYPE {full_name} histogram")
+            for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, bucket_count in zip(buckets[name], counts):
+                    bucket_labels = labels + (("le", _number(bound)),)
+                    lines.append(f"{full_name}_bucket{_labels(bucket_labels)} {bucket_count}")
+                lines.append(f"{full_name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{full_name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{full_name}_count{_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+def _labels(labels: tuple) -> str:
+    """Format a label set as {a="1",b="2"}."""
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+def _number(value: float) -> str:
+    """Format a number the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+# Shared registry for the whole process
+default_metrics = Metrics()
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    default_metrics.inc(
+        "cache_requests_total",
+        help="Cache lookups by cache and result",
+        cache=cache,
+        result="hit" if hit else "miss"
+    )
+
+def record_provider(provider: str, outcome: str) -> None:
+    """Count a provider request attempt by outcome (ok, retry, error, rejected, ...)."""
+    default_metrics.inc(
+        "provider_requests_total",
+        help="External provider requests by provider and outcome",
+        provider=provider,
+        outcome=outcome
+    )
+
+def record_queue_wait(queue: str, seconds: float) -> None:
+    """Record how long an item waited in a queue before work started."""
+    default_metrics.observe(
+        "queue_wait_seconds",
+        seconds,
+        help="Time items spent waiting in a queue",
+        queue=queue
+    )
+    logger.info(json.dumps({"event": "queue_wait", "queue": queue, "seconds": round(seconds, 6)}))
+
+def record_stage(
+    name: str,
+    seconds: float,
+    fields: dict,
+    error: Optional[str] = None
+) -> dict:
+    """
+    Record one completed stage and log it as a JSON line.
+
+    Recognized fields add derived metrics: ``audio_seconds`` (real-time
+    factor), ``chars`` (characters per second) and ``bytes`` (bytes produced).
+
+    Returns:
+        dict: The logged record
+    """
+    record = {"event": "stage", "stage": name, "seconds": round(seconds, 6)}
+    record.update(fields)
+
+    default_metrics.observe(
+        "stage_duration_seconds",
+        seconds,
+        help="Wall time per pipeline stage",
+        stage=name
+    )
+    if error is not None:
+        record["error"] = error
+        default_metrics.inc("stage_errors_total", help="Failed stage runs", stage=name)
+
+    audio_seconds = fields.get("audio_seconds")
+    if audio_seconds:
+        default_metrics.inc(
+            "audio_seconds_total",
+            audio_seconds,
+            help="Seconds of audio processed",
+            stage=name
+        )
+        if fields.get("cache") != "hit":
+            record["real_time_factor"] = round(seconds / audio_seconds, 4)
+            default_metrics.observe(
+                "real_time_factor",
+                seconds / audio_seconds,
+                buckets=RATIO_BUCKETS,
+                help="Processing time divided by audio duration",
+                stage=name
+            )
+
+    chars = fields.get("chars")
+    if chars:
+        default_metrics.inc("characters_total", chars, help="Characters processed", stage=name)
+        if seconds > 0:
+            record["chars_per_second"] = round(chars / seconds, 2)
+
+    produced = fields.get("bytes")
+    if produced:
+        default_metrics.inc("bytes_total", produced, help="Bytes of audio produced", stage=name)
+
+    logger.info(json.dumps(record, default=str))
+    return record
+
+class JsonFormatter(logging.Formatter):
+    """Formats each log record as a single JSON object.
+
+    Messages that are JSON objects themselves, like stage records, are
+    merged into the output instead of being nested as a string.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            payload = {"message": message}
+        output = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            **payload,
+        }
+        if record.exc_info:
+            output["exception"] = self.formatException(record.exc_info)
+        return json.dumps(output, default=str)
+
+def configure_logging(
+    enabled: bool = METRICS_LOG_JSON,
+    stream: Optional[TextIO] = None
+) -> bool:
+    """
+    Write stage records to a stream as JSON lines.
+
+    Safe to call more than once; the handler is only added the first time.
+
+    Args:
+        enabled: Whether to emit the records (defaults to ``METRICS_LOG_JSON``)
+        stream: Destination stream (defaults to stderr)
+
+    Returns:
+        bool: Whether the records are being emitted
+    """
+    if not enabled:
+        return False
+    if not any(isinstance(h.formatter, JsonFormatter) for h in logger.handlers):
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # The records are complete on their own; keep them out of other handlers
+    logger.propagate = False
+    return True
+
+@contextmanager
+def stage(name: str, **fields) -> Iterator[dict]:
+    """
+    Time a pipeline stage.
+
+    The yielded dict can be filled with more fields while the stage runs
+    (e.g. ``audio_seconds`` once the audio is decoded).
+
+    Args:
+        name: Stage name (e.g., "stt", "translate", "tts")
+        **fields: Initial fields for the log record
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        yield fields
+    except Exception as e:
+        # Interrupts and generator exits pass through without counting as failures
+        error = type(e).__name__
+        raise
+    finally:
+        record_stage(name, time.perf_counter() - start, fields, error)
+
+@contextmanager
+def profiled(name: str, profile_dir: Optional[str] = None) -> Iterator[None]:
+    """
+    Profile the enclosed block with cProfile if profiling is enabled.
+
+    Profiling is enabled by passing ``profile_dir`` or setting
+    ``PROFILE_DIR`` in the configuration; the stats are written to
+    ``<profile_dir>/<name>-<timestamp>.prof``.
+
+    Args:
+        name: Name of the profiled request
+        profile_dir: Directory for profile dumps
+    """
+    profile_dir = profile_dir or PROFILE_DIR
+    if not profile_dir:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        directory = Path(profile_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof"
+        profiler.dump_stats(str(path))
+        logger.info(json.dumps({"event": "profile", "name": name, "path": str(path)}))
@@ -0,0 +1,193 @@
+"""Streaming speech-to-speech pipeline for the Voice Translation App."""
+
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+from .segmenter import join_sentences, split_complete
+from .stt import SpeechToText, default_stt
+from .translator import Translator, default_translator
+from .tts import TextToSpeech, default_tts
+
+# Marks the end of a stage's output
+_DONE = object()
+
+@dataclass
+class PipelineChunk:
+    """One sentence that has made it through all three stages."""
+
+    index: int
+    transcript: str
+    translation: str
+    # The synthesized audio's path, or the audio itself when synthesize_speech
+    # is asked for bytes or a stream through tts_kwargs
+    audio_path: Optional[Union[str, bytes, BinaryIO]]
+    source_lang: Optional[str] = None
+
+class _StageError:
+    """Carries an exception from a worker to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+class StreamingPipeline:
+    """Overlapping STT -> translation -> TTS pipeline.
+
+    Each stage runs in its own worker thread connected by bounded queues:
+    Whisper output is cut into sentences as soon as it is produced, each
+    sentence is translated, and its speech is synthesized while later
+    audio is still being transcribed.
+    """
+
+    def __init__(
+        self,
+        stt: Optional[SpeechToText] = None,
+        translator: Optional[Translator] = None,
+        tts: Optional[TextToSpeech] = None,
+        queue_size: int = 8
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stt: Speech-to-text processor (defaults to default_stt)
+            translator: Translator (defaults to default_translator)
+            tts: Text-to-speech processor (defaults to default_tts)
+            queue_size: Maximum number of items waiting between two stages
+        """
+        self.stt = stt or default_stt
+        self.translator = translator or default_translator
+        self.tts = tts or default_tts
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        audio_path: Union[str, Path, bytes],
+        source_lang: str,
+        target_lang: str,
+        **tts_kwargs
+    ) -> Iterator[PipelineChunk]:
+        """
+        Translate a voice message, yielding audio sentence by sentence.
+
+        Args:
+            audio_path: Path to the input audio file, or its raw bytes
+            source_lang: Source language code (e.g., "en", "es"), or "auto" to
+                detect it from the audio
+            target_lang: Target language code
+            **tts_kwargs: Additional arguments for synthesize_speech
+
+        Yields:
+            PipelineChunk: Processed sentences in their original order
+        """
+        stop = threading.Event()
+        sentences = queue.Queue(self.queue_size)
+        translations = queue.Queue(self.queue_size)
+        chunks = queue.Queue(self.queue_size)
+        # The detected language is set before the first sentence is queued
+        languages = {"source": source_lang}
+
+        def put(target: queue.Queue, item) -> bool:
+            # Give up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: queue.Queue):
+            # Stop waiting once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def transcribe():
+            try:
+                remainder = ""
+                segments = self.stt.iter_segments(
+                    audio_path,
+                    language=source_lang,
+                    on_language=lambda language: languages.update(source=language)
+                )
+                for segment in segments:
+                    complete, remainder = split_complete(
+                        join_sentences([remainder, segment], languages["source"]),
+                        languages["source"]
+                    )
+                    for sentence in complete:
+                        if not put(sentences, sentence):
+                            return
+                if remainder:
+                    put(sentences, remainder)
+                put(sentences, _DONE)
+            except BaseException as e:
+                put(sentences, _StageError(e))
+
+        def translate():
+            while True:
+                item = get(sentences)
+                if item is _DONE or isinstance(item, _StageError):
+                    put(translations, item)
+                    return
+                try:
+                    translation = self.translator.translate_text(
+                        item,
+                        source_lang=languages["source"],
+                        target_lang=target_lang
+                    )
+                except BaseException as e:
+                    put(translations, _StageError(e))
+                    return
+                if not put(translations, (item, translation)):
+                    return
+
+        def synthesize():
+            index = 0
+            while True:
+                item = get(translations)
+                if item is _DONE or isinstance(item, _StageError):
+                    put(chunks, item)
+                    return
+                transcript, translation = item
+                try:
+                    audio = None
+                    if translation and translation.strip():
+                        audio = self.tts.synthesize_speech(
+                            translation,
+                            lang_code=target_lang,
+                            **tts_kwargs
+                        )
+                except BaseException as e:
+                    put(chunks, _StageError(e))
+                    return
+                chunk = PipelineChunk(index, transcript, translation, audio, languages["source"])
+                if not put(chunks, chunk):
+                    return
+                index += 1
+
+        workers = [
+            threading.Thread(target=worker, name=f"pipeline-{worker.__name__}", daemon=True)
+            for worker in (transcribe, translate, synthesize)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            while True:
+                item = chunks.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _StageError):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+
+# Create a default instance
+default_pipeline = StreamingPipeline()
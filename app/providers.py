@@ -0,0 +1,364 @@
+"""Shared clients for the external web providers (Google Translate, gTTS).
+
+Every provider gets one ProviderClient per process, shared by all threads:
+
+- a ``requests.Session`` with a connection pool, so requests reuse
+  keep-alive connections instead of opening a new one each time;
+- a token bucket that caps the request rate, smoothing bursts before the
+  provider starts throttling;
+- retries with exponential backoff and full jitter for throttling (HTTP
+  429), server errors and connection failures, honoring ``Retry-After``;
+- a circuit breaker that, after repeated failures, rejects requests
+  immediately for a while instead of letting every caller wait out its
+  retries, then lets a single probe through to test recovery.
+
+Callers see ``ProviderError`` (or ``CircuitOpenError`` when rejected
+without a request) and can fall back to a cached or offline path.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+from .config import (
+    PROVIDER_BURST,
+    PROVIDER_FAILURE_THRESHOLD,
+    PROVIDER_MAX_RETRIES,
+    PROVIDER_POOL_SIZE,
+    PROVIDER_RATE_LIMIT,
+    PROVIDER_RESET_SECONDS,
+    PROVIDER_RETRY_BACKOFF,
+    PROVIDER_TIMEOUT
+)
+from .metrics import record_provider
+
+class ProviderError(Exception):
+    """A provider request failed."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retriable: bool = True):
+        """
+        Initialize the error.
+
+        Args:
+            message: Description of the failure
+            status: HTTP status of the response, if there was one
+            retriable: Whether the same request may succeed later
+        """
+        super().__init__(message)
+        self.status = status
+        self.retriable = retriable
+
+class CircuitOpenError(ProviderError):
+    """The provider is considered unhealthy, so no request was made."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            f"{provider} is unavailable; retrying in {retry_in:.1f}s",
+            retriable=False
+        )
+        self.retry_in = retry_in
+
+class TokenBucket:
+    """Rate limiter allowing ``rate`` requests per second with bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            capacity: Maximum number of stored tokens
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting until enough are available.
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            bool: True if the tokens were taken, False if the wait would exceed ``timeout``
+        """
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """Opens after consecutive failures and half-opens after a cool-down.
+
+    While open, requests are rejected without being sent. Once
+    ``reset_timeout`` has passed, one probe request is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables it)
+            reset_timeout: Seconds to stay open before probing the provider
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        with self._lock:
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            # Half-open: only one probe at a time
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Note a successful request; closes the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """Give up a probe that ended without an outcome, so another may be sent."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Note a failed request; opens the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.failure_threshold <= 0:
+                return
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    """
+    Delay before retry number ``attempt`` (0-based), with full jitter.
+
+    Randomizing the whole delay keeps clients that failed together from
+    retrying together.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _retry_after(response) -> float:
+    """Seconds requested by a ``Retry-After`` header, or 0."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        # HTTP dates are not worth parsing here; the backoff still applies
+        return 0.0
+
+class ProviderClient:
+    """Pooled, rate-limited, retrying and circuit-broken HTTP client for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        rate_limit: float = PROVIDER_RATE_LIMIT,
+        burst: int = PROVIDER_BURST,
+        max_retries: int = PROVIDER_MAX_RETRIES,
+        retry_backoff: float = PROVIDER_RETRY_BACKOFF,
+        timeout: float = PROVIDER_TIMEOUT,
+        failure_threshold: int = PROVIDER_FAILURE_THRESHOLD,
+        reset_timeout: float = PROVIDER_RESET_SECONDS,
+        pool_size: int = PROVIDER_POOL_SIZE
+    ):
+        """
+        Initialize the client. The HTTP session is created on first use.
+
+        Args:
+            name: Provider name used in errors and metrics
+            rate_limit: Requests per second (0 = unlimited)
+            burst: Requests that may be sent at once after an idle period
+            max_retries: Retries of a throttled or failed request
+            retry_backoff: Base delay in seconds; doubles per retry, fully jittered
+            timeout: Seconds to wait for a response
+            failure_threshold: Consecutive failed requests that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            pool_size: Keep-alive connections kept per host
+        """
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The shared ``requests.Session``, built on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size,
+                        pool_maxsize=self.pool_size
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Send a request with rate limiting, retries and circuit breaking.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments for ``requests.Session.request``
+
+        Returns:
+            requests.Response: A successful (2xx/3xx) response
+
+        Raises:
+            CircuitOpenError: The circuit is open, so nothing was sent
+            ProviderError: The request failed, after retries where sensible
+        """
+        import requests
+
+        if not self.breaker.allow():
+            record_provider(self.name, "rejected")
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+
+        kwargs.setdefault("timeout", self.timeout)
+        error = None
+        recorded = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.bucket.acquire()
+                wait = 0.0
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except requests.RequestException as e:
+                    error = ProviderError(f"{self.name} request failed: {e}")
+                    error.__cause__ = e
+                else:
+                    status = response.status_code
+                    if status < 400:
+                        self.breaker.record_success()
+                        recorded = True
+                        record_provider(self.name, "ok")
+                        return response
+                    retriable = status == 429 or status >= 500
+                    error = ProviderError(
+                        f"{self.name} returned HTTP {status}",
+                        status=status,
+                        retriable=retriable
+                    )
+                    if not retriable:
+                        # The provider answered; the request itself was bad
+                        self.breaker.record_success()
+                        recorded = True
+                        record_provider(self.name, "rejected_request")
+                        raise error
+                    wait = _retry_after(response)
+                    response.close()
+
+                if attempt == self.max_retries:
+                    break
+                if self.breaker.state == CircuitBreaker.OPEN:
+                    # Other callers have given up on the provider meanwhile
+                    record_provider(self.name, "rejected")
+                    raise CircuitOpenError(self.name, self.breaker.retry_in())
+                record_provider(self.name, "retry")
+                time.sleep(max(wait, backoff_delay(attempt, self.retry_backoff)))
+
+            self.breaker.record_failure()
+            recorded = True
+            record_provider(self.name, "error")
+            raise error
+        finally:
+            if not recorded:
+                # An unexpected error must not leave a half-open probe
+                # pending forever, which would keep the circuit shut
+                self.breaker.release()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+# Shared clients by provider name
+_providers = {}
+_providers_lock = threading.Lock()
+
+def get_provider(name: str) -> ProviderClient:
+    """Return the process-wide client for a provider, created with the configured settings."""
+    with _providers_lock:
+        provider = _providers.get(name)
+        if provider is None:
+            provider = _providers[name] = ProviderClient(name)
+        return provider
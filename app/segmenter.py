@@ -0,0 +1,282 @@
+"""Sentence segmentation and request packing for the Voice Translation App.
+
+Text is cut into sentences with per-language rules (sentence-ending
+punctuation, whether sentences are separated by spaces, and common
+abbreviations that end in a period without ending the sentence). The
+sentences can then be packed into as few chunks as possible under a
+provider's per-request character limit, splitting an overlong sentence
+at clause punctuation, then between words, and only as a last resort in
+the middle of a word.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Closing quotes and brackets that stay with the sentence they end
+_CLOSERS = "\"'”’»)]」』）"
+
+# Opening quotes and brackets that may precede a word
+_OPENERS = "\"'“‘«([¿¡"
+
+# Terminators that end a sentence even without whitespace after them
+_FULL_WIDTH_TERMINATORS = "。！？．"
+
+@dataclass(frozen=True)
+class LanguageRules:
+    """How sentences are delimited in one language."""
+
+    # Characters that end a sentence
+    terminators: str = ".!?…"
+    # Characters after which a long sentence may be split
+    clause_marks: str = ",;:"
+    # Whether sentences are separated by spaces
+    spaced: bool = True
+    # Lowercase words that end in a period without ending the sentence
+    abbreviations: frozenset = frozenset()
+
+    @property
+    def joiner(self) -> str:
+        """Text placed between sentences."""
+        return " " if self.spaced else ""
+
+_CJK = LanguageRules(
+    terminators=".!?…" + _FULL_WIDTH_TERMINATORS,
+    clause_marks=",;:、，；：",
+    spaced=False
+)
+
+# Rules for every supported language
+RULES = {
+    "en": LanguageRules(abbreviations=frozenset({
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs",
+        "etc", "e.g", "i.e", "approx", "no", "inc", "ltd", "co", "dept",
+    })),
+    "es": LanguageRules(abbreviations=frozenset({
+        "sr", "sra", "srta", "dr", "dra", "ud", "uds", "etc", "pág", "núm",
+        "av", "avda", "aprox", "p.ej",
+    })),
+    "fr": LanguageRules(abbreviations=frozenset({
+        "m", "mm", "mme", "mlle", "dr", "pr", "me", "etc", "cf", "av",
+        "p.ex", "env", "bd",
+    })),
+    "de": LanguageRules(abbreviations=frozenset({
+        "dr", "prof", "hr", "fr", "nr", "str", "ca", "bzw", "usw", "evtl",
+        "vgl", "z.b", "d.h", "u.a", "s.o",
+    })),
+    "it": LanguageRules(abbreviations=frozenset({
+        "sig", "sigg", "sigra", "dott", "dr", "prof", "ing", "avv", "ecc",
+        "es", "pag", "n",
+    })),
+    "pt": LanguageRules(abbreviations=frozenset({
+        "sr", "sra", "srta", "dr", "dra", "prof", "etc", "av", "pág",
+        "p.ex", "aprox",
+    })),
+    "nl": LanguageRules(abbreviations=frozenset({
+        "dhr", "mevr", "dr", "prof", "nr", "ca", "bijv", "enz", "blz",
+        "o.a", "m.a.w", "d.w.z",
+    })),
+    "ru": LanguageRules(abbreviations=frozenset({
+        "г", "гг", "ул", "им", "др", "пр", "проф", "стр", "т.е", "т.к",
+        "т.д", "т.п", "и.о",
+    })),
+    "ja": _CJK,
+    "zh": _CJK,
+    # Korean separates words and sentences with spaces, but may use
+    # full-width punctuation as well
+    "ko": LanguageRules(terminators=".!?…" + _FULL_WIDTH_TERMINATORS),
+}
+
+# Used when the language is unknown: every terminator, no abbreviations
+DEFAULT_RULES = LanguageRules(terminators=".!?…" + _FULL_WIDTH_TERMINATORS)
+
+def rules_for(lang: Optional[str]) -> LanguageRules:
+    """Rules for a language code, or the language-neutral defaults."""
+    return RULES.get(lang, DEFAULT_RULES)
+
+# Compiled terminator patterns by rules
+_PATTERNS = {}
+
+def _terminators(rules: LanguageRules) -> re.Pattern:
+    """Pattern matching a run of terminators and the closers after it."""
+    pattern = _PATTERNS.get(rules)
+    if pattern is None:
+        pattern = _PATTERNS[rules] = re.compile(
+            f"[{re.escape(rules.terminators)}]+[{re.escape(_CLOSERS)}]*"
+        )
+    return pattern
+
+def _is_boundary(text: str, match: re.Match, rules: LanguageRules) -> bool:
+    """Whether a run of terminators at ``match`` ends a sentence."""
+    end = match.end()
+    run = match.group()
+    if not any(char in _FULL_WIDTH_TERMINATORS for char in run):
+        # Western punctuation only ends a sentence before whitespace, so
+        # numbers (3.5), URLs and the like stay whole
+        if end < len(text) and not text[end].isspace():
+            return False
+    run = run.rstrip(_CLOSERS)
+    if run.strip(".…"):
+        # Question and exclamation marks always end a sentence
+        return True
+
+    following = text[end:].lstrip()
+    if run == ".":
+        # A lone period: the sentence goes on after an abbreviation or an
+        # initial
+        before = text[:match.start()].split()
+        word = before[-1].lstrip(_OPENERS) if before else ""
+        if word.lower() in rules.abbreviations:
+            return False
+        if _is_initial(word, before[:-1], following):
+            return False
+    # A period or an ellipsis followed by a lowercase word does not end the sentence
+    return not (following[:1].isalpha() and following[:1].islower())
+
+def _is_initial(word: str, before: list[str], following: str) -> bool:
+    """
+    Whether a single capital letter before a period is a name's initial.
+
+    It is when it follows a capitalized word inside the sentence
+    ("John F. Kennedy") or another initial, or precedes one ("J. R. Tolkien");
+    otherwise it is taken as a word ending the sentence ("The answer is A.").
+    """
+    if len(word) != 1 or not word.isupper():
+        return False
+    if re.match(r"[^\W\d_]\.(\s|$)", following):
+        return True
+    if not before:
+        return False
+    previous = before[-1].lstrip(_OPENERS)
+    if re.fullmatch(r"[^\W\d_]\.", previous):
+        return True
+    # The first word of a sentence is capitalized anyway
+    starts_sentence = len(before) == 1 or before[-2][-1:] in ".!?…" + _FULL_WIDTH_TERMINATORS
+    return previous[:1].isupper() and not starts_sentence
+
+def split_sentences(text: str, lang: Optional[str] = None) -> list[str]:
+    """
+    Split text into sentences, keeping their punctuation.
+
+    Args:
+        text: Text to split
+        lang: Language code of the text, if known
+
+    Returns:
+        list[str]: Non-empty sentences in order
+    """
+    rules = rules_for(lang)
+    sentences = []
+    start = 0
+    for match in _terminators(rules).finditer(text):
+        if _is_boundary(text, match, rules):
+            sentences.append(text[start:match.end()].strip())
+            start = match.end()
+    sentences.append(text[start:].strip())
+    return [sentence for sentence in sentences if sentence]
+
+def ends_sentence(text: str, lang: Optional[str] = None) -> bool:
+    """Whether text ends with a complete sentence."""
+    text = text.rstrip()
+    rules = rules_for(lang)
+    last = None
+    for last in _terminators(rules).finditer(text):
+        pass
+    return last is not None and last.end() == len(text) and _is_boundary(text, last, rules)
+
+def split_complete(text: str, lang: Optional[str] = None) -> tuple[list[str], str]:
+    """
+    Split text into complete sentences and a trailing remainder.
+
+    Used on text that is still arriving, where the last sentence may
+    continue in the next piece.
+
+    Returns:
+        tuple: (complete sentences, unfinished remainder)
+    """
+    sentences = split_sentences(text, lang)
+    if sentences and not ends_sentence(sentences[-1], lang):
+        return sentences[:-1], sentences[-1]
+    return sentences, ""
+
+def join_sentences(sentences: list[str], lang: Optional[str] = None) -> str:
+    """Join sentences the way the language writes them."""
+    return rules_for(lang).joiner.join(sentences)
+
+def _greedy(pieces: list[str], max_chars: int) -> list[str]:
+    """
+    Concatenate consecutive pieces while they fit in ``max_chars``.
+
+    Pieces carry their own separating whitespace. Filling each chunk
+    before starting the next gives the fewest chunks for a fixed order.
+    """
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = current + piece
+        if current.strip() and len(candidate.strip()) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+def _fit(text: str, max_chars: int, rules: LanguageRules) -> list[str]:
+    """Cut one sentence into pieces of at most ``max_chars``, at the widest breaks possible."""
+    if len(text.strip()) <= max_chars:
+        return [text]
+    splitters = (
+        # After clause punctuation, then between words
+        re.compile(f"(?<=[{re.escape(rules.clause_marks)}])(?=\\s*\\S)"),
+        re.compile(r"(?<=\s)(?=\S)"),
+    )
+    for splitter in splitters:
+        parts = [part for part in splitter.split(text) if part]
+        if len(parts) > 1:
+            pieces = [piece for part in parts for piece in _fit(part, max_chars, rules)]
+            return _greedy(pieces, max_chars)
+    # A single word longer than the limit
+    text = text.strip()
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+def pack(sentences: list[str], max_chars: int, lang: Optional[str] = None) -> list[str]:
+    """
+    Pack sentences into the fewest chunks of at most ``max_chars``.
+
+    Sentences are kept whole where they fit; longer ones are split at
+    clause punctuation, then between words.
+
+    Args:
+        sentences: Sentences in order
+        max_chars: Character limit of one chunk
+        lang: Language code of the text, if known
+
+    Returns:
+        list[str]: Chunks in order
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be positive")
+    rules = rules_for(lang)
+    pieces = []
+    for sentence in sentences:
+        fitted = _fit(sentence.strip(), max_chars, rules)
+        fitted[-1] += rules.joiner
+        pieces.extend(fitted)
+    return [chunk.strip() for chunk in _greedy(pieces, max_chars)]
+
+def segment_text(text: str, lang: Optional[str] = None, max_chars: int = 100) -> list[str]:
+    """
+    Split text into sentences and pack them into the fewest chunks under a limit.
+
+    Args:
+        text: Text to segment
+        lang: Language code of the text, if known
+        max_chars: Character limit of one chunk (gTTS sends at most 100
+            characters per request)
+
+    Returns:
+        list[str]: Chunks in order
+    """
+    return pack(split_sentences(text, lang), max_chars, lang)
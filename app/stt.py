@@ -1,60 +1,594 @@
 """Speech-to-Text module using OpenAI's Whisper model."""
 
+import json
+import multiprocessing
 import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-import whisper
-from .utils import convert_audio_to_wav
-from .config import INPUT_DIR
+from typing import Callable, Iterator, Optional, Union
+from .cache import SQLiteCache
+from .metrics import stage
+from .utils import SAMPLE_RATE, content_hash, decode_audio, split_on_silence
+from .config import (
+    AUTO_LANGUAGE,
+    SUPPORTED_LANGUAGES,
+    TRANSCRIPT_CACHE_MAX_ENTRIES,
+    TRANSCRIPT_CACHE_PATH,
+    WHISPER_MAX_RESIDENT_MODELS,
+    WHISPER_MODEL,
+    WHISPER_PARALLEL_MIN_SECONDS,
+    WHISPER_PARALLEL_WORKERS,
+    WHISPER_PRECISION,
+    WHISPER_PRECISIONS,
+    WHISPER_THREADS,
+)
+
+# Seconds of audio repeated between consecutive parallel windows
+WINDOW_OVERLAP = 1.0
+
+# Model and audio of the call a pool worker serves. Only set inside pool
+# workers, by the pool initializer, so concurrent calls in the parent each
+# hand their own state to their own pool
+_pool_state = {}
+
+class ModelRegistry:
+    """Lazily loaded, bounded LRU of resident Whisper models.
+
+    Models are keyed by (model name, device, precision) and are only loaded
+    the first time they are requested. When more than ``max_models`` are
+    resident, the least recently used one is dropped. Each key has its own
+    load lock, so loading one model never holds up callers of another.
+    """
+
+    def __init__(
+        self,
+        max_models: int = WHISPER_MAX_RESIDENT_MODELS,
+        loader: Optional[Callable[[str, str], object]] = None
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_models: Maximum number of models kept in memory at once
+            loader: Callable loading a model by (name, device); defaults to
+                ``whisper.load_model``
+        """
+        if max_models < 1:
+            raise ValueError("max_models must be at least 1")
+        self.max_models = max_models
+        self.loader = loader
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._inference_locks = {}
+
+    def get(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        precision: str = "fp32"
+    ):
+        """
+        Return a loaded Whisper model, loading it on first use.
+
+        Args:
+            model_name: Whisper model name ("tiny", "base", "small", ...)
+            device: Torch device; defaults to CUDA when available, else CPU
+                (always CPU for int8)
+            precision: Inference precision ("fp32", "fp16" or "int8")
+
+        Returns:
+            whisper.model.Whisper: The loaded model
+        """
+        key = (model_name, _resolve_device(device, precision), precision)
+        model = self._lookup(key)
+        if model is not None:
+            return model
+
+        # Only callers of the same model wait for its load
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            model = self._lookup(key)
+            if model is not None:
+                # Loaded by another thread while this one waited
+                return model
+
+            with stage("model_load", model=model_name, device=key[1], precision=precision):
+                loader = self.loader
+                if loader is None:
+                    import whisper
+                    loader = whisper.load_model
+                model = loader(model_name, device=key[1])
+                if precision == "int8":
+                    model = _quantize(model)
+
+            with self._lock:
+                self._models[key] = model
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+            return model
+
+    def _lookup(self, key: tuple):
+        """Return a resident model, marking it most recently used, or None."""
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+            return model
+
+    def inference_lock(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        precision: str = "fp32"
+    ) -> threading.Lock:
+        """
+        Return the lock serializing inference on one model.
+
+        Whisper installs per-call hooks on the model while decoding, so two
+        threads must not run the same model instance at the same time.
+        """
+        key = (model_name, _resolve_device(device, precision), precision)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    def loaded(self) -> list[tuple[str, str, str]]:
+        """Return the keys of the currently resident models, oldest first."""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self) -> None:
+        """Drop all resident models."""
+        with self._lock:
+            self._models.clear()
+
+def _default_device() -> str:
+    """Return the device Whisper would pick by default."""
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def _resolve_device(device: Optional[str], precision: str) -> str:
+    """Validate a precision and pick the device it runs on."""
+    if precision not in WHISPER_PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision}")
+    if precision == "int8":
+        if device not in (None, "cpu"):
+            raise ValueError("int8 precision is only supported on CPU")
+        return "cpu"
+    return device or _default_device()
+
+def _quantize(model):
+    """
+    Apply int8 dynamic quantization to a Whisper model's linear layers.
+
+    Weights are stored as int8 and activations are quantized on the fly,
+    which roughly halves CPU inference time for a small accuracy cost.
+    Convolutions, embeddings and layer norms stay in float32.
+    """
+    import torch
+    from whisper.model import Linear
+
+    # Whisper uses its own Linear subclass, and quantize_dynamic only
+    # replaces modules whose type is exactly nn.Linear. The subclass only
+    # differs in casting weights to the input dtype, a no-op in float32.
+    for module in model.modules():
+        if type(module) is Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def set_threads(threads: int) -> None:
+    """Pin torch's intra-op thread count for this process (0 keeps the default)."""
+    if threads > 0:
+        import torch
+        if torch.get_num_threads() != threads:
+            torch.set_num_threads(threads)
+
+def _pool_context():
+    """
+    Start method for transcription pools.
+
+    Forking a process that runs other threads (a web server, the job queue,
+    torch's own pools) can leave locks held forever in the child, so
+    workers are started from a fresh interpreter instead: by the fork
+    server where the platform has one, otherwise by spawning.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+def _init_pool_worker(
+    loader: Optional[Callable[[str, str], object]],
+    model_name: str,
+    device: str,
+    precision: str,
+    threads: int,
+    audio
+) -> None:
+    """
+    Set up a pool worker.
+
+    Each worker loads its own copy of the model through a private registry,
+    using the parent registry's loader, which must therefore be picklable.
+    Torch threads are limited so parallel workers do not oversubscribe the CPU.
+    """
+    set_threads(threads)
+    registry = ModelRegistry(max_models=1, loader=loader)
+    _pool_state.update(model=registry.get(model_name, device, precision), audio=audio)
+
+def _transcribe_window(args: tuple) -> tuple[str, Optional[str]]:
+    """Transcribe one window of the shared audio in a pool worker."""
+    start, end, language, fp16 = args
+    result = _pool_state["model"].transcribe(
+        _pool_state["audio"][start:end],
+        language=language,
+        fp16=fp16
+    )
+    return result["text"].strip(), result.get("language")
+
+def _words(text: str) -> list[str]:
+    """Lowercased words without punctuation, for overlap matching."""
+    return [re.sub(r"[^\w]", "", word).lower() for word in text.split()]
+
+def _merge_overlap(previous: str, following: str, max_words: int = 12) -> str:
+    """Join two transcripts, dropping words the second repeats from the first."""
+    previous_words = _words(previous)
+    following_tokens = following.split()
+    following_words = _words(following)
+    limit = min(max_words, len(previous_words), len(following_words))
+    for size in range(limit, 0, -1):
+        if previous_words[-size:] == following_words[:size]:
+            following_tokens = following_tokens[size:]
+            break
+    return " ".join(part for part in (previous, " ".join(following_tokens)) if part)
 
 class SpeechToText:
     """Speech-to-Text processor using Whisper."""
-    
-    def __init__(self, model_name: str = "base"):
+
+    def __init__(
+        self,
+        model_name: str = WHISPER_MODEL,
+        short_model: Optional[str] = None,
+        long_model: Optional[str] = None,
+        long_audio_threshold: float = 30.0,
+        device: Optional[str] = None,
+        precision: str = WHISPER_PRECISION,
+        registry: Optional[ModelRegistry] = None,
+        transcript_cache: Optional[SQLiteCache] = None,
+        parallel_workers: int = WHISPER_PARALLEL_WORKERS,
+        parallel_min_seconds: float = WHISPER_PARALLEL_MIN_SECONDS,
+        threads: int = WHISPER_THREADS
+    ):
         """
         Initialize the STT processor.
-        
+
+        No model is loaded here; models are fetched from the registry the
+        first time they are needed.
+
         Args:
             model_name: Whisper model to use ("tiny", "base", "small", "medium", "large")
+            short_model: Optional model for clips shorter than long_audio_threshold
+            long_model: Optional model for clips at least long_audio_threshold long
+            long_audio_threshold: Clip length in seconds separating short and long clips
+            device: Torch device to run on (defaults to Whisper's choice)
+            precision: Inference precision ("fp32", "fp16", or "int8" for
+                int8-quantized linear layers on CPU)
+            registry: Model registry to load models from (defaults to the shared one)
+            transcript_cache: Optional cache of transcripts keyed by audio content
+            parallel_workers: Processes used for long recordings (0 = automatic,
+                1 = never split)
+            parallel_min_seconds: Minimum recording length for parallel transcription
+            threads: Torch intra-op threads used for inference (0 = torch's default)
+        """
+        if precision not in WHISPER_PRECISIONS:
+            raise ValueError(f"Unsupported precision: {precision}")
+        self.model_name = model_name
+        self.short_model = short_model
+        self.long_model = long_model
+        self.long_audio_threshold = long_audio_threshold
+        self.device = device
+        self.precision = precision
+        self.registry = registry or default_registry
+        self.transcript_cache = transcript_cache
+        if parallel_workers <= 0:
+            parallel_workers = min(4, os.cpu_count() or 1)
+        self.parallel_workers = parallel_workers
+        self.parallel_min_seconds = parallel_min_seconds
+        self.threads = threads
+
+    @property
+    def model(self):
+        """The default Whisper model, loaded on first access."""
+        return self.registry.get(self.model_name, self.device, self.precision)
+
+    def select_model_name(self, duration: float) -> str:
         """
-        self.model = whisper.load_model(model_name)
-    
+        Pick the Whisper model to use for a clip of the given duration.
+
+        Args:
+            duration: Clip duration in seconds
+
+        Returns:
+            str: Name of the model to use
+        """
+        if duration < self.long_audio_threshold:
+            return self.short_model or self.model_name
+        return self.long_model or self.model_name
+
+    def _cache_key(self, audio_hash: str, language: Optional[str]) -> str:
+        """Build the transcript cache key for audio content and settings."""
+        # The model actually used depends only on the clip length, so the
+        # whole model configuration identifies it without decoding first
+        models = "|".join([
+            self.short_model or "",
+            self.model_name,
+            self.long_model or "",
+            str(self.long_audio_threshold),
+        ])
+        return f"{audio_hash}:{models}:{self.precision}:{language or 'auto'}"
+
     def transcribe_audio(
         self,
-        audio_path: str,
+        audio_path: Union[str, Path, bytes],
         language: Optional[str] = None,
         save_transcript: bool = True
     ) -> str:
         """
         Convert spoken audio to text using Whisper.
-        
+
+        The audio is decoded once into 16 kHz mono samples in memory and
+        handed to Whisper directly, without an intermediate WAV file.
+
         Args:
-            audio_path: Path to the input audio file
-            language: Optional ISO language code (e.g., "en", "es")
-            save_transcript: Whether to save the transcript to a file
-            
+            audio_path: Path to the input audio file, or its raw bytes
+            language: Optional ISO language code (e.g., "en", "es"); None or
+                "auto" detects it
+            save_transcript: Whether to store the transcript in the transcript cache
+
         Returns:
             str: Transcribed text
         """
-        # Convert audio to WAV format if needed
-        wav_path = convert_audio_to_wav(audio_path)
-        
-        # Transcribe audio
-        result = self.model.transcribe(
-            wav_path,
-            language=language,
-            fp16=False  # Use float32 for better compatibility
+        return self.transcribe_with_language(audio_path, language, save_transcript)[0]
+
+    def transcribe_with_language(
+        self,
+        audio_path: Union[str, Path, bytes],
+        language: Optional[str] = None,
+        save_transcript: bool = True
+    ) -> tuple[str, Optional[str]]:
+        """
+        Transcribe audio and report the language it was transcribed in.
+
+        With no language given, Whisper's language identification runs on
+        the log-mel spectrogram of the first 30 seconds, choosing among the
+        supported languages only, and the detected language is then used to
+        transcribe the whole recording.
+
+        Args:
+            audio_path: Path to the input audio file, or its raw bytes
+            language: Optional ISO language code; None or "auto" detects it
+            save_transcript: Whether to store the transcript in the transcript cache
+
+        Returns:
+            tuple: (transcribed text, language code)
+        """
+        if language == AUTO_LANGUAGE:
+            language = None
+
+        with stage("stt", language=language or AUTO_LANGUAGE) as fields:
+            # Reuse an earlier transcript of the same audio if there is one
+            cache_key = None
+            if self.transcript_cache is not None:
+                cache_key = self._cache_key(content_hash(audio_path), language)
+                cached = self.transcript_cache.get(cache_key)
+                if cached is not None:
+                    fields["cache"] = "hit"
+                    cached = json.loads(cached)
+                    return cached["text"], cached["language"] or language
+
+            # Decode straight to the sample format Whisper works on
+            with stage("decode"):
+                audio = decode_audio(audio_path)
+            duration = len(audio) / SAMPLE_RATE
+
+            model_name = self.select_model_name(duration)
+            fields.update(audio_seconds=round(duration, 3), model=model_name, precision=self.precision)
+            model = self.registry.get(model_name, self.device, self.precision)
+            set_threads(self.threads)
+
+            if language is None:
+                with self.registry.inference_lock(model_name, self.device, self.precision):
+                    language = self._detect_language(model, audio)
+                fields["detected_language"] = language
+
+            # Transcribe audio, spreading long recordings over several processes
+            if self._use_parallel(duration):
+                fields["parallel"] = True
+                # The workers load their own models, so this model stays free
+                transcript, _ = self.transcribe_parallel(model_name, audio, language)
+            else:
+                with self.registry.inference_lock(model_name, self.device, self.precision):
+                    result = model.transcribe(
+                        audio,
+                        language=language,
+                        fp16=self.precision == "fp16"
+                    )
+                transcript = result["text"].strip()
+
+            # Save transcript if requested
+            if save_transcript and cache_key is not None:
+                self.transcript_cache.set(cache_key, json.dumps({
+                    "text": transcript,
+                    "language": language,
+                }))
+
+            return transcript, language
+
+    def _detect_language(self, model, audio) -> str:
+        """
+        Identify the spoken language from the first 30 seconds of audio.
+
+        This is the same encoder pass Whisper would make on its own before
+        decoding, but the result is restricted to the supported languages.
+        Callers must hold the model's inference lock.
+        """
+        if not model.is_multilingual:
+            return "en"
+        import whisper
+
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels)
+        mel = mel.to(model.device)
+        if self.precision == "fp16":
+            mel = mel.half()
+        _, probs = model.detect_language(mel)
+        return max(SUPPORTED_LANGUAGES, key=lambda code: probs.get(code, 0.0))
+
+    def _use_parallel(self, duration: float) -> bool:
+        """Whether a recording of this length should be split across processes."""
+        return self.parallel_workers > 1 and duration >= self.parallel_min_seconds
+
+    def transcribe_parallel(
+        self,
+        model_name: str,
+        audio,
+        language: Optional[str] = None
+    ) -> tuple[str, Optional[str]]:
+        """
+        Transcribe a long recording in silence-aligned windows across processes.
+
+        Workers start from a fresh interpreter (see ``_pool_context``) and
+        each loads the model itself, so this is only worth it for recordings
+        much longer than a model load. Windows overlap slightly so no word
+        is lost at a cut, and the repeated words are removed when the texts
+        are stitched together.
+
+        Args:
+            model_name: Whisper model to transcribe with
+            audio: 16 kHz mono samples
+            language: Optional ISO language code; detected on the first window if None
+
+        Returns:
+            tuple: (transcript, language)
+        """
+        windows = split_on_silence(audio, overlap=WINDOW_OVERLAP)
+        fp16 = self.precision == "fp16"
+        workers = min(self.parallel_workers, len(windows))
+        threads = max(1, (self.threads or os.cpu_count() or 1) // workers)
+
+        initargs = (
+            self.registry.loader,
+            model_name,
+            _resolve_device(self.device, self.precision),
+            self.precision,
+            threads,
+            audio
         )
-        
-        transcript = result["text"].strip()
-        
-        # Save transcript if requested
-        if save_transcript:
-            transcript_path = Path(wav_path).with_suffix(".txt")
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(transcript)
-        
-        return transcript
-
-# Create a default instance with the base model
-default_stt = SpeechToText() 
\ No newline at end of file
+        with _pool_context().Pool(workers, _init_pool_worker, initargs) as pool:
+            texts = []
+            if language is None:
+                # Settle the language once so every window agrees
+                text, language = pool.apply(
+                    _transcribe_window, ((*windows[0], None, fp16),)
+                )
+                texts.append(text)
+                windows = windows[1:]
+            results = pool.map(
+                _transcribe_window,
+                [(start, end, language, fp16) for start, end in windows]
+            )
+            texts.extend(text for text, _ in results)
+
+        transcript = ""
+        for text in texts:
+            transcript = _merge_overlap(transcript, text)
+        return transcript, language
+
+    def iter_segments(
+        self,
+        audio_path: Union[str, Path, bytes],
+        language: Optional[str] = None,
+        window_seconds: float = 30.0,
+        on_language: Optional[Callable[[str], None]] = None
+    ) -> Iterator[str]:
+        """
+        Transcribe audio window by window, yielding text as it is produced.
+
+        The audio is decoded once and transcribed in consecutive windows
+        of at most Whisper's 30-second context, cut at pauses, so callers can start working
+        on the first segments while later ones are still being transcribed.
+        Each window is conditioned on the previous window's text. Without a
+        language, it is identified from the start of the audio before the
+        first window is transcribed.
+
+        Args:
+            audio_path: Path to the input audio file, or its raw bytes
+            language: Optional ISO language code (e.g., "en", "es"); None or
+                "auto" detects it
+            window_seconds: Length of each transcription window in seconds
+            on_language: Called with the language before the first segment is yielded
+
+        Yields:
+            str: Transcribed text segments in order
+        """
+        if language == AUTO_LANGUAGE:
+            language = None
+
+        cache_key = None
+        if self.transcript_cache is not None:
+            cache_key = self._cache_key(content_hash(audio_path), language)
+            cached = self.transcript_cache.get(cache_key)
+            if cached is not None:
+                cached = json.loads(cached)
+                if on_language is not None:
+                    on_language(cached["language"] or language)
+                yield cached["text"]
+                return
+
+        audio = decode_audio(audio_path)
+        model_name = self.select_model_name(len(audio) / SAMPLE_RATE)
+        model = self.registry.get(model_name, self.device, self.precision)
+        set_threads(self.threads)
+
+        if language is None:
+            with self.registry.inference_lock(model_name, self.device, self.precision):
+                language = self._detect_language(model, audio)
+        if on_language is not None:
+            on_language(language)
+
+        previous_text = None
+        texts = []
+        for start, end in split_on_silence(audio, max_window=window_seconds):
+            with self.registry.inference_lock(model_name, self.device, self.precision):
+                result = model.transcribe(
+                    audio[start:end],
+                    language=language,
+                    initial_prompt=previous_text,
+                    fp16=self.precision == "fp16"
+                )
+            for segment in result["segments"]:
+                text = segment["text"].strip()
+                if text:
+                    texts.append(text)
+                    yield text
+            previous_text = result["text"].strip() or previous_text
+
+        # Store the complete transcript like transcribe_audio does
+        if cache_key is not None:
+            self.transcript_cache.set(cache_key, json.dumps({
+                "text": " ".join(texts),
+                "language": language,
+            }))
+
+# Shared registry so every SpeechToText instance reuses the same loaded models
+default_registry = ModelRegistry()
+
+# Create a default instance; the model itself is loaded on first use
+default_stt = SpeechToText(
+    transcript_cache=SQLiteCache(
+        TRANSCRIPT_CACHE_PATH,
+        max_entries=TRANSCRIPT_CACHE_MAX_ENTRIES,
+        name="transcripts"
+    )
+)
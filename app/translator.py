@@ -1,16 +1,580 @@
-"""Text translation module using deep-translator."""
+"""Text translation with pluggable engines.
 
-from typing import Optional
-from deep_translator import GoogleTranslator
-from .config import SUPPORTED_LANGUAGES
+Google Translate's web page, scraped the way deep-translator does it,
+is the default engine; its requests go through the shared provider
+client (see providers.py). A local MarianMT engine translates offline on
+the CPU when the optional ``transformers`` package is installed, and can
+also stand in while Google is failing.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+from .cache import LRUCache, SQLiteCache
+from .metrics import stage
+from .providers import CircuitOpenError, ProviderClient, ProviderError, get_provider
+from .segmenter import join_sentences, split_sentences
+from .config import (
+    MARIAN_MODEL_TEMPLATE,
+    SUPPORTED_LANGUAGES,
+    TRANSLATION_BACKEND,
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_CACHE_MAX_ENTRIES,
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_FALLBACK_BACKEND,
+    TRANSLATION_MEMORY_CACHE_SIZE,
+)
+
+# Google rejects requests over 5000 characters; leave room for separators
+MAX_PROVIDER_CHARS = 5000
+MAX_REQUEST_CHARS = 4500
+
+# Google Translate's mobile page, which returns the translation as HTML
+GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+# Google Translate's JSON endpoint, which also reports the detected language
+GOOGLE_DETECT_URL = "https://translate.googleapis.com/translate_a/single"
+
+# Separator used to pack several texts into one provider request
+BATCH_SEPARATOR = "\n"
+
+class GoogleWebClient:
+    """Google Translate's mobile web page, as scraped by deep-translator.
+
+    Requests go through the shared provider client, so they reuse pooled
+    connections and share its rate limit, retries and circuit breaker.
+    """
+
+    def __init__(
+        self,
+        source_lang: str = "auto",
+        target_lang: str = "en",
+        base_url: str = GOOGLE_TRANSLATE_URL,
+        provider: Optional[ProviderClient] = None,
+        detect_url: str = GOOGLE_DETECT_URL
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            source_lang: Source language code, or "auto"
+            target_lang: Target language code
+            base_url: Page to request
+            provider: Provider client (defaults to the shared "google_translate" one)
+            detect_url: Endpoint used for language detection
+        """
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.base_url = base_url
+        self.detect_url = detect_url
+        self.provider = provider or get_provider("google_translate")
+
+    def translate(self, text: str) -> str:
+        """Translate one text with a single request."""
+        text = text.strip()
+        if not text or self.source_lang == self.target_lang:
+            return text
+        if len(text) > MAX_PROVIDER_CHARS:
+            raise ValueError(f"Text longer than {MAX_PROVIDER_CHARS} characters")
+
+        response = self.provider.request(
+            "GET",
+            self.base_url,
+            params={"sl": self.source_lang, "tl": self.target_lang, "q": text}
+        )
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(response.text, "html.parser")
+        element = (
+            soup.find("div", {"class": "t0"})
+            or soup.find("div", {"class": "result-container"})
+        )
+        if element is None:
+            raise ProviderError("No translation in the Google Translate response", retriable=False)
+        return element.get_text(strip=True)
+
+    def detect_language(self, text: str) -> Optional[str]:
+        """
+        Identify the language of a text with a single request.
+
+        Returns:
+            str: Google's language code without a region ("zh-CN" becomes
+            "zh"), or None for empty text
+        """
+        text = text.strip()
+        if not text:
+            return None
+        if len(text) > MAX_PROVIDER_CHARS:
+            text = text[:MAX_PROVIDER_CHARS]
+
+        response = self.provider.request(
+            "GET",
+            self.detect_url,
+            params={"client": "gtx", "sl": "auto", "tl": self.target_lang, "dt": "t", "q": text}
+        )
+        try:
+            detected = response.json()[2]
+        except (ValueError, IndexError, KeyError, TypeError):
+            detected = None
+        if not isinstance(detected, str) or not detected:
+            raise ProviderError("No language in the Google Translate response", retriable=False)
+        return detected.split("-")[0].lower()
+
+def google_client(source_lang: str = "auto", target_lang: str = "en") -> GoogleWebClient:
+    """Build a Google Translate client for a language pair."""
+    return GoogleWebClient(source_lang, target_lang)
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace so trivially different inputs share a cache entry."""
+    return " ".join(text.split())
+
+@dataclass
+class BatchTranslation:
+    """Outcome of translating one item of a batch."""
+
+    text: str
+    translation: Optional[str] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was translated successfully."""
+        return self.error is None
+
+class TranslationBackend:
+    """Engine that translates texts between two languages.
+
+    Backends only translate; validation, caching and de-duplication are
+    handled by Translator. Subclasses implement ``translate_many`` and may
+    override ``translate`` when a single text has a cheaper path.
+    """
+
+    # Identifies the engine in cache keys and metrics
+    name = "backend"
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate one text, raising on failure."""
+        translation, error = self.translate_many([text], source_lang, target_lang)[0]
+        if error is not None:
+            raise error
+        return translation
+
+    def translate_many(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str
+    ) -> list[tuple[Optional[str], Optional[Exception]]]:
+        """
+        Translate several texts.
+
+        Returns:
+            list: One (translation, error) pair per text, in input order
+        """
+        raise NotImplementedError
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate over the network.
+
+    Batches are packed into newline-separated requests up to the
+    provider's character limit and sent concurrently.
+    """
+
+    name = "google"
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[str, str], Any]] = None,
+        max_request_chars: int = MAX_REQUEST_CHARS,
+        max_workers: int = 4
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            client_factory: Callable building a client with a ``translate(text)``
+                method for a (source, target) pair; defaults to GoogleWebClient
+            max_request_chars: Character limit of a single provider request
+            max_workers: Maximum number of concurrent provider requests in a batch
+        """
+        self.client_factory = client_factory or google_client
+        self.max_request_chars = max_request_chars
+        self.max_workers = max_workers
+        # Clients may keep per-request state, so each thread reuses its
+        # own client per language pair
+        self._local = threading.local()
+
+    def _get_client(self, source_lang: str, target_lang: str):
+        """Return this thread's client for a language pair, creating it once."""
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+        client = clients.get((source_lang, target_lang))
+        if client is None:
+            client = self.client_factory(source_lang, target_lang)
+            clients[(source_lang, target_lang)] = client
+        return client
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate one text with a single request."""
+        return self._get_client(source_lang, target_lang).translate(text)
+
+    def translate_many(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str
+    ) -> list[tuple[Optional[str], Optional[Exception]]]:
+        """Translate texts with as few requests as the character limit allows."""
+        packs = self._pack(list(enumerate(texts)))
+        results = [(None, None)] * len(texts)
+
+        with stage("google_translate", requests=len(packs)):
+            workers = max(1, min(self.max_workers, len(packs)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = executor.map(
+                    lambda pack: self._translate_pack(pack, source_lang, target_lang),
+                    packs
+                )
+                for pack_outcome in outcomes:
+                    for index, translation, error in pack_outcome:
+                        results[index] = (translation, error)
+        return results
+
+    def _pack(self, items: list[tuple[Any, str]]) -> list[list[tuple[Any, str]]]:
+        """Greedily group (key, text) items into requests under the character limit."""
+        packs = []
+        current = []
+        current_chars = 0
+        for key, text in items:
+            # Texts that already contain the separator cannot be split back
+            # apart reliably, so they always go on their own
+            if BATCH_SEPARATOR in text:
+                packs.append([(key, text)])
+                continue
+            added = len(text) + (len(BATCH_SEPARATOR) if current else 0)
+            if current and current_chars + added > self.max_request_chars:
+                packs.append(current)
+                current = []
+                current_chars = 0
+                added = len(text)
+            current.append((key, text))
+            current_chars += added
+        if current:
+            packs.append(current)
+        return packs
+
+    def _translate_pack(
+        self,
+        pack: list[tuple[Any, str]],
+        source_lang: str,
+        target_lang: str
+    ) -> list[tuple[Any, Optional[str], Optional[Exception]]]:
+        """
+        Translate one packed request, falling back to single items on failure.
+
+        When the provider itself is failing (throttled, down or rejected by
+        the circuit breaker), the items are not retried one by one, which
+        would only multiply the load on it.
+        """
+        client = self._get_client(source_lang, target_lang)
+
+        if len(pack) > 1:
+            try:
+                joined = client.translate(BATCH_SEPARATOR.join(text for _, text in pack))
+                parts = joined.split(BATCH_SEPARATOR) if joined else []
+                if len(parts) == len(pack):
+                    return [(key, part.strip(), None) for (key, _), part in zip(pack, parts)]
+            except ProviderError as e:
+                if e.retriable or isinstance(e, CircuitOpenError):
+                    return [(key, None, e) for key, _ in pack]
+            except Exception:
+                pass
+
+        outcome = []
+        for key, text in pack:
+            try:
+                outcome.append((key, client.translate(text), None))
+            except Exception as e:
+                outcome.append((key, None, e))
+        return outcome
+
+class MarianBackend(TranslationBackend):
+    """Local MarianMT models (Helsinki-NLP OPUS-MT) running on the CPU.
+
+    Texts are split into sentences, which are translated in length-sorted
+    batches so little work is wasted on padding. Each model is loaded once
+    per process and device and shared by all instances. Pairs without a
+    direct model are translated through English. Requires ``transformers`` and
+    ``sentencepiece``.
+    """
+
+    name = "marian"
+
+    def __init__(
+        self,
+        model_template: str = MARIAN_MODEL_TEMPLATE,
+        batch_size: int = TRANSLATION_BATCH_SIZE,
+        device: str = "cpu",
+        max_length: int = 512,
+        num_beams: Optional[int] = None,
+        pivot_lang: str = "en"
+    ):
+        """
+        Initialize the backend. Models are loaded on first use.
+
+        Args:
+            model_template: Model name with ``{source}`` and ``{target}`` placeholders
+            batch_size: Sentences per inference batch
+            device: Torch device to run on
+            max_length: Maximum tokens per input and output sentence
+            num_beams: Beam width (defaults to the model's own setting)
+            pivot_lang: Language used to bridge pairs without a direct model
+        """
+        self.model_template = model_template
+        self.batch_size = batch_size
+        self.device = device
+        self.max_length = max_length
+        self.num_beams = num_beams
+        self.pivot_lang = pivot_lang
+
+    def translate_many(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str
+    ) -> list[tuple[Optional[str], Optional[Exception]]]:
+        """Translate all sentences of all texts in shared batches."""
+        pieces = [
+            (index, sentence)
+            for index, text in enumerate(texts)
+            for sentence in split_sentences(text, source_lang)
+        ]
+        sentences = [sentence for _, sentence in pieces]
+        try:
+            for model_name in self._route(source_lang, target_lang):
+                sentences = self._generate(model_name, sentences)
+        except Exception as e:
+            return [(None, e)] * len(texts)
+
+        parts = [[] for _ in texts]
+        for (index, _), sentence in zip(pieces, sentences):
+            parts[index].append(sentence)
+        return [(join_sentences(sentences, target_lang), None) for sentences in parts]
+
+    def _route(self, source_lang: str, target_lang: str) -> list[str]:
+        """Model names translating source to target, directly or via the pivot."""
+        direct = self.model_template.format(source=source_lang, target=target_lang)
+        if _marian_model_exists(direct) or self.pivot_lang in (source_lang, target_lang):
+            return [direct]
+        return [
+            self.model_template.format(source=source_lang, target=self.pivot_lang),
+            self.model_template.format(source=self.pivot_lang, target=target_lang),
+        ]
+
+    def _generate(self, model_name: str, sentences: list[str]) -> list[str]:
+        """Translate sentences with one model, batch by batch."""
+        import torch
+
+        tokenizer, model, lock = _load_marian(model_name, self.device)
+        # Sentences of similar length share a batch, so less padding is computed
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        generate_kwargs = {"max_new_tokens": self.max_length}
+        if self.num_beams is not None:
+            generate_kwargs["num_beams"] = self.num_beams
+
+        results = [""] * len(sentences)
+        with stage("marian_generate", model=model_name, sentences=len(sentences)), \
+                lock, torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                inputs = tokenizer(
+                    [sentences[i] for i in batch],
+                    return_tensors="pt",
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length
+                ).to(self.device)
+                outputs = model.generate(**inputs, **generate_kwargs)
+                for i, text in zip(batch, tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                    results[i] = text.strip()
+        return results
+
+# MarianMT models loaded in this process: (name, device) -> (tokenizer, model, inference lock)
+_marian_models = {}
+# One lock per (name, device), so loading or downloading one model does not
+# hold up translations with models that are already loaded
+_marian_load_locks = {}
+# Model name -> whether the hub (or local directory) has it
+_marian_available = {}
+_marian_lock = threading.Lock()
+
+def _load_marian(model_name: str, device: str = "cpu") -> tuple:
+    """Load a MarianMT model and tokenizer once per process and device."""
+    key = (model_name, device)
+    with _marian_lock:
+        entry = _marian_models.get(key)
+        if entry is not None:
+            return entry
+        load_lock = _marian_load_locks.setdefault(key, threading.Lock())
+
+    with load_lock:
+        with _marian_lock:
+            entry = _marian_models.get(key)
+        if entry is not None:
+            # Loaded by another thread while this one waited
+            return entry
+        try:
+            from transformers import MarianMTModel, MarianTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The marian translation backend requires: pip install transformers sentencepiece"
+            ) from e
+        with stage("model_load", model=model_name, device=device):
+            tokenizer = MarianTokenizer.from_pretrained(model_name)
+            model = MarianMTModel.from_pretrained(model_name).to(device).eval()
+        with _marian_lock:
+            entry = _marian_models[key] = (tokenizer, model, threading.Lock())
+        return entry
+
+def _marian_model_exists(model_name: str) -> bool:
+    """
+    Whether a model exists, checked from metadata without loading it.
+
+    Answers from the hub are remembered. Without network access, only
+    models in the local Hugging Face cache count as existing.
+    """
+    with _marian_lock:
+        if model_name in _marian_available:
+            return _marian_available[model_name]
+        if any(name == model_name for name, _ in _marian_models):
+            return True
+
+    if os.path.isdir(model_name):
+        exists = os.path.isfile(os.path.join(model_name, "config.json"))
+    else:
+        try:
+            from huggingface_hub import file_exists, try_to_load_from_cache
+        except ImportError as e:
+            raise ImportError(
+                "The marian translation backend requires: pip install transformers sentencepiece"
+            ) from e
+        try:
+            exists = file_exists(model_name, "config.json")
+        except Exception:
+            # Offline or the hub is unreachable: fall back to the local cache
+            # and ask again next time
+            try:
+                return isinstance(try_to_load_from_cache(model_name, "config.json"), str)
+            except Exception:
+                return False
+
+    with _marian_lock:
+        _marian_available[model_name] = exists
+    return exists
+
+# Available translation engines by name
+BACKENDS = {
+    "google": GoogleBackend,
+    "marian": MarianBackend,
+}
+
+def create_backend(name: str = TRANSLATION_BACKEND, **kwargs) -> TranslationBackend:
+    """
+    Build a translation backend by name.
+
+    Args:
+        name: "google" or "marian"
+        **kwargs: Arguments for the backend's constructor
+
+    Returns:
+        TranslationBackend: The backend
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown translation backend: {name}") from None
+    return backend_class(**kwargs)
 
 class Translator:
-    """Text translator using Google Translate API."""
-    
-    def __init__(self):
-        """Initialize the translator."""
-        self.translator = GoogleTranslator()
-        
+    """Text translator with caching in front of a translation backend."""
+
+    def __init__(
+        self,
+        cache_size: int = TRANSLATION_MEMORY_CACHE_SIZE,
+        cache_path: Optional[Union[str, Path]] = None,
+        cache_max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES,
+        client_factory: Optional[Callable[[str, str], Any]] = None,
+        max_request_chars: int = MAX_REQUEST_CHARS,
+        max_workers: int = 4,
+        backend: Optional[TranslationBackend] = None,
+        fallback: Optional[TranslationBackend] = None
+    ):
+        """
+        Initialize the translator.
+
+        Args:
+            cache_size: Number of translations kept in the in-process cache
+            cache_path: Optional SQLite file for a persistent second-tier cache
+            cache_max_entries: Maximum number of entries in the persistent cache
+            client_factory: Callable building a client with a ``translate(text)``
+                method for a (source, target) pair, used by the Google backend;
+                its "auto" client's ``detect_language(text)`` serves language detection
+            max_request_chars: Google backend only: character limit of a request
+            max_workers: Google backend only: concurrent requests in a batch
+            backend: Translation engine (defaults to a GoogleBackend built
+                from the arguments above)
+            fallback: Optional engine used while the backend's provider is
+                failing; its results are not cached
+        """
+        self._detector = None
+        self._client_factory = client_factory or google_client
+        self.backend = backend or GoogleBackend(client_factory, max_request_chars, max_workers)
+        self.fallback = fallback
+        self.memory_cache = LRUCache(cache_size, name="translations_memory")
+        self.disk_cache = None
+        if cache_path is not None:
+            self.disk_cache = SQLiteCache(
+                cache_path,
+                max_entries=cache_max_entries,
+                name="translations_disk"
+            )
+
+    @property
+    def translator(self):
+        """Auto-detecting client used for language detection, built on first use."""
+        if self._detector is None:
+            self._detector = self._client_factory("auto", "en")
+        return self._detector
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a translation in the memory cache, then on disk."""
+        translated_text = self.memory_cache.get(key)
+        if translated_text is None and self.disk_cache is not None:
+            translated_text = self.disk_cache.get(key)
+            if translated_text is not None:
+                self.memory_cache.set(key, translated_text)
+        return translated_text
+
+    def _cache_set(self, key: str, translated_text: str) -> None:
+        """Store a translation in both cache tiers."""
+        self.memory_cache.set(key, translated_text)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, translated_text)
+
+    def _cache_key(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Build the cache key; engines differ, so each has its own entries."""
+        return f"{self.backend.name}:{source_lang}:{target_lang}:{normalize_text(text)}"
+
+    def _validate_languages(self, source_lang: str, target_lang: str) -> None:
+        """Raise ValueError for unsupported language codes."""
+        if source_lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported source language: {source_lang}")
+        if target_lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported target language: {target_lang}")
+
     def translate_text(
         self,
         text: str,
@@ -20,50 +584,176 @@ class Translator:
     ) -> str:
         """
         Translate text from source language to target language.
-        
+
+        Translations are cached by language pair and whitespace-normalized
+        text, so repeated phrases skip the backend. Text whose
+        source and target language are the same is returned unchanged.
+        If the backend's provider is failing and a fallback engine is
+        configured, the fallback translates instead.
+
         Args:
             text: Text to translate
             source_lang: Source language code (e.g., "en", "es")
             target_lang: Target language code
             preserve_formatting: Whether to preserve text formatting
-            
+
         Returns:
             str: Translated text
         """
         # Validate language codes
-        if source_lang not in SUPPORTED_LANGUAGES:
-            raise ValueError(f"Unsupported source language: {source_lang}")
-        if target_lang not in SUPPORTED_LANGUAGES:
-            raise ValueError(f"Unsupported target language: {target_lang}")
-            
-        # Create translator for the specific language pair
-        translator = GoogleTranslator(
-            source=source_lang,
-            target=target_lang
-        )
-        
-        # Translate the text
-        translated_text = translator.translate(text)
-        
-        return translated_text
-    
+        self._validate_languages(source_lang, target_lang)
+        if source_lang == target_lang:
+            return text
+
+        with stage(
+            "translate",
+            chars=len(text),
+            pair=f"{source_lang}-{target_lang}",
+            backend=self.backend.name
+        ) as fields:
+            key = self._cache_key(text, source_lang, target_lang)
+            translated_text = self._cache_get(key)
+            if translated_text is not None:
+                fields["cache"] = "hit"
+                return translated_text
+
+            try:
+                translated_text = self.backend.translate(text, source_lang, target_lang)
+            except ProviderError:
+                if self.fallback is None:
+                    raise
+                fields["fallback"] = self.fallback.name
+                return self.fallback.translate(text, source_lang, target_lang)
+
+            if translated_text is not None:
+                self._cache_set(key, translated_text)
+
+            return translated_text
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str
+    ) -> list[BatchTranslation]:
+        """
+        Translate many texts with as little backend work as possible.
+
+        Cached and duplicate texts are resolved without the backend, and
+        the rest go to it in one call: the Google backend packs them into
+        as few concurrent requests as possible, and local models translate
+        them in shared batches. One failing text only fails its own entry.
+
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code (e.g., "en", "es")
+            target_lang: Target language code
+
+        Returns:
+            list[BatchTranslation]: One result per input text, in input order
+        """
+        self._validate_languages(source_lang, target_lang)
+        if source_lang == target_lang:
+            return [BatchTranslation(text=text, translation=text) for text in texts]
+
+        with stage(
+            "translate_batch",
+            items=len(texts),
+            pair=f"{source_lang}-{target_lang}",
+            backend=self.backend.name
+        ) as fields:
+            return self._translate_batch(texts, source_lang, target_lang, fields)
+
+    def _translate_batch(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str,
+        fields: dict
+    ) -> list[BatchTranslation]:
+        """Body of translate_batch; ``fields`` collects metrics for the stage."""
+        results = [BatchTranslation(text=text) for text in texts]
+
+        # Resolve empty and cached texts, and group the rest by cache key
+        pending = {}
+        for index, text in enumerate(texts):
+            normalized = normalize_text(text)
+            if not normalized:
+                results[index].translation = text
+                continue
+            key = self._cache_key(normalized, source_lang, target_lang)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[index].translation = cached
+            else:
+                pending.setdefault(key, (text.strip(), []))[1].append(index)
+
+        if pending:
+            keys = list(pending)
+            pending_texts = [pending[key][0] for key in keys]
+            fields["chars"] = sum(len(text) for text in pending_texts)
+
+            outcomes = list(self.backend.translate_many(pending_texts, source_lang, target_lang))
+            fallen_back = self._fall_back(pending_texts, outcomes, source_lang, target_lang, fields)
+            for position, (key, (translation, error)) in enumerate(zip(keys, outcomes)):
+                if translation is not None and position not in fallen_back:
+                    self._cache_set(key, translation)
+                elif error is None:
+                    error = ValueError("Provider returned no translation")
+                for index in pending[key][1]:
+                    results[index].translation = translation
+                    results[index].error = error
+
+        return results
+
+    def _fall_back(
+        self,
+        texts: list[str],
+        outcomes: list[tuple[Optional[str], Optional[Exception]]],
+        source_lang: str,
+        target_lang: str,
+        fields: dict
+    ) -> set[int]:
+        """
+        Retry items that failed for provider reasons on the fallback engine.
+
+        ``outcomes`` is updated in place.
+
+        Returns:
+            set[int]: Positions translated by the fallback, which are not cached
+        """
+        failed = [
+            index for index, (_, error) in enumerate(outcomes)
+            if isinstance(error, ProviderError)
+        ]
+        if self.fallback is None or not failed:
+            return set()
+        fields.update(fallback=self.fallback.name, fallback_items=len(failed))
+
+        retried = self.fallback.translate_many([texts[i] for i in failed], source_lang, target_lang)
+        for index, outcome in zip(failed, retried):
+            outcomes[index] = outcome
+        return set(failed)
+
     def detect_language(self, text: str) -> Optional[str]:
         """
         Detect the language of the input text.
-        
+
         Args:
             text: Text to analyze
-            
+
         Returns:
             str: ISO language code or None if detection failed
         """
         try:
             detected = self.translator.detect_language(text)
-            if detected in SUPPORTED_LANGUAGES:
-                return detected
-        except Exception:
-            pass
-        return None
+        except ProviderError:
+            return None
+        return detected if detected in SUPPORTED_LANGUAGES else None
 
-# Create a default instance
-default_translator = Translator() 
\ No newline at end of file
+# Create a default instance with the configured engines
+default_translator = Translator(
+    cache_path=TRANSLATION_CACHE_PATH,
+    backend=create_backend(),
+    fallback=create_backend(TRANSLATION_FALLBACK_BACKEND) if TRANSLATION_FALLBACK_BACKEND else None
+)
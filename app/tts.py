@@ -1,168 +1,768 @@
-"""Text-to-Speech module using Google Text-to-Speech (gTTS)."""
+"""Text-to-Speech module.
 
+Speech comes from a pluggable engine: Google Text-to-Speech (gTTS) over
+the network, or espeak-ng running locally. Engines hand back audio in
+memory, which is written to the requested format with a single encode.
+"""
+
+import base64
+import hashlib
+import io
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-from gtts import gTTS
-from pydub import AudioSegment
-from .config import OUTPUT_DIR, SUPPORTED_LANGUAGES
+from typing import BinaryIO, Optional, Union
+from .artifacts import ArtifactStore, default_artifacts
+from .cache import FileCache
+from .metrics import stage
+from .providers import ProviderClient, ProviderError, get_provider
+from .segmenter import segment_text
+from .config import (
+    ESPEAK_COMMAND,
+    OUTPUT_DIR,
+    SUPPORTED_LANGUAGES,
+    TTS_BACKEND,
+    TTS_CACHE_MAX_BYTES,
+    TTS_FALLBACK_BACKEND
+)
 from .utils import generate_filename
 
+# Base64 MP3 in a batchexecute response, as parsed by gTTS. GTTSBackend
+# relies on gTTS internals (this pattern and gTTS._prepare_requests);
+# tests/test_tts.py checks both against the installed gTTS, which must
+# match the version pinned in requirements.txt
+_GTTS_AUDIO = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+@dataclass
+class SpeechAudio:
+    """Audio produced by a TTS engine.
+
+    ``format`` is either an encoded container ("mp3") or "pcm" for raw
+    signed little-endian samples described by the remaining fields.
+    """
+    data: bytes
+    format: str
+    sample_rate: int = 0
+    channels: int = 1
+    sample_width: int = 2
+
+class TTSBackend:
+    """Base class for speech synthesis engines."""
+
+    name = "base"
+    # Characters per synthesis request; segments are packed up to this size
+    max_chars = 500
+
+    def synthesize(self, text: str, lang_code: str, slow: bool = False) -> SpeechAudio:
+        """
+        Synthesize speech for one piece of text.
+
+        Args:
+            text: Text to speak
+            lang_code: Language code (e.g., "en", "es")
+            slow: Whether to speak slowly
+
+        Returns:
+            SpeechAudio: The synthesized audio
+        """
+        raise NotImplementedError
+
+class GTTSBackend(TTSBackend):
+    """Google Text-to-Speech over the network; always returns MP3.
+
+    gTTS builds the requests, but they are sent through the shared provider
+    client rather than gTTS's own one-session-per-request loop, so they
+    reuse pooled connections and share its rate limit, retries and
+    circuit breaker.
+    """
+
+    name = "gtts"
+    # gTTS sends at most this many characters per request (GOOGLE_TTS_MAX_CHARS)
+    max_chars = 100
+
+    def __init__(self, provider: Optional[ProviderClient] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            provider: Provider client (defaults to the shared "gtts" one)
+        """
+        self.provider = provider or get_provider("gtts")
+
+    def synthesize(self, text: str, lang_code: str, slow: bool = False) -> SpeechAudio:
+        """
+        Request speech from Google and collect the MP3 in memory.
+
+        gTTS's own tokenizer starts a new request at every punctuation
+        mark; handing it chunks packed up to the request limit instead
+        means the fewest requests per text.
+        """
+        from gtts import gTTS
+
+        tts = gTTS(
+            text=text,
+            lang=lang_code,
+            slow=slow,
+            tokenizer_func=lambda text: segment_text(text, lang_code, self.max_chars)
+        )
+        parts = []
+        for request in tts._prepare_requests():
+            response = self.provider.request(
+                "POST",
+                request.url,
+                data=request.body,
+                headers=dict(request.headers)
+            )
+            match = _GTTS_AUDIO.search(response.text)
+            if match is None:
+                raise ProviderError("No audio in the gTTS response", retriable=False)
+            parts.append(base64.b64decode(match.group(1)))
+        return SpeechAudio(b"".join(parts), "mp3")
+
+class EspeakBackend(TTSBackend):
+    """espeak-ng running locally; returns 16-bit PCM without touching the network."""
+
+    name = "espeak"
+
+    # espeak-ng voice names that differ from our language codes
+    VOICES = {"zh": "cmn"}
+
+    def __init__(
+        self,
+        command: str = ESPEAK_COMMAND,
+        words_per_minute: int = 175,
+        slow_words_per_minute: int = 120
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            command: espeak-ng executable
+            words_per_minute: Normal speaking rate
+            slow_words_per_minute: Speaking rate when ``slow`` is requested
+        """
+        self.command = command
+        self.words_per_minute = words_per_minute
+        self.slow_words_per_minute = slow_words_per_minute
+
+    def synthesize(self, text: str, lang_code: str, slow: bool = False) -> SpeechAudio:
+        """Run espeak-ng with the text on stdin and read its WAV output from stdout."""
+        rate = self.slow_words_per_minute if slow else self.words_per_minute
+        cmd = [
+            self.command, "--stdin", "--stdout", "-b", "1",
+            "-v", self.VOICES.get(lang_code, lang_code),
+            "-s", str(rate)
+        ]
+        try:
+            result = subprocess.run(cmd, input=text.encode("utf-8"), capture_output=True)
+        except FileNotFoundError:
+            raise RuntimeError(
+                f"The espeak TTS backend requires {self.command} to be installed"
+            ) from None
+        if result.returncode != 0:
+            raise RuntimeError(f"espeak-ng failed: {result.stderr.decode(errors='ignore')}")
+
+        # Output to a pipe carries a placeholder length, so read up to EOF
+        with wave.open(io.BytesIO(result.stdout)) as wav:
+            return SpeechAudio(
+                wav.readframes(wav.getnframes()),
+                "pcm",
+                sample_rate=wav.getframerate(),
+                channels=wav.getnchannels(),
+                sample_width=wav.getsampwidth()
+            )
+
+# Available speech engines by name
+BACKENDS = {
+    "gtts": GTTSBackend,
+    "espeak": EspeakBackend,
+}
+
+def create_backend(name: str = TTS_BACKEND, **kwargs) -> TTSBackend:
+    """
+    Build a TTS backend by name.
+
+    Args:
+        name: "gtts" or "espeak"
+        **kwargs: Arguments for the backend's constructor
+
+    Returns:
+        TTSBackend: The backend
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend: {name}") from None
+    return backend_class(**kwargs)
+
+# How synthesized audio is handed back: a file path, bytes, or a file-like stream
+RETURN_TYPES = ("path", "bytes", "stream")
+
+# Audio accepted as input: a file path, encoded bytes, or a readable binary file
+AudioSource = Union[str, Path, bytes, BinaryIO]
+
 class TextToSpeech:
-    """Text-to-Speech processor using Google TTS."""
+    """Text-to-Speech processor in front of a speech engine."""
     
-    def __init__(self):
-        """Initialize the TTS processor."""
-        # Ensure output directory exists
-        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        audio_cache: Optional[FileCache] = None,
+        max_workers: int = 4,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        artifacts: Optional[ArtifactStore] = None,
+        backend: Optional[TTSBackend] = None,
+        fallback: Optional[TTSBackend] = None
+    ):
+        """
+        Initialize the TTS processor.
+
+        Args:
+            audio_cache: Optional cache of synthesized audio keyed by content
+            max_workers: Maximum number of segments synthesized concurrently
+            max_retries: Number of retries for a failed segment
+            retry_backoff: Delay in seconds before the first retry; doubles per retry
+            artifacts: Optional store that reaps the files this instance names itself
+            backend: Speech engine (defaults to Google TTS)
+            fallback: Optional engine used while the backend's provider is
+                failing; its audio is not cached
+        """
+        self.backend = backend or GTTSBackend()
+        self.fallback = fallback
+        self.audio_cache = audio_cache
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.artifacts = artifacts
+
+    def _track(self, path) -> str:
+        """Hand a generated file to the artifact store, if any."""
+        if self.artifacts is not None:
+            self.artifacts.register(path)
+        return str(path)
+
+    def _cache_key(self, text: str, lang_code: str, slow: bool, output_format: str) -> str:
+        """Build the audio cache key for a synthesis request."""
+        request = "\0".join([self.backend.name, lang_code, str(slow), output_format.lower(), text])
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
     
     def synthesize_speech(
         self,
         text: str,
         lang_code: str,
-        output_path: Optional[str] = None,
+        output_path: Optional[Union[str, Path, BinaryIO]] = None,
         slow: bool = False,
-        output_format: str = "mp3"
-    ) -> str:
+        output_format: str = "mp3",
+        return_type: str = "path"
+    ) -> Union[str, bytes, BinaryIO]:
         """
-        Convert text to speech using Google TTS.
+        Convert text to speech with the configured engine.
+
+        The engine's audio is encoded once, straight to the requested
+        format. When an audio cache is configured, a request identical to an
+        earlier one returns the cached artifact without calling the engine. If no
+        output path is given, the cached file itself is returned.
+
+        With ``return_type`` "bytes" or "stream", or a file object as
+        ``output_path``, the audio never goes through a file of its own
+        (the audio cache, if any, still keeps a copy).
         
         Args:
             text: Text to convert to speech
             lang_code: Language code (e.g., "en", "es")
-            output_path: Optional path for output audio file
+            output_path: Optional path for output audio file, or a writable
+                binary file object to write the audio to
             slow: Whether to speak slowly
             output_format: Output audio format ("mp3" or "wav")
+            return_type: "path", "bytes" or "stream" (a BytesIO)
             
         Returns:
-            str: Path to the generated audio file
+            Path to the generated audio file, the audio as bytes or a
+            stream, or ``output_path`` itself when it is a file object
         """
         # Validate language code
         if lang_code not in SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language code: {lang_code}")
-            
-        # Generate output path if not provided
-        if output_path is None:
-            output_path = OUTPUT_DIR / generate_filename(
-                prefix=f"tts_{lang_code}",
-                extension=f".{output_format}"
-            )
-        else:
-            output_path = Path(output_path)
-            
-        # Create gTTS object and generate speech
-        tts = gTTS(text=text, lang=lang_code, slow=slow)
-        
-        # Save as MP3 first (gTTS only supports MP3)
-        temp_mp3 = output_path.with_suffix('.mp3')
-        tts.save(str(temp_mp3))
-        
-        # Convert to desired format if not MP3
-        if output_format.lower() != "mp3":
-            audio = AudioSegment.from_mp3(temp_mp3)
-            audio.export(output_path, format=output_format)
-            temp_mp3.unlink()  # Remove temporary MP3
-            
-        return str(output_path)
+        _check_return_type(return_type)
+        in_memory = _is_sink(output_path) or return_type != "path"
+
+        with stage(
+            "tts",
+            chars=len(text),
+            lang=lang_code,
+            format=output_format,
+            backend=self.backend.name
+        ) as fields:
+            extension = f".{output_format}"
+            cache_key = None
+            if self.audio_cache is not None:
+                cache_key = self._cache_key(text, lang_code, slow, output_format)
+                cached_path = self.audio_cache.get(cache_key, extension)
+                if cached_path is not None:
+                    try:
+                        size = cached_path.stat().st_size
+                        if in_memory:
+                            result = _deliver(cached_path.read_bytes(), output_path, return_type)
+                        elif output_path is None:
+                            result = str(cached_path)
+                        else:
+                            shutil.copyfile(cached_path, output_path)
+                            result = str(output_path)
+                    except FileNotFoundError:
+                        # Evicted or cleaned up since the lookup: treat it as a miss
+                        self.audio_cache.discard(cache_key, extension)
+                    else:
+                        fields.update(cache="hit", bytes=size)
+                        return result
+
+            try:
+                audio = self.backend.synthesize(text, lang_code, slow)
+            except ProviderError:
+                if self.fallback is None:
+                    raise
+                fields["fallback"] = self.fallback.name
+                audio = self.fallback.synthesize(text, lang_code, slow)
+                # Keep the stand-in voice out of the cache
+                cache_key = None
+            data = _encode_audio(audio, output_format)
+            fields["bytes"] = len(data)
+
+            # Keep the result for identical future requests
+            if cache_key is not None:
+                cached_path = self.audio_cache.put(cache_key, extension, data)
+                if output_path is None and not in_memory:
+                    return str(cached_path)
+
+            if in_memory:
+                return _deliver(data, output_path, return_type)
+
+            if output_path is None:
+                output_path = _output_file(f"tts_{lang_code}", extension)
+                output_path.write_bytes(data)
+                return self._track(output_path)
+
+            Path(output_path).write_bytes(data)
+            return str(output_path)
     
     def create_audio_segments(
         self,
         text: str,
         lang_code: str,
-        max_chars: int = 500,
+        max_chars: Optional[int] = None,
+        max_workers: Optional[int] = None,
         **kwargs
-    ) -> list[str]:
+    ) -> list[Union[str, bytes, BinaryIO]]:
         """
         Split long text into segments and convert each to speech.
+
+        Text is split into sentences by the rules of its language and
+        packed into as few segments as the engine's request limit allows,
+        so with gTTS each segment is exactly one request. Segments are
+        synthesized concurrently, each with its own retries and exponential
+        backoff, and returned in their original order.
         
         Args:
             text: Long text to convert to speech
             lang_code: Language code
-            max_chars: Maximum characters per segment
-            **kwargs: Additional arguments for synthesize_speech
+            max_chars: Maximum characters per segment (defaults to the
+                engine's per-request limit)
+            max_workers: Concurrent segment limit (defaults to the instance setting)
+            **kwargs: Additional arguments for synthesize_speech; with a
+                ``return_type`` of "bytes" or "stream" no segment files are written
             
         Returns:
-            list[str]: List of paths to audio segment files
+            list: Paths to audio segment files, or the segments' audio
         """
-        # Split text into segments (try to split at sentence boundaries)
-        segments = []
-        current_segment = ""
-        
-        sentences = text.replace("。", ".").replace("！", "!").replace("？", "?").split(".")
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
-            # If adding this sentence would exceed max_chars, save current segment
-            if len(current_segment) + len(sentence) > max_chars:
-                if current_segment:
-                    segments.append(current_segment)
-                current_segment = sentence
-            else:
-                current_segment += " " + sentence if current_segment else sentence
-                
-        # Add the last segment if it exists
-        if current_segment:
-            segments.append(current_segment)
+        segments = segment_text(text, lang_code, max_chars or self.backend.max_chars)
+        if not segments:
+            return []
             
         # Convert each segment to speech
-        audio_paths = []
-        for i, segment in enumerate(segments):
-            output_path = OUTPUT_DIR / generate_filename(
-                prefix=f"tts_{lang_code}_part{i+1}",
-                extension=".mp3"
-            )
-            audio_path = self.synthesize_speech(
-                text=segment,
-                lang_code=lang_code,
-                output_path=output_path,
-                **kwargs
+        to_files = kwargs.get("return_type", "path") == "path"
+        extension = f".{kwargs.get('output_format', 'mp3')}"
+        requests = [
+            (
+                segment,
+                _output_file(f"tts_{lang_code}_part{i+1}", extension) if to_files else None
             )
-            audio_paths.append(audio_path)
+            for i, segment in enumerate(segments)
+        ]
+
+        workers = max(1, min(max_workers or self.max_workers, len(requests)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            audio_parts = list(executor.map(
+                lambda request: self._synthesize_with_retry(
+                    text=request[0],
+                    lang_code=lang_code,
+                    output_path=request[1],
+                    **kwargs
+                ),
+                requests
+            ))
+
+        # Segment files are named here, so they are ours to clean up
+        if to_files:
+            for path in audio_parts:
+                self._track(path)
             
-        return audio_paths
+        return audio_parts
+
+    def _synthesize_with_retry(self, **kwargs) -> Union[str, bytes, BinaryIO]:
+        """Call synthesize_speech, retrying failures with exponential backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.synthesize_speech(**kwargs)
+            except (ValueError, ProviderError):
+                # Invalid arguments will not succeed on a retry, and the
+                # provider client has already retried what was worth it
+                raise
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_backoff * (2 ** attempt))
     
     def combine_audio_files(
         self,
-        audio_paths: list[str],
-        output_path: Optional[str] = None,
-        output_format: str = "mp3"
-    ) -> str:
+        audio_paths: list[AudioSource],
+        output_path: Optional[Union[str, Path, BinaryIO]] = None,
+        output_format: str = "mp3",
+        return_type: str = "path"
+    ) -> Union[str, bytes, BinaryIO]:
         """
         Combine multiple audio files into one.
+
+        MP3 inputs that share the same stream parameters are joined into an
+        MP3 output byte for byte, without decoding. Anything else is decoded
+        one file at a time and streamed into a single ffmpeg encoder, so
+        memory use stays proportional to one segment.
         
         Args:
-            audio_paths: List of paths to audio files
-            output_path: Optional path for combined audio file
+            audio_paths: Audio to combine, as file paths, bytes or readable streams
+            output_path: Optional path for combined audio file, or a writable
+                binary file object
             output_format: Output audio format
+            return_type: "path", "bytes" or "stream" (a BytesIO)
             
         Returns:
-            str: Path to the combined audio file
+            Path to the combined audio file, the audio as bytes or a
+            stream, or ``output_path`` itself when it is a file object
         """
         if not audio_paths:
             raise ValueError("No audio files provided")
+        _check_return_type(return_type)
+        sources = [
+            source.read() if hasattr(source, "read") else source
+            for source in audio_paths
+        ]
+        in_memory = _is_sink(output_path) or return_type != "path"
             
         # Generate output path if not provided
-        if output_path is None:
-            output_path = OUTPUT_DIR / generate_filename(
-                prefix="tts_combined",
-                extension=f".{output_format}"
-            )
-        else:
+        generated_path = output_path is None and not in_memory
+        if generated_path:
+            output_path = _output_file("tts_combined", f".{output_format}")
+        elif not in_memory:
             output_path = Path(output_path)
-            
-        # Combine audio segments
-        combined = AudioSegment.empty()
-        for path in audio_paths:
-            segment = AudioSegment.from_file(path)
-            combined += segment
-            
-        # Export combined audio
-        combined.export(output_path, format=output_format)
+
+        with stage("tts_combine", segments=len(sources), format=output_format) as fields:
+            spans = None
+            if output_format.lower() == "mp3":
+                spans = [_mp3_audio_span(source) for source in sources]
+                if not all(spans) or len({span[2] for span in spans}) != 1:
+                    spans = None
+
+            if spans is not None:
+                fields["mode"] = "mp3_join"
+                if in_memory:
+                    buffer = io.BytesIO()
+                    _join_mp3(sources, spans, buffer)
+                    data = buffer.getvalue()
+                else:
+                    with open(output_path, "wb") as out:
+                        _join_mp3(sources, spans, out)
+            else:
+                fields["mode"] = "encode"
+                data = _encode_stream(
+                    sources,
+                    None if in_memory else output_path,
+                    output_format
+                )
+            fields["bytes"] = len(data) if in_memory else output_path.stat().st_size
+
+        if in_memory:
+            return _deliver(data, output_path, return_type)
+
+        if generated_path:
+            return self._track(output_path)
         
         return str(output_path)
 
-# Create a default instance
-default_tts = TextToSpeech() 
\ No newline at end of file
+def _output_file(prefix: str, extension: str) -> Path:
+    """Name a new file in OUTPUT_DIR, creating the directory on first write."""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    return OUTPUT_DIR / generate_filename(prefix=prefix, extension=extension)
+
+def _check_return_type(return_type: str) -> None:
+    """Reject unknown return types before any work is done."""
+    if return_type not in RETURN_TYPES:
+        raise ValueError(
+            f"Unsupported return type: {return_type} (choose from {', '.join(RETURN_TYPES)})"
+        )
+
+def _is_sink(output) -> bool:
+    """Whether an output argument is a writable file object rather than a path."""
+    return hasattr(output, "write")
+
+def _deliver(data: bytes, sink: Optional[BinaryIO], return_type: str) -> Union[bytes, BinaryIO]:
+    """Hand in-memory audio to the caller's sink or back in the requested form."""
+    if _is_sink(sink):
+        sink.write(data)
+        return sink
+    if return_type == "stream":
+        return io.BytesIO(data)
+    return data
+
+def _open_audio(source: Union[str, Path, bytes]) -> BinaryIO:
+    """Open a file path or in-memory audio for reading."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+def _wav_bytes(audio: SpeechAudio) -> bytes:
+    """Wrap PCM samples in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(audio.channels)
+        wav.setsampwidth(audio.sample_width)
+        wav.setframerate(audio.sample_rate)
+        wav.writeframes(audio.data)
+    return buffer.getvalue()
+
+def _rewrap_wav(data: bytes) -> bytes:
+    """Rewrite a WAV written to a pipe, whose header has placeholder lengths."""
+    with wave.open(io.BytesIO(data)) as wav:
+        return _wav_bytes(SpeechAudio(
+            wav.readframes(wav.getnframes()),
+            "pcm",
+            sample_rate=wav.getframerate(),
+            channels=wav.getnchannels(),
+            sample_width=wav.getsampwidth()
+        ))
+
+def _encode_audio(audio: SpeechAudio, output_format: str) -> bytes:
+    """Encode engine audio to the requested format in memory, at most once."""
+    output_format = output_format.lower()
+    if audio.format == output_format:
+        return audio.data
+    if audio.format == "pcm" and output_format == "wav":
+        return _wav_bytes(audio)
+
+    from pydub import AudioSegment
+
+    if audio.format == "pcm":
+        input_args = [
+            "-f", f"s{audio.sample_width * 8}le",
+            "-ar", str(audio.sample_rate),
+            "-ac", str(audio.channels)
+        ]
+    else:
+        input_args = ["-f", audio.format]
+    cmd = [
+        AudioSegment.converter, "-nostdin", "-loglevel", "error",
+        *input_args, "-i", "pipe:0",
+        "-f", output_format, "pipe:1"
+    ]
+    result = subprocess.run(cmd, input=audio.data, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to encode speech: {result.stderr.decode(errors='ignore')}")
+    if output_format == "wav":
+        return _rewrap_wav(result.stdout)
+    return result.stdout
+
+# Layer III bitrates in kbit/s by bitrate index
+_MP3_BITRATES_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MP3_BITRATES_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# MPEG-1 sample rates by index; MPEG-2 halves them and MPEG-2.5 quarters them
+_MP3_SAMPLE_RATES = (44100, 48000, 32000)
+
+def _info_frame_length(head: bytes, offset: int) -> int:
+    """
+    Length of the frame at ``offset`` if it is a Xing/Info or VBRI header frame, else 0.
+
+    Encoders such as LAME put such a frame first. It carries no audio but
+    describes the frame count and gapless padding of its own file, so it
+    must not end up in the middle of, or at the start of, a joined stream.
+    """
+    b1, b2, b3 = head[offset + 1], head[offset + 2], head[offset + 3]
+    version = (b1 >> 3) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    if (b1 >> 1) & 0x03 != 1 or bitrate_index == 0:
+        # Not Layer III, or free format with no computable frame length
+        return 0
+    mpeg1 = version == 3
+    mono = (b3 >> 6) & 0x03 == 0x03
+    # The Xing/Info tag follows the side information, VBRI sits at a fixed offset
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    crc = 0 if b1 & 0x01 else 2
+    xing = offset + 4 + crc + side_info
+    vbri = offset + 4 + 32
+    if head[xing:xing + 4] not in (b"Xing", b"Info") and head[vbri:vbri + 4] != b"VBRI":
+        return 0
+
+    sample_rate = _MP3_SAMPLE_RATES[(b2 >> 2) & 0x03] >> {3: 0, 2: 1, 0: 2}[version]
+    bitrate = (_MP3_BITRATES_MPEG1 if mpeg1 else _MP3_BITRATES_MPEG2)[bitrate_index] * 1000
+    padding = (b2 >> 1) & 0x01
+    return (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+
+def _mp3_audio_span(source: Union[str, Path, bytes]) -> Optional[tuple[int, int, tuple]]:
+    """
+    Locate the MPEG audio frames of an MP3 file or MP3 bytes.
+
+    Returns:
+        (start, end, params) byte offsets of the audio data with ID3 tags
+        and any leading Xing/Info/VBRI header frame excluded, and the
+        (version, layer, sample rate, mono) parameters of the first frame;
+        or None if the file is not a recognizable MP3
+    """
+    with _open_audio(source) as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(0)
+        start = 0
+        header = f.read(10)
+        if header[:3] == b"ID3" and len(header) == 10:
+            tag_size = (
+                (header[6] & 0x7F) << 21 | (header[7] & 0x7F) << 14
+                | (header[8] & 0x7F) << 7 | (header[9] & 0x7F)
+            )
+            start = 10 + tag_size + (10 if header[5] & 0x10 else 0)
+
+        end = size
+        if size >= 128:
+            f.seek(size - 128)
+            if f.read(3) == b"TAG":
+                end = size - 128
+
+        # Find the first frame sync within the first few kilobytes
+        f.seek(start)
+        head = f.read(4096)
+
+    for i in range(len(head) - 3):
+        b1, b2, b3 = head[i + 1], head[i + 2], head[i + 3]
+        if head[i] != 0xFF or b1 & 0xE0 != 0xE0:
+            continue
+        version = (b1 >> 3) & 0x03
+        layer = (b1 >> 1) & 0x03
+        bitrate = (b2 >> 4) & 0x0F
+        sample_rate = (b2 >> 2) & 0x03
+        if version == 1 or layer == 0 or bitrate == 0x0F or sample_rate == 0x03:
+            continue
+        mono = (b3 >> 6) & 0x03 == 0x03
+        return start + i + _info_frame_length(head, i), end, (version, layer, sample_rate, mono)
+    return None
+
+def _join_mp3(sources: list[Union[str, Path, bytes]], spans: list[tuple], out: BinaryIO) -> None:
+    """Concatenate the audio frames of same-codec MP3s without decoding."""
+    for source, (start, end, _) in zip(sources, spans):
+        with _open_audio(source) as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1 << 16))
+                if not chunk:
+                    break
+                out.write(chunk)
+                remaining -= len(chunk)
+
+def _encode_stream(
+    sources: list[Union[str, Path, bytes]],
+    output_path: Optional[Path],
+    output_format: str
+) -> Optional[bytes]:
+    """
+    Decode inputs one at a time and pipe their PCM into a single encoder.
+
+    Returns:
+        The encoded audio if ``output_path`` is None, otherwise None
+    """
+    from pydub import AudioSegment
+
+    with _open_audio(sources[0]) as f:
+        first = AudioSegment.from_file(f).set_sample_width(2)
+    frame_rate, channels = first.frame_rate, first.channels
+
+    cmd = [
+        AudioSegment.converter, "-y", "-nostdin",
+        "-f", "s16le", "-ar", str(frame_rate), "-ac", str(channels),
+        "-i", "pipe:0",
+        "-f", output_format,
+        "pipe:1" if output_path is None else str(output_path)
+    ]
+    output = []
+    with tempfile.TemporaryFile() as stderr:
+        encoder = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL if output_path is not None else subprocess.PIPE,
+            stderr=stderr
+        )
+        drain = None
+        if output_path is None:
+            # Read the encoder's output while feeding it, or both sides block
+            drain = threading.Thread(target=lambda: output.append(encoder.stdout.read()))
+            drain.start()
+        try:
+            encoder.stdin.write(first.raw_data)
+            del first
+            for source in sources[1:]:
+                with _open_audio(source) as f:
+                    segment = (
+                        AudioSegment.from_file(f)
+                        .set_sample_width(2)
+                        .set_frame_rate(frame_rate)
+                        .set_channels(channels)
+                    )
+                encoder.stdin.write(segment.raw_data)
+            encoder.stdin.close()
+        except BrokenPipeError:
+            # The encoder exited early; its stderr explains why
+            pass
+        except BaseException:
+            encoder.kill()
+            encoder.wait()
+            raise
+        returncode = encoder.wait()
+        if drain is not None:
+            drain.join()
+
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(
+                f"Failed to encode combined audio: {stderr.read().decode(errors='ignore')}"
+            )
+
+    if output_path is not None:
+        return None
+    data = b"".join(output)
+    return _rewrap_wav(data) if output_format.lower() == "wav" else data
+
+# Create a default instance with the configured engine; cached audio
+# lives alongside other output files
+default_tts = TextToSpeech(
+    backend=create_backend(),
+    fallback=create_backend(TTS_FALLBACK_BACKEND) if TTS_FALLBACK_BACKEND else None,
+    audio_cache=FileCache(
+        OUTPUT_DIR,
+        TTS_CACHE_MAX_BYTES,
+        prefix="tts_cache_",
+        name="tts_audio"
+    ),
+    artifacts=default_artifacts
+) 
\ No newline at end of file
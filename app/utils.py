@@ -1,16 +1,41 @@
 """Utility functions for the Voice Translation App."""
 
-import os
+import hashlib
+import subprocess
+import tempfile
+import time
 from pathlib import Path
 from typing import Union
 import uuid
-from pydub import AudioSegment
-from .config import SUPPORTED_AUDIO_FORMATS, INPUT_DIR, OUTPUT_DIR
+import numpy as np
+from .config import SUPPORTED_AUDIO_FORMATS, INPUT_DIR
+
+# Whisper models expect 16 kHz mono input
+SAMPLE_RATE = 16000
 
 def generate_filename(prefix: str = "", extension: str = ".wav") -> str:
     """Generate a unique filename with the given prefix and extension."""
     return f"{prefix}_{uuid.uuid4().hex[:8]}{extension}"
 
+def content_hash(data: Union[str, Path, bytes]) -> str:
+    """
+    Return the SHA-256 hex digest of raw bytes or of a file's contents.
+
+    Args:
+        data: Raw bytes, or a path to a file to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(data, (bytes, bytearray)):
+        digest.update(data)
+    else:
+        with open(data, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
 def convert_audio_to_wav(
     input_path: Union[str, Path], 
     output_path: Union[str, Path, None] = None
@@ -39,7 +64,10 @@ def convert_audio_to_wav(
     else:
         output_path = Path(output_path)
         
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
     # Load audio using pydub
+    from pydub import AudioSegment
     audio = AudioSegment.from_file(input_path)
     
     # Export as WAV
@@ -47,6 +75,123 @@ def convert_audio_to_wav(
     
     return str(output_path)
 
+def decode_audio(
+    audio: Union[str, Path, bytes],
+    sample_rate: int = SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Decode audio into mono float32 samples in a single ffmpeg pass.
+
+    Raw bytes are piped straight into ffmpeg, so nothing is written to disk.
+    Containers that cannot be read from a pipe (e.g. M4A files with the
+    index at the end) fall back to a temporary file.
+
+    Args:
+        audio: Path to an audio file, or the raw encoded audio bytes
+        sample_rate: Sample rate to resample to
+
+    Returns:
+        np.ndarray: Samples in the range [-1, 1]
+    """
+    if isinstance(audio, (bytes, bytearray)):
+        try:
+            return _ffmpeg_decode("pipe:0", sample_rate, data=bytes(audio))
+        except RuntimeError:
+            with tempfile.NamedTemporaryFile() as tmp_file:
+                tmp_file.write(audio)
+                tmp_file.flush()
+                return _ffmpeg_decode(tmp_file.name, sample_rate)
+
+    input_path = Path(audio)
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    if input_path.suffix.lower() not in SUPPORTED_AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {input_path.suffix}")
+
+    return _ffmpeg_decode(str(input_path), sample_rate)
+
+def _ffmpeg_decode(
+    source: str,
+    sample_rate: int,
+    data: Union[bytes, None] = None
+) -> np.ndarray:
+    """Run ffmpeg on a path or pipe and return float32 mono samples."""
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate),
+        "-"
+    ]
+    try:
+        result = subprocess.run(cmd, input=data, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"Failed to decode audio: {e.stderr.decode(errors='ignore')}"
+        ) from e
+
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+def split_on_silence(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    max_window: float = 30.0,
+    min_window: float = 10.0,
+    overlap: float = 0.0,
+    frame_ms: int = 30
+) -> list[tuple[int, int]]:
+    """
+    Split audio into windows that end at the quietest point available.
+
+    Frame energy (RMS) acts as a simple voice activity detector: each window
+    is cut at the lowest-energy frame between ``min_window`` and
+    ``max_window`` seconds after its start, so cuts land in pauses between
+    words whenever there are any.
+
+    Args:
+        audio: Mono samples
+        sample_rate: Sample rate of ``audio``
+        max_window: Maximum window length in seconds
+        min_window: Minimum window length in seconds (except for the last one)
+        overlap: Seconds each window repeats from the end of the previous one
+        frame_ms: Length of the energy analysis frames in milliseconds
+
+    Returns:
+        list[tuple[int, int]]: (start, end) sample offsets of each window
+    """
+    if overlap >= min_window:
+        raise ValueError("overlap must be shorter than min_window")
+
+    total = len(audio)
+    max_len = int(max_window * sample_rate)
+    if total <= max_len:
+        return [(0, total)]
+
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = total // frame
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames ** 2, axis=1))
+
+    windows = []
+    start = 0
+    overlap_len = int(overlap * sample_rate)
+    while total - start > max_len:
+        lo = (start + int(min_window * sample_rate)) // frame
+        hi = min((start + max_len) // frame, n_frames)
+        if hi <= lo:
+            cut = start + max_len
+        else:
+            # Quietest frame, preferring the latest one on ties
+            candidates = energy[lo:hi]
+            quietest = lo + len(candidates) - 1 - int(np.argmin(candidates[::-1]))
+            cut = quietest * frame + frame // 2
+        windows.append((start, cut))
+        start = cut - overlap_len
+    windows.append((start, total))
+    return windows
+
 def save_audio_file(
     audio_data: bytes,
     filename: Union[str, None] = None,
@@ -67,6 +212,7 @@ def save_audio_file(
         filename = generate_filename(extension=".wav")
         
     filepath = Path(directory) / filename
+    filepath.parent.mkdir(parents=True, exist_ok=True)
     
     with open(filepath, "wb") as f:
         f.write(audio_data)
@@ -80,6 +226,9 @@ def cleanup_old_files(
 ) -> None:
     """
     Remove old files from the specified directory.
+
+    This scans the whole directory; code that creates files should prefer
+    registering them with ``artifacts.default_artifacts`` instead.
     
     Args:
         directory: Directory to clean up
@@ -90,15 +239,21 @@ def cleanup_old_files(
     if not directory.exists():
         return
         
-    # Get list of files sorted by modification time
-    files = sorted(
-        directory.glob("*"),
-        key=lambda x: x.stat().st_mtime,
-        reverse=True
-    )
+    # Get list of files with their modification times, newest first
+    files = []
+    for path in directory.glob("*"):
+        try:
+            if path.is_file():
+                files.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    files.sort(key=lambda item: item[0], reverse=True)
     
-    # Keep only max_files most recent files
-    for file in files[max_files:]:
+    # Keep only the max_files most recent files that are not too old
+    cutoff = time.time() - max_age_hours * 3600
+    for index, (mtime, file) in enumerate(files):
+        if index < max_files and mtime >= cutoff:
+            continue
         try:
             file.unlink()
         except OSError:
@@ -0,0 +1,8 @@
+"""Offline benchmark suite for the Voice Translation App.
+
+Run every stage against synthetic audio fixtures and local stand-ins for
+Google Translate and gTTS, then compare the stored results between commits:
+
+    python -m benchmarks run
+    python -m benchmarks compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
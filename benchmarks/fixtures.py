@@ -0,0 +1,226 @@
+"""Deterministic audio and text fixtures for the benchmarks.
+
+Fixtures are generated rather than checked in. The default "tones" kind
+is voice-like tone bursts from a seeded generator, which come out the same
+on every machine, so stored results stay comparable. The opt-in "speech"
+kind is real speech read from a fixed script by espeak-ng (which also gives
+the transcription benchmarks a reference text to score against); it
+depends on the installed espeak-ng voice. Generated files are kept in
+``benchmarks/fixtures`` and reused by later runs, and results record the
+kind and content hashes of the fixtures they were measured on.
+"""
+
+import hashlib
+import json
+import shutil
+import subprocess
+import tempfile
+import wave
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+# Bump when the generated audio changes, so stale fixtures are rebuilt
+FIXTURE_VERSION = 2
+
+# "tones" are host-independent; "speech" needs espeak-ng
+FIXTURE_KINDS = ("tones", "speech")
+
+# Lengths of the audio fixtures in seconds
+FIXTURE_SECONDS = (5, 30, 120)
+
+SAMPLE_RATE = 16000
+
+# Script read by espeak-ng and used as translation and TTS input
+SCRIPT = [
+    "Hi, it's me again.",
+    "I just wanted to let you know that the train is running about twenty minutes late.",
+    "Could you pick up some bread and milk on your way home?",
+    "The meeting with the landlord has been moved to Thursday morning.",
+    "Don't forget that your sister's birthday is this weekend.",
+    "I booked a table for four at the Italian place near the station.",
+    "The weather forecast says it will rain all afternoon, so take an umbrella.",
+    "Call me back when you get this message.",
+    "We still need to decide who is driving to the airport on Sunday.",
+    "The package arrived this morning, but the box was slightly damaged.",
+    "Let me know if you need anything else before I leave the office.",
+    "See you tonight, and drive safely.",
+]
+
+# Translation and TTS inputs of increasing length
+TEXTS = {
+    "short": SCRIPT[1],
+    "medium": " ".join(SCRIPT[:6]),
+    "long": " ".join(SCRIPT * 3),
+}
+
+def voice_like(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Generate speech-shaped audio: harmonic syllables separated by pauses.
+
+    Args:
+        seconds: Length of the audio
+        seed: Random seed; the same seed always gives the same samples
+
+    Returns:
+        np.ndarray: float32 mono samples at 16 kHz
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    position = int(0.2 * SAMPLE_RATE)
+    while position < total:
+        # A "sentence" of a few words, then a longer pause
+        for _ in range(rng.integers(4, 12)):
+            for _ in range(rng.integers(1, 4)):
+                length = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+                end = min(position + length, total)
+                t = np.arange(end - position) / SAMPLE_RATE
+                pitch = rng.uniform(100, 220)
+                tone = sum(
+                    np.sin(2 * np.pi * pitch * harmonic * t) / harmonic
+                    for harmonic in range(1, 5)
+                )
+                envelope = np.sin(np.pi * np.arange(end - position) / max(1, length))
+                audio[position:end] = 0.3 * tone * envelope
+                position = end
+            position += int(rng.uniform(0.05, 0.15) * SAMPLE_RATE)
+            if position >= total:
+                break
+        position += int(rng.uniform(0.4, 0.9) * SAMPLE_RATE)
+    audio += rng.normal(0, 0.003, total).astype(np.float32)
+    return np.clip(audio, -1, 1).astype(np.float32)
+
+def _espeak(text: str, path: Path) -> np.ndarray:
+    """Speak text with espeak-ng and return 16 kHz samples."""
+    subprocess.run(["espeak-ng", "-v", "en", "-s", "160", "-w", str(path), text], check=True)
+    result = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-i", str(path),
+            "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"
+        ],
+        capture_output=True,
+        check=True
+    )
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+def spoken_script(seconds: float) -> tuple[np.ndarray, str]:
+    """
+    Read the script with espeak-ng until the audio is ``seconds`` long.
+
+    Whole sentences only are used, and the rest is padded with silence.
+
+    Returns:
+        tuple: (float32 samples at 16 kHz, reference text)
+    """
+    total = int(seconds * SAMPLE_RATE)
+    pause = np.zeros(int(0.4 * SAMPLE_RATE), dtype=np.float32)
+    parts, spoken, length = [], [], 0
+    with tempfile.TemporaryDirectory() as tmp:
+        index = 0
+        while True:
+            sentence = SCRIPT[index % len(SCRIPT)]
+            samples = _espeak(sentence, Path(tmp) / "sentence.wav")
+            if length + len(samples) + len(pause) > total:
+                break
+            parts.extend([samples, pause])
+            spoken.append(sentence)
+            length += len(samples) + len(pause)
+            index += 1
+    parts.append(np.zeros(total - length, dtype=np.float32))
+    return np.concatenate(parts), " ".join(spoken)
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> None:
+    """Write float samples as a 16-bit mono WAV file."""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+def encode_mp3(wav_path: Path, mp3_path: Path) -> None:
+    """Encode a WAV file as a 64 kbit/s MP3."""
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-i", str(wav_path),
+            "-codec:a", "libmp3lame", "-b:a", "64k", "-map_metadata", "-1",
+            str(mp3_path)
+        ],
+        check=True
+    )
+
+def _sha256(path: Path) -> str:
+    """Hex digest of a file's content."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def build_fixtures(directory: Optional[Path] = None, kind: str = "tones") -> dict:
+    """
+    Create the audio fixtures if they are missing or out of date.
+
+    Args:
+        directory: Where to keep the fixtures (defaults to benchmarks/fixtures)
+        kind: "tones" (seeded synthetic audio) or "speech" (espeak-ng)
+
+    Returns:
+        dict: Fixture name -> {"seconds", "wav", "mp3", "reference", "sha256"},
+        where reference is the spoken text for speech fixtures and None
+        otherwise, and sha256 holds the digests of the wav and mp3 files
+    """
+    if kind not in FIXTURE_KINDS:
+        raise ValueError(f"Unknown fixture kind: {kind}")
+    if kind == "speech" and not shutil.which("espeak-ng"):
+        raise RuntimeError("Speech fixtures need espeak-ng (apt install espeak-ng)")
+    directory = Path(directory or FIXTURE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / f"manifest_{kind}.json"
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        files_present = all(
+            Path(entry[fmt]).exists()
+            for entry in manifest["fixtures"].values()
+            for fmt in ("wav", "mp3")
+        )
+        if manifest["version"] == FIXTURE_VERSION and files_present:
+            return manifest["fixtures"]
+
+    fixtures = {}
+    for seconds in FIXTURE_SECONDS:
+        name = f"{kind}_{seconds}s"
+        if kind == "speech":
+            samples, reference = spoken_script(seconds)
+        else:
+            samples, reference = voice_like(seconds, seed=seconds), None
+        wav_path = directory / f"{name}.wav"
+        mp3_path = directory / f"{name}.mp3"
+        write_wav(wav_path, samples)
+        encode_mp3(wav_path, mp3_path)
+        fixtures[name] = {
+            "seconds": seconds,
+            "wav": str(wav_path),
+            "mp3": str(mp3_path),
+            "reference": reference,
+            "sha256": {"wav": _sha256(wav_path), "mp3": _sha256(mp3_path)},
+        }
+
+    manifest_path.write_text(json.dumps(
+        {"version": FIXTURE_VERSION, "kind": kind, "fixtures": fixtures},
+        indent=2
+    ))
+    return fixtures
+
+def fixture_source(fixtures: dict, kind: str) -> dict:
+    """
+    Describe the fixtures a set of results was measured on.
+
+    The WAV digests identify the generated samples; the MP3 digests also
+    change with the local ffmpeg/LAME build that encoded them.
+    """
+    return {
+        "kind": kind,
+        "version": FIXTURE_VERSION,
+        "sha256": {name: fixture["sha256"] for name, fixture in fixtures.items()},
+    }
@@ -0,0 +1,79 @@
+"""Import-time regression check.
+
+Each module is imported in a fresh interpreter, timing only the import
+itself. The check fails when an import takes longer than the budget or
+pulls in a heavy dependency that should only load on first use.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from .timing import percentile
+
+# Modules that worker processes and tools import on startup
+MODULES = ("app", "app.config", "app.cli", "app.jobs", "app.pipeline", "app.aio")
+
+# Dependencies that must not be loaded just by importing the modules above
+HEAVY_MODULES = ("torch", "whisper", "streamlit", "deep_translator", "gtts", "pydub", "transformers")
+
+# Default budget for a single import, in seconds
+IMPORT_BUDGET = 0.5
+
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+seconds = time.perf_counter() - start
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+def import_once(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter and report the time and heavy modules loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def bench_imports(runs: int = 5) -> dict:
+    """Time each module's cold import ``runs`` times."""
+    results = {}
+    for module in MODULES:
+        probes = [import_once(module) for _ in range(runs)]
+        times = [probe["seconds"] for probe in probes]
+        results[f"import[{module}]"] = {
+            "iterations": runs,
+            "mean": sum(times) / runs,
+            "p50": percentile(times, 50),
+            "p90": percentile(times, 90),
+            "p99": percentile(times, 99),
+            "min": min(times),
+            "max": max(times),
+            "heavy_modules": probes[-1]["heavy"],
+        }
+    return results
+
+def check_imports(budget: float = IMPORT_BUDGET, runs: int = 5) -> list[str]:
+    """
+    Run the import benchmarks and print a pass/fail line per module.
+
+    Returns:
+        list[str]: Descriptions of the failures (empty if all passed)
+    """
+    failures = []
+    for name, stats in bench_imports(runs).items():
+        problems = []
+        if stats["p50"] > budget:
+            problems.append(f"median {stats['p50'] * 1000:.0f}ms over {budget * 1000:.0f}ms budget")
+        if stats["heavy_modules"]:
+            problems.append(f"loads {', '.join(stats['heavy_modules'])}")
+        status = "FAIL" if problems else "ok"
+        print(f"{status:<5} {name:<24} {stats['p50'] * 1000:8.1f}ms  {'; '.join(problems)}")
+        failures.extend(f"{name}: {problem}" for problem in problems)
+    return failures
@@ -0,0 +1,90 @@
+"""Speed/accuracy trade-off of Whisper inference precisions.
+
+Every audio fixture is transcribed at each precision. Accuracy is the word
+error rate against the fixture's reference text (speech fixtures) or, for
+tone fixtures, against the fp32 transcript, which measures how far the
+faster mode drifts from the baseline.
+"""
+
+import re
+from typing import Optional
+from .timing import measure
+
+def normalize_words(text: str) -> list[str]:
+    """Lowercase words without punctuation."""
+    return re.findall(r"[\w']+", text.lower())
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+def bench_precision(
+    fixtures: dict,
+    iterations: int,
+    model: str,
+    precisions: tuple = ("fp32", "int8"),
+    threads: int = 0
+) -> dict:
+    """
+    Time and score transcription of every fixture at each precision.
+
+    Returns:
+        dict: Benchmark name -> latency stats plus "wer" and "baseline"
+    """
+    from app.stt import SpeechToText
+
+    transcripts = {}
+    results = {}
+    for precision in precisions:
+        stt = SpeechToText(
+            model_name=model,
+            precision=precision,
+            parallel_workers=1,
+            threads=threads
+        )
+        for name, fixture in fixtures.items():
+            stats = measure(
+                lambda: stt.transcribe_audio(fixture["mp3"], language="en"),
+                iterations,
+                work=fixture["seconds"],
+                unit="audio_s"
+            )
+            transcript = stt.transcribe_audio(fixture["mp3"], language="en")
+            transcripts[name, precision] = transcript
+
+            reference: Optional[str] = fixture.get("reference")
+            baseline = "reference"
+            if reference is None:
+                reference = transcripts.get((name, precisions[0]), transcript)
+                baseline = precisions[0]
+            stats.update(
+                precision=precision,
+                threads=threads,
+                wer=word_error_rate(reference, transcript),
+                baseline=baseline
+            )
+            results[f"transcribe_audio[{name},{precision}]"] = stats
+    return results
+
+def print_report(results: dict) -> None:
+    """Print median latency, real-time factor and WER side by side."""
+    print(f"{'benchmark':<44} {'p50':>9} {'audio s/s':>10} {'WER':>7}  baseline")
+    for name, stats in results.items():
+        print(
+            f"{name:<44} {stats['p50'] * 1000:>7.0f}ms {stats['audio_s_per_s']:>10.1f}"
+            f" {stats['wer']:>7.1%}  {stats['baseline']}"
+        )
@@ -0,0 +1,129 @@
+"""Behavior of the provider client layer against misbehaving stubs.
+
+Three scenarios, each run with three clients: the unprotected baseline
+(deep-translator's own client, which opens a connection per request and
+never retries), the app's ``ProviderClient`` with its circuit breaker
+disabled, and the full ``ProviderClient``:
+
+- ``healthy``: every request succeeds; shows connection reuse.
+- ``throttled``: a share of requests get HTTP 429; shows retries turning
+  throttling into latency instead of failures.
+- ``outage``: every request fails with HTTP 503; shows the circuit
+  breaker failing fast instead of every caller waiting out its retries.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .fixtures import SCRIPT
+from .stubs import TranslateStub
+from .timing import percentile
+
+# Scenario name -> stub error settings
+SCENARIOS = {
+    "healthy": {"error_rate": 0.0},
+    "throttled": {"error_rate": 0.3, "error_status": 429},
+    "outage": {"error_rate": 1.0, "error_status": 503},
+}
+
+def _baseline_factory(base_url: str):
+    """deep-translator's GoogleTranslator pointed at the stub."""
+    try:
+        from deep_translator import GoogleTranslator
+    except ImportError as e:
+        raise ImportError(
+            "The providers benchmark requires: pip install -r benchmarks/requirements.txt"
+        ) from e
+
+    def factory(source_lang: str, target_lang: str):
+        client = GoogleTranslator(source=source_lang, target=target_lang)
+        client._base_url = base_url
+        return client
+
+    return factory
+
+def _pooled_factory(base_url: str, retry_backoff: float, breaker: bool = True):
+    """The app's client on a fresh provider, so breaker state is not shared between runs."""
+    from app.config import PROVIDER_FAILURE_THRESHOLD
+    from app.providers import ProviderClient
+    from app.translator import GoogleWebClient
+
+    provider = ProviderClient(
+        "bench_translate",
+        rate_limit=0,
+        retry_backoff=retry_backoff,
+        failure_threshold=PROVIDER_FAILURE_THRESHOLD if breaker else 0,
+        reset_timeout=60
+    )
+
+    def factory(source_lang: str, target_lang: str):
+        return GoogleWebClient(source_lang, target_lang, base_url=base_url, provider=provider)
+
+    return factory
+
+def _run(factory, requests: int, concurrency: int) -> dict:
+    """Translate ``requests`` sentences concurrently and time each call."""
+    client = factory("en", "es")
+
+    def call(text: str) -> tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            client.translate(text)
+            ok = True
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    texts = [SCRIPT[i % len(SCRIPT)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(call, texts))
+    wall = time.perf_counter() - start
+
+    latencies = [seconds for seconds, _ in outcomes]
+    return {
+        "iterations": requests,
+        "mean": sum(latencies) / requests,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "min": min(latencies),
+        "max": max(latencies),
+        "wall_s": wall,
+        "success_rate": sum(ok for _, ok in outcomes) / requests,
+    }
+
+def bench_providers(
+    requests: int = 100,
+    concurrency: int = 8,
+    latency: float = 0.02,
+    retry_backoff: float = 0.05
+) -> dict:
+    """
+    Run every scenario with each client.
+
+    Returns:
+        dict: Benchmark name -> latency stats plus success rate, stub
+        requests and TCP connections opened
+    """
+    results = {}
+    for scenario, settings in SCENARIOS.items():
+        for client in ("baseline", "no_breaker", "pooled"):
+            with TranslateStub(latency=latency, **settings) as stub:
+                if client == "baseline":
+                    factory = _baseline_factory(stub.url)
+                else:
+                    factory = _pooled_factory(stub.url, retry_backoff, breaker=client == "pooled")
+                stats = _run(factory, requests, concurrency)
+                stats.update(stub_requests=stub.requests, connections=stub.connections)
+            results[f"provider[{scenario},{client}]"] = stats
+    return results
+
+def print_report(results: dict) -> None:
+    """Print success rate, latency, stub load and connections side by side."""
+    print(f"{'benchmark':<32} {'ok':>6} {'p50':>9} {'p99':>9} {'wall':>8} {'requests':>9} {'conns':>6}")
+    for name, stats in results.items():
+        print(
+            f"{name:<32} {stats['success_rate']:>6.0%} {stats['p50'] * 1000:>7.0f}ms"
+            f" {stats['p99'] * 1000:>7.0f}ms {stats['wall_s']:>7.2f}s"
+            f" {stats['stub_requests']:>9} {stats['connections']:>6}"
+        )
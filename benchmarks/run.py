@@ -0,0 +1,401 @@
+"""Benchmark runner and result comparison.
+
+Usage:
+    python -m benchmarks run [--model tiny] [--latency 0.05] [--only stt,tts] [--fixtures tones]
+    python -m benchmarks compare BASE.json HEAD.json [--threshold 0.10]
+    python -m benchmarks imports [--budget 0.5]
+    python -m benchmarks precision [--model base] [--precisions fp32,int8] [--threads 4]
+    python -m benchmarks providers [--requests 100] [--concurrency 8]
+
+``run`` writes ``benchmarks/results/<commit>.json``. ``compare`` prints the
+change in median latency per benchmark and exits with status 1 if any
+benchmark got slower by more than the threshold. ``imports`` fails if
+importing the app's entry modules is slow or loads heavy dependencies.
+``precision`` reports Whisper speed against word error rate per precision.
+``providers`` runs the provider client against healthy, throttling and
+failing stubs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from .fixtures import FIXTURE_KINDS, TEXTS, build_fixtures, fixture_source
+from .imports import IMPORT_BUDGET, bench_imports, check_imports
+from .precision import bench_precision, print_report
+from .providers import bench_providers, print_report as print_providers_report
+from .timing import measure
+from .stubs import TTSStub, TranslateStub, gtts_backend, gtts_endpoint, translate_client_factory
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Benchmark groups, in the order they run
+STAGES = ("imports", "convert", "stt", "translate", "tts", "combine", "end_to_end")
+
+def bench_convert(fixtures: dict, iterations: int, tmp: Path) -> dict:
+    """MP3 -> WAV conversion with utils.convert_audio_to_wav."""
+    from app.utils import convert_audio_to_wav
+
+    results = {}
+    for name, fixture in fixtures.items():
+        output = tmp / f"{name}.converted.wav"
+        results[f"convert_audio_to_wav[{name}]"] = measure(
+            lambda: convert_audio_to_wav(fixture["mp3"], output),
+            iterations,
+            work=fixture["seconds"],
+            unit="audio_s"
+        )
+    return results
+
+def bench_stt(fixtures: dict, iterations: int, model: str, stt_kwargs: Optional[dict] = None) -> dict:
+    """Whisper transcription with SpeechToText.transcribe_audio, uncached."""
+    from app.stt import SpeechToText
+
+    stt = SpeechToText(model_name=model, parallel_workers=1, **(stt_kwargs or {}))
+    results = {}
+    for name, fixture in fixtures.items():
+        results[f"transcribe_audio[{name}]"] = measure(
+            lambda: stt.transcribe_audio(fixture["mp3"], language="en"),
+            iterations,
+            work=fixture["seconds"],
+            unit="audio_s"
+        )
+    return results
+
+def bench_translate(iterations: int, translate_url: str) -> dict:
+    """Translator.translate_text against the stub, with caching disabled."""
+    from app.translator import Translator
+
+    translator = Translator(cache_size=0, client_factory=translate_client_factory(translate_url))
+    results = {}
+    for name, text in TEXTS.items():
+        results[f"translate_text[{name}]"] = measure(
+            lambda: translator.translate_text(text, source_lang="en", target_lang="es"),
+            iterations,
+            work=len(text),
+            unit="chars"
+        )
+    return results
+
+def bench_tts(iterations: int, tmp: Path) -> dict:
+    """
+    TextToSpeech.synthesize_speech against the stub, uncached.
+
+    The local espeak engine is measured alongside gTTS when espeak-ng is
+    installed.
+    """
+    from app.tts import EspeakBackend, TextToSpeech
+
+    engines = {"gtts": TextToSpeech(backend=gtts_backend())}
+    if shutil.which("espeak-ng"):
+        engines["espeak"] = TextToSpeech(backend=EspeakBackend())
+    results = {}
+    for engine, tts in engines.items():
+        for name, text in TEXTS.items():
+            for output_format in ("mp3", "wav"):
+                output = tmp / f"tts_{engine}_{name}.{output_format}"
+                label = name if engine == "gtts" else f"{name},{engine}"
+                results[f"synthesize_speech[{label},{output_format}]"] = measure(
+                    lambda: tts.synthesize_speech(
+                        text,
+                        lang_code="en",
+                        output_path=output,
+                        output_format=output_format
+                    ),
+                    iterations,
+                    work=len(text),
+                    unit="chars"
+                )
+    return results
+
+def bench_combine(iterations: int, tmp: Path) -> dict:
+    """TextToSpeech.combine_audio_files on stub-synthesized segments."""
+    from app.tts import TextToSpeech
+
+    tts = TextToSpeech(backend=gtts_backend())
+    segments = [
+        tts.synthesize_speech(sentence, lang_code="en", output_path=tmp / f"segment_{i}.mp3")
+        for i, sentence in enumerate(TEXTS["long"].split(". "))
+    ]
+    results = {}
+    for output_format in ("mp3", "wav"):
+        output = tmp / f"combined.{output_format}"
+        results[f"combine_audio_files[{len(segments)}x,{output_format}]"] = measure(
+            lambda: tts.combine_audio_files(segments, output, output_format=output_format),
+            iterations,
+            work=len(segments),
+            unit="segments"
+        )
+    return results
+
+def bench_end_to_end(
+    fixtures: dict,
+    iterations: int,
+    model: str,
+    translate_url: str,
+    tmp: Path,
+    stt_kwargs: Optional[dict] = None
+) -> dict:
+    """Transcribe, translate and synthesize a voice message, as the app does."""
+    from app.stt import SpeechToText
+    from app.translator import Translator
+    from app.tts import TextToSpeech
+
+    stt = SpeechToText(model_name=model, parallel_workers=1, **(stt_kwargs or {}))
+    translator = Translator(cache_size=0, client_factory=translate_client_factory(translate_url))
+    tts = TextToSpeech(backend=gtts_backend())
+
+    def translate_message(audio_path: str) -> None:
+        transcript = stt.transcribe_audio(audio_path, language="en")
+        # Tone fixtures transcribe to little or nothing; fall back to the
+        # script so the network stages still get realistic input
+        text = transcript if len(transcript) > 20 else TEXTS["medium"]
+        translation = translator.translate_text(text, source_lang="en", target_lang="es")
+        tts.synthesize_speech(translation, lang_code="es", output_path=tmp / "reply.mp3")
+
+    results = {}
+    for name, fixture in fixtures.items():
+        results[f"end_to_end[{name}]"] = measure(
+            lambda: translate_message(fixture["mp3"]),
+            iterations,
+            work=fixture["seconds"],
+            unit="audio_s"
+        )
+    return results
+
+def git_commit() -> str:
+    """Short hash of HEAD, with a -dirty suffix for uncommitted changes."""
+    root = Path(__file__).parent.parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+def run(args: argparse.Namespace) -> dict:
+    """Run the selected benchmarks and return the results document."""
+    stages = args.only.split(",") if args.only else list(STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise SystemExit(f"Unknown benchmark groups: {', '.join(sorted(unknown))}")
+
+    fixtures = _fixtures(args.max_seconds, args.fixtures)
+    stt_kwargs = {"precision": args.precision, "threads": args.threads}
+
+    results = {}
+    with TranslateStub(args.latency, args.jitter) as translate_stub, \
+            TTSStub(args.latency, args.jitter) as tts_stub, \
+            gtts_endpoint(tts_stub.url), \
+            tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        translate_url = f"{translate_stub.url}/m"
+        for group in stages:
+            print(f"Running {group} benchmarks...", file=sys.stderr)
+            if group == "imports":
+                results.update(bench_imports())
+            elif group == "convert":
+                results.update(bench_convert(fixtures, args.iterations, tmp))
+            elif group == "stt":
+                results.update(bench_stt(fixtures, args.stt_iterations, args.model, stt_kwargs))
+            elif group == "translate":
+                results.update(bench_translate(args.iterations, translate_url))
+            elif group == "tts":
+                results.update(bench_tts(args.iterations, tmp))
+            elif group == "combine":
+                results.update(bench_combine(args.iterations, tmp))
+            elif group == "end_to_end":
+                results.update(bench_end_to_end(
+                    fixtures, args.stt_iterations, args.model, translate_url, tmp, stt_kwargs
+                ))
+
+    return _document(results, {
+        "model": args.model,
+        "precision": args.precision,
+        "threads": args.threads,
+        "iterations": args.iterations,
+        "stt_iterations": args.stt_iterations,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "fixtures": fixture_source(fixtures, args.fixtures),
+    })
+
+def _fixtures(max_seconds: Optional[float] = None, kind: str = "tones") -> dict:
+    """Build the audio fixtures, leaving out those longer than ``max_seconds``."""
+    fixtures = build_fixtures(kind=kind)
+    if max_seconds:
+        fixtures = {
+            name: fixture for name, fixture in fixtures.items()
+            if fixture["seconds"] <= max_seconds
+        }
+    return fixtures
+
+def _document(results: dict, settings: dict) -> dict:
+    """Wrap benchmark results with the commit, machine and settings they came from."""
+    return {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "settings": settings,
+        "results": results,
+    }
+
+def _save(document: dict, output: Optional[Path], suffix: str = "") -> None:
+    """Write a results document, by default to results/<commit><suffix>.json."""
+    output = output or RESULTS_DIR / f"{document['commit']}{suffix}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+def compare(base: dict, head: dict, threshold: float, metric: str = "p50") -> list[str]:
+    """
+    Print a per-benchmark comparison of two result documents.
+
+    Returns:
+        list[str]: Names of benchmarks that regressed by more than ``threshold``
+    """
+    regressions = []
+    base_fixtures = base["settings"].get("fixtures")
+    head_fixtures = head["settings"].get("fixtures")
+    if base_fixtures != head_fixtures:
+        print(
+            "warning: the results were measured on different audio fixtures; "
+            "audio benchmarks are not comparable",
+            file=sys.stderr
+        )
+    print(f"{'benchmark':<48} {'base':>10} {'head':>10} {'change':>8}")
+    for name in sorted(set(base["results"]) | set(head["results"])):
+        before = base["results"].get(name, {}).get(metric)
+        after = head["results"].get(name, {}).get(metric)
+        if before is None or after is None:
+            print(f"{name:<48} {_ms(before):>10} {_ms(after):>10} {'n/a':>8}")
+            continue
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {_ms(before):>10} {_ms(after):>10} {change:>+8.1%}{flag}")
+    return regressions
+
+def _ms(seconds: Optional[float]) -> str:
+    """Format seconds as milliseconds for the comparison table."""
+    return "-" if seconds is None else f"{seconds * 1000:.1f}ms"
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for ``python -m benchmarks``."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and store the results")
+    run_parser.add_argument("--model", default="tiny", help="Whisper model to benchmark")
+    run_parser.add_argument("--precision", default="fp32", help="Whisper inference precision")
+    run_parser.add_argument("--threads", type=int, default=0, help="Torch threads for Whisper (0 = default)")
+    run_parser.add_argument("--iterations", type=int, default=20, help="Timed calls per network/audio benchmark")
+    run_parser.add_argument("--stt-iterations", type=int, default=3, help="Timed calls per Whisper benchmark")
+    run_parser.add_argument("--latency", type=float, default=0.05, help="Stub server delay in seconds")
+    run_parser.add_argument("--jitter", type=float, default=0.0, help="Extra random stub delay in seconds")
+    run_parser.add_argument("--only", help=f"Comma-separated groups to run ({','.join(STAGES)})")
+    run_parser.add_argument("--max-seconds", type=float, help="Skip audio fixtures longer than this")
+    run_parser.add_argument(
+        "--fixtures",
+        default="tones",
+        choices=FIXTURE_KINDS,
+        help="Audio fixtures: seeded synthetic tones (default) or espeak-ng speech"
+    )
+    run_parser.add_argument("--output", type=Path, help="Results file (default: results/<commit>.json)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("head", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)")
+    compare_parser.add_argument("--metric", default="p50", choices=("mean", "p50", "p90", "p99"))
+
+    imports_parser = commands.add_parser("imports", help="Check import time and lazy loading")
+    imports_parser.add_argument("--budget", type=float, default=IMPORT_BUDGET, help="Maximum median import time in seconds")
+    imports_parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+
+    precision_parser = commands.add_parser("precision", help="Compare Whisper speed and accuracy per precision")
+    precision_parser.add_argument("--model", default="base", help="Whisper model to benchmark")
+    precision_parser.add_argument("--precisions", default="fp32,int8", help="Comma-separated precisions, baseline first")
+    precision_parser.add_argument("--threads", type=int, default=0, help="Torch threads for Whisper (0 = default)")
+    precision_parser.add_argument("--iterations", type=int, default=3, help="Timed calls per fixture and precision")
+    precision_parser.add_argument("--max-seconds", type=float, help="Skip audio fixtures longer than this")
+    precision_parser.add_argument(
+        "--fixtures",
+        default="tones",
+        choices=FIXTURE_KINDS,
+        help="Audio fixtures: seeded synthetic tones (default) or espeak-ng speech"
+    )
+    precision_parser.add_argument("--output", type=Path, help="Results file (default: results/<commit>-precision.json)")
+
+    providers_parser = commands.add_parser("providers", help="Check pooling, retries and circuit breaking against stubs")
+    providers_parser.add_argument("--requests", type=int, default=100, help="Requests per scenario and client")
+    providers_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent callers")
+    providers_parser.add_argument("--latency", type=float, default=0.02, help="Stub server delay in seconds")
+    providers_parser.add_argument("--output", type=Path, help="Results file (default: results/<commit>-providers.json)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "imports":
+        failures = check_imports(args.budget, args.runs)
+        return 1 if failures else 0
+
+    if args.command == "precision":
+        precisions = tuple(args.precisions.split(","))
+        fixtures = _fixtures(args.max_seconds, args.fixtures)
+        results = bench_precision(
+            fixtures,
+            args.iterations,
+            args.model,
+            precisions,
+            args.threads
+        )
+        print_report(results)
+        _save(_document(results, {
+            "model": args.model,
+            "precisions": precisions,
+            "threads": args.threads,
+            "iterations": args.iterations,
+            "fixtures": fixture_source(fixtures, args.fixtures),
+        }), args.output, "-precision")
+        return 0
+
+    if args.command == "providers":
+        results = bench_providers(args.requests, args.concurrency, args.latency)
+        print_providers_report(results)
+        _save(_document(results, {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+        }), args.output, "-providers")
+        return 0
+
+    if args.command == "compare":
+        base = json.loads(args.base.read_text())
+        head = json.loads(args.head.read_text())
+        regressions = compare(base, head, args.threshold, args.metric)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+            return 1
+        return 0
+
+    _save(run(args), args.output)
+    return 0
@@ -0,0 +1,263 @@
+"""Local stand-ins for the Google Translate and gTTS web endpoints.
+
+Both servers speak just enough of the real wire formats for the app's
+Google Translate client and gTTS (and deep-translator) to work against
+them, and add a
+configurable delay to each response so network latency is part of what is
+measured, without any real network access.
+"""
+
+import base64
+import html
+import json
+import os
+import random
+import socket
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Never send stub traffic through a proxy
+os.environ.setdefault("NO_PROXY", "127.0.0.1,localhost")
+
+class StubServer:
+    """Threaded HTTP/1.1 server on a free local port with simulated latency.
+
+    A share of requests can be answered with an error status instead, to
+    simulate a throttling or failing provider.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        seed: int = 0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        retry_after: Optional[float] = None
+    ):
+        """
+        Initialize the server. It starts listening on ``start()``.
+
+        Args:
+            latency: Seconds added to every response
+            jitter: Maximum extra random delay in seconds
+            seed: Seed for the jitter and errors, so runs are repeatable
+            error_rate: Share of requests answered with ``error_status``
+                (may be changed while the server runs)
+            error_status: HTTP status of the simulated errors
+            retry_after: ``Retry-After`` seconds sent with the errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """Start serving in a daemon thread."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open so client-side pooling is visible
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes; without this,
+                # Nagle's algorithm and delayed ACKs stall kept-alive connections
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                stub._handle(self, None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                stub._handle(self, self.rfile.read(length))
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever,
+            name=type(self).__name__,
+            daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, body: Optional[bytes]) -> None:
+        """Delay, then answer one request."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        time.sleep(delay)
+        if failed:
+            status, content_type, payload = self.error_status, "text/plain", b"stub error"
+        else:
+            status, content_type, payload = self.respond(handler.path, body)
+        handler.send_response(status)
+        if failed and self.retry_after is not None:
+            handler.send_header("Retry-After", str(self.retry_after))
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def respond(self, path: str, body: Optional[bytes]) -> tuple[int, str, bytes]:
+        """Build the (status, content type, body) of a response."""
+        raise NotImplementedError
+
+class TranslateStub(StubServer):
+    """Google Translate's mobile page, as scraped by deep-translator.
+
+    The "translation" of each line is the line prefixed with the target
+    language code, so packed multi-line requests split back correctly.
+    Requests to ``/translate_a/single`` get the JSON endpoint's answer,
+    reporting text with CJK characters as "zh-CN" and anything else as
+    ``detected_lang``.
+    """
+
+    def __init__(self, *args, detected_lang: str = "en", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.detected_lang = detected_lang
+
+    def respond(self, path: str, body: Optional[bytes]) -> tuple[int, str, bytes]:
+        url = urlparse(path)
+        params = parse_qs(url.query)
+        target = params.get("tl", ["?"])[0]
+        text = params.get("q", [""])[0]
+        if url.path.endswith("/translate_a/single"):
+            cjk = any("\u4e00" <= char <= "\u9fff" for char in text)
+            detected = "zh-CN" if cjk else self.detected_lang
+            answer = [[[f"[{target}] {text}", text, None, None]], None, detected]
+            return 200, "application/json; charset=utf-8", json.dumps(answer).encode("utf-8")
+        translated = "\n".join(f"[{target}] {line}" for line in text.split("\n"))
+        page = f'<html><body><div class="result-container">{html.escape(translated)}</div></body></html>'
+        return 200, "text/html; charset=utf-8", page.encode("utf-8")
+
+class TTSStub(StubServer):
+    """Google Translate's batchexecute speech endpoint, as called by gTTS.
+
+    Each request returns a real MP3 whose length follows the length of the
+    requested text, so downstream joining and encoding do realistic work.
+    """
+
+    # Roughly how fast gTTS speaks
+    CHARS_PER_SECOND = 14
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._clips = {}
+
+    def respond(self, path: str, body: Optional[bytes]) -> tuple[int, str, bytes]:
+        request = json.loads(parse_qs(body.decode("utf-8"))["f.req"][0])
+        text = json.loads(request[0][0][1])[0]
+        seconds = max(0.5, round(len(text) / self.CHARS_PER_SECOND * 2) / 2)
+        audio = base64.b64encode(self._clip(seconds)).decode("ascii")
+        line = '[["wrb.fr","jQ1olc","[\\"' + audio + '\\"]",null,null,null,"generic"]]'
+        return 200, "application/json; charset=utf-8", f")]}}'\n\n{len(line)}\n{line}\n".encode("utf-8")
+
+    def _clip(self, seconds: float) -> bytes:
+        """Return (and remember) an MP3 tone of the given length."""
+        with self._lock:
+            clip = self._clips.get(seconds)
+        if clip is None:
+            clip = subprocess.run(
+                [
+                    "ffmpeg", "-nostdin", "-loglevel", "error",
+                    "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=24000:duration={seconds}",
+                    "-ac", "1", "-codec:a", "libmp3lame", "-b:a", "32k", "-map_metadata", "-1",
+                    "-f", "mp3", "-"
+                ],
+                capture_output=True,
+                check=True
+            ).stdout
+            with self._lock:
+                self._clips[seconds] = clip
+        return clip
+
+def translate_client_factory(base_url: str, provider=None):
+    """
+    Build a Translator ``client_factory`` whose clients call ``base_url``.
+
+    Args:
+        base_url: Stub server URL
+        provider: ProviderClient to send requests through (defaults to an
+            unthrottled one shared by the factory's clients)
+    """
+    from app.providers import ProviderClient
+    from app.translator import GoogleWebClient
+
+    provider = provider or ProviderClient("stub_translate", rate_limit=0)
+
+    def factory(source_lang: str, target_lang: str):
+        return GoogleWebClient(
+            source_lang,
+            target_lang,
+            base_url=base_url,
+            provider=provider,
+            detect_url=f"{base_url}/translate_a/single"
+        )
+
+    return factory
+
+def gtts_backend(provider=None):
+    """
+    Build a GTTSBackend for use inside ``gtts_endpoint``.
+
+    Args:
+        provider: ProviderClient to send requests through (defaults to an
+            unthrottled one, so the benchmarks measure the stub, not the limiter)
+    """
+    from app.providers import ProviderClient
+    from app.tts import GTTSBackend
+
+    return GTTSBackend(provider or ProviderClient("stub_gtts", rate_limit=0))
+
+@contextmanager
+def gtts_endpoint(base_url: str) -> Iterator[None]:
+    """Send gTTS requests to ``base_url`` while the context is active."""
+    import gtts.tts
+
+    original = gtts.tts._translate_url
+    gtts.tts._translate_url = lambda tld="com", path="": f"{base_url}/{path}"
+    try:
+        yield
+    finally:
+        gtts.tts._translate_url = original
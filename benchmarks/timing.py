@@ -0,0 +1,55 @@
+"""Latency measurement helpers shared by the benchmarks."""
+
+import time
+from typing import Callable, Optional
+
+def percentile(values: list[float], q: float) -> float:
+    """Linearly interpolated percentile of a non-empty list (q in 0-100)."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def measure(
+    fn: Callable[[], object],
+    iterations: int,
+    warmup: int = 1,
+    work: Optional[float] = None,
+    unit: Optional[str] = None
+) -> dict:
+    """
+    Time repeated calls of ``fn``.
+
+    Args:
+        fn: Function to benchmark
+        iterations: Number of timed calls
+        warmup: Number of untimed calls made first
+        work: Amount of work per call (e.g. seconds of audio), for throughput
+        unit: Name of the work unit (e.g. "audio_s", "chars")
+
+    Returns:
+        dict: Latency percentiles in seconds, and throughput per second
+    """
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+
+    total = sum(latencies)
+    stats = {
+        "iterations": iterations,
+        "mean": total / iterations,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "min": min(latencies),
+        "max": max(latencies),
+        "calls_per_s": iterations / total if total else None,
+    }
+    if work is not None:
+        stats[f"{unit}_per_s"] = work * iterations / total if total else None
+    return stats
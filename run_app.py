@@ -1,13 +1,16 @@
 """Entry point for the Voice Translation App."""
+import json
+import math
 import os
 import sys
 from pathlib import Path
-import streamlit.web.bootstrap as bootstrap
-from flask import Flask, jsonify
-from dotenv import load_dotenv
+from flask import Flask, Response, jsonify, request, send_file, url_for
+from app.metrics import configure_logging
 
 app = Flask(__name__, static_folder='.', static_url_path='')
-load_dotenv()
+
+# Per-stage JSON logs, when METRICS_LOG_JSON is set (app.config loads .env)
+configure_logging()
 
 @app.route('/api/config')
 def get_config():
@@ -15,6 +18,118 @@ def get_config():
         'apiKey': os.getenv('OPENAI_API_KEY')
     })
 
+@app.route('/metrics')
+def metrics():
+    """Expose pipeline metrics in the Prometheus text format."""
+    from app.metrics import default_metrics
+    body = default_metrics.render_prometheus()
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+def get_job_queue():
+    """Return the shared job queue, importing the pipeline only when needed."""
+    from app.jobs import default_job_queue
+    return default_job_queue
+
+def job_response(job, status_code: int = 200):
+    """Serialize a job with links to its related endpoints."""
+    body = job.to_dict()
+    body["links"] = {
+        "self": url_for("get_translation", job_id=job.id),
+        "events": url_for("stream_translation", job_id=job.id),
+    }
+    if job.audio_path:
+        body["links"]["audio"] = url_for("get_translation_audio", job_id=job.id)
+    return jsonify(body), status_code
+
+@app.route('/translate', methods=['POST'])
+def create_translation():
+    """
+    Queue a voice message for translation.
+
+    Accepts the audio either as a multipart "audio" file or as the raw
+    request body, with "source" and "target" language codes as form or
+    query parameters ("source" may be "auto" to detect it). Responds with 202 and the job, or 503 when the queue
+    is full.
+    """
+    from app.jobs import QueueFullError
+
+    if "audio" in request.files:
+        audio = request.files["audio"].read()
+    else:
+        audio = request.get_data()
+    if not audio:
+        return jsonify({"error": "No audio provided"}), 400
+
+    source_lang = request.values.get("source")
+    target_lang = request.values.get("target")
+    if not source_lang or not target_lang:
+        return jsonify({"error": "Both 'source' and 'target' are required"}), 400
+
+    try:
+        job = get_job_queue().submit(audio, source_lang, target_lang)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except QueueFullError as e:
+        response = jsonify({"error": str(e)})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+
+    response, status_code = job_response(job, 202)
+    response.headers["Location"] = url_for("get_translation", job_id=job.id)
+    return response, status_code
+
+@app.route('/translate/<job_id>')
+def get_translation(job_id):
+    """Return a job's status; ?wait=N long-polls for up to N seconds."""
+    try:
+        wait = float(request.args.get("wait", 0) or 0)
+    except ValueError:
+        wait = math.nan
+    if not math.isfinite(wait) or wait < 0:
+        return jsonify({"error": "'wait' must be a non-negative number of seconds"}), 400
+    wait = min(wait, 60.0)
+    job = get_job_queue().wait(job_id, timeout=wait) if wait > 0 else get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return job_response(job)
+
+@app.route('/translate/<job_id>/audio')
+def get_translation_audio(job_id):
+    """Return the translated audio of a finished job."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if not job.audio_path:
+        return jsonify({"error": f"No audio available (status: {job.status})"}), 409
+    try:
+        return send_file(job.audio_path, mimetype="audio/mpeg")
+    except FileNotFoundError:
+        # Reaped by the artifact store's age or size limits
+        return jsonify({"error": "Audio has expired"}), 410
+
+@app.route('/translate/<job_id>/events')
+def stream_translation(job_id):
+    """Stream a job's status changes as server-sent events until it finishes."""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+
+    def events():
+        last_status = None
+        while True:
+            finished = job.done.wait(1.0)
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+            if finished:
+                return
+            # Keep idle connections from being closed by proxies
+            yield ": keep-alive\n\n"
+
+    return Response(events(), mimetype="text/event-stream")
+
 def run():
     """Run the Streamlit app."""
     # Add the project root to Python path
@@ -36,6 +151,7 @@ def run():
         "server.enableXsrfProtection": False
     }
     
+    import streamlit.web.bootstrap as bootstrap
     bootstrap.run(main_app_path, "", flag_options)
 
 if __name__ == '__main__':
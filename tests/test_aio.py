@@ -0,0 +1,63 @@
+"""Tests for app.aio with stubbed stages."""
+
+import asyncio
+import threading
+import time
+from app.aio import AsyncVoiceTranslator
+
+class StubSTT:
+    def __init__(self):
+        self.threads = set()
+
+    def transcribe_with_language(self, audio, language=None):
+        self.threads.add(threading.current_thread().name)
+        return audio.decode("utf-8"), language or "es"
+
+class StubTranslator:
+    def translate_text(self, text, source_lang, target_lang):
+        return text.replace("Frase", "Sentence")
+
+class StubTTS:
+    """Earlier chunks take longest, so they finish out of order."""
+
+    backend = type("Backend", (), {"max_chars": 20})()
+
+    def __init__(self):
+        self.chunks = []
+
+    def synthesize_speech(self, text, lang_code, return_type="path", **kwargs):
+        self.chunks.append(text)
+        time.sleep(0.05 * (5 - int(text.split()[-1].rstrip("."))))
+        return f"<{text}>".encode("utf-8")
+
+    def combine_audio_files(self, parts, output_path=None, output_format="mp3", return_type="path"):
+        return b"|".join(parts)
+
+def test_translate_audio_joins_chunks_in_order():
+    stt, tts = StubSTT(), StubTTS()
+    translator = AsyncVoiceTranslator(stt, StubTranslator(), tts, io_workers=4)
+    message = " ".join(f"Frase {n}." for n in range(1, 5)).encode("utf-8")
+    try:
+        result = asyncio.run(translator.translate_audio(message, "auto", "en"))
+    finally:
+        translator.close()
+
+    assert result.source_lang == "es"
+    assert result.translation == "Sentence 1. Sentence 2. Sentence 3. Sentence 4."
+    # Several chunks were synthesized, concurrently, and joined in text order
+    assert len(tts.chunks) > 1
+    assert result.audio == b"|".join(
+        f"<{chunk}>".encode("utf-8")
+        for chunk in sorted(tts.chunks, key=result.translation.index)
+    )
+    assert result.audio.startswith(b"<Sentence 1.")
+    assert stt.threads == {"whisper_0"}
+
+def test_translate_audio_skips_speech_for_silence():
+    translator = AsyncVoiceTranslator(StubSTT(), StubTranslator(), StubTTS())
+    try:
+        result = asyncio.run(translator.translate_audio(b"   ", "es", "en"))
+    finally:
+        translator.close()
+    assert result.translation == ""
+    assert result.audio is None
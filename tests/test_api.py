@@ -0,0 +1,136 @@
+"""Tests for the HTTP translation API in run_app.py with stubbed stages."""
+
+import json
+import threading
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("dotenv")
+
+import run_app
+from app import jobs
+from app.jobs import JobQueue
+
+class StubSTT:
+    """Transcribes instantly unless ``blocked``, then waits for ``release``."""
+
+    model = None
+
+    def __init__(self, blocked=False):
+        self.blocked = blocked
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def transcribe_with_language(self, audio, language=None):
+        self.started.set()
+        if self.blocked:
+            assert self.release.wait(5)
+        return audio.decode("utf-8"), "es" if language == "auto" else language
+
+class StubTranslator:
+    def translate_text(self, text, source_lang, target_lang):
+        return f"[{target_lang}] {text}"
+
+class StubTTS:
+    def synthesize_speech(self, text, lang_code, output_path):
+        output_path.write_bytes(text.encode("utf-8"))
+        return str(output_path)
+
+@pytest.fixture
+def make_client(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "OUTPUT_DIR", tmp_path)
+
+    def make(stt=None, **queue_kwargs):
+        queue = JobQueue(
+            stt=stt or StubSTT(),
+            translator=StubTranslator(),
+            tts=StubTTS(),
+            **queue_kwargs
+        )
+        monkeypatch.setattr(run_app, "get_job_queue", lambda: queue)
+        return run_app.app.test_client()
+
+    return make
+
+def _submit(client, audio=b"hola", source="auto", target="en"):
+    return client.post(f"/translate?source={source}&target={target}", data=audio)
+
+def test_submit_then_fetch_result_and_audio(make_client):
+    client = make_client()
+    response = _submit(client)
+    assert response.status_code == 202
+    job = response.get_json()
+    assert response.headers["Location"] == job["links"]["self"]
+
+    response = client.get(f"{job['links']['self']}?wait=5")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "done"
+    assert body["detected_lang"] == "es"
+    assert body["translation"] == "[en] hola"
+
+    response = client.get(body["links"]["audio"])
+    assert response.status_code == 200
+    assert response.data == b"[en] hola"
+
+def test_submit_rejects_bad_requests(make_client):
+    client = make_client()
+    assert _submit(client, audio=b"").status_code == 400
+    assert client.post("/translate?target=en", data=b"hola").status_code == 400
+    assert _submit(client, target="xx").status_code == 400
+
+def test_full_queue_answers_503_with_retry_after(make_client):
+    stt = StubSTT(blocked=True)
+    client = make_client(stt, workers=1, max_queue=1)
+    try:
+        assert _submit(client).status_code == 202
+        # The worker holds the first job; the second fills the queue
+        assert stt.started.wait(5)
+        assert _submit(client).status_code == 202
+
+        response = _submit(client)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+    finally:
+        stt.release.set()
+
+@pytest.mark.parametrize("wait", ["soon", "-1", "nan", "inf"])
+def test_invalid_wait_is_rejected(make_client, wait):
+    client = make_client()
+    job = _submit(client).get_json()
+    response = client.get(f"{job['links']['self']}?wait={wait}")
+    assert response.status_code == 400
+
+def test_unknown_job_is_404(make_client):
+    client = make_client()
+    assert client.get("/translate/missing").status_code == 404
+    assert client.get("/translate/missing/audio").status_code == 404
+    assert client.get("/translate/missing/events").status_code == 404
+
+def test_reaped_audio_is_gone(make_client, tmp_path):
+    client = make_client()
+    job = _submit(client).get_json()
+    body = client.get(f"{job['links']['self']}?wait=5").get_json()
+
+    # The artifact store removed the file after its time was up
+    (tmp_path / f"job_{job['id']}.mp3").unlink()
+    response = client.get(body["links"]["audio"])
+    assert response.status_code == 410
+
+def test_event_stream_ends_when_the_job_finishes(make_client):
+    stt = StubSTT(blocked=True)
+    client = make_client(stt)
+    job = _submit(client).get_json()
+    assert stt.started.wait(5)
+    stt.release.set()
+
+    response = client.get(job["links"]["events"])
+    assert response.mimetype == "text/event-stream"
+    # Reading the whole body only returns once the stream has ended
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[-1]["status"] == "done"
+    assert events[-1]["translation"] == "[en] hola"
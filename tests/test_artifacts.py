@@ -0,0 +1,134 @@
+"""Tests for app.artifacts."""
+
+import os
+import time
+import pytest
+from app import artifacts
+from app.artifacts import ArtifactStore
+
+class FakeClock:
+    """Stands in for the time module inside app.artifacts."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(artifacts, "time", clock)
+    return clock
+
+def _store(**kwargs) -> ArtifactStore:
+    kwargs.setdefault("max_age_hours", 1)
+    kwargs.setdefault("max_files", 100)
+    kwargs.setdefault("max_bytes", 1 << 20)
+    kwargs.setdefault("adopt_dirs", ())
+    store = ArtifactStore(**kwargs)
+    # Tests call reap() themselves; keep the background thread out of the way
+    store._ensure_started = lambda: None
+    return store
+
+def _file(directory, name: str, size: int = 100) -> str:
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+def test_files_expire_in_ttl_order(clock, tmp_path):
+    store = _store()
+    short = store.register(_file(tmp_path, "short.mp3"), ttl=10)
+    refreshed = store.register(_file(tmp_path, "refreshed.mp3"), ttl=30)
+    default = store.register(_file(tmp_path, "default.mp3"))
+
+    clock.now += 15
+    assert store.reap() == 1
+    assert not os.path.exists(short)
+    # Registering again replaces the expiry; the old heap item is ignored
+    store.register(refreshed, ttl=100)
+
+    clock.now += 60
+    assert store.reap() == 0
+    assert os.path.exists(refreshed)
+
+    clock.now += 3600
+    assert store.reap() == 2
+    assert not os.path.exists(refreshed) and not os.path.exists(default)
+    assert len(store) == 0 and store.total_bytes == 0
+
+def test_count_quota_removes_oldest_first(clock, tmp_path):
+    store = _store(max_files=2)
+    paths = [store.register(_file(tmp_path, f"{name}.mp3")) for name in "abc"]
+    assert store.reap() == 1
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
+
+def test_byte_quota_removes_oldest_first(clock, tmp_path):
+    store = _store(max_bytes=250)
+    first = store.register(_file(tmp_path, "a.mp3", 100))
+    second = store.register(_file(tmp_path, "b.mp3", 100))
+    # Refreshing moves a file to the back of the line
+    store.register(first)
+    third = store.register(_file(tmp_path, "c.mp3", 100))
+    assert store.reap() == 1
+    assert not os.path.exists(second)
+    assert os.path.exists(first) and os.path.exists(third)
+    assert store.total_bytes == 200
+
+def test_forget_keeps_the_file(clock, tmp_path):
+    store = _store()
+    path = store.register(_file(tmp_path, "kept.mp3"), ttl=1)
+    store.forget(path)
+    clock.now += 10
+    assert store.reap() == 0
+    assert os.path.exists(path)
+
+def test_adoption_skips_cache_and_temporary_files(clock, tmp_path):
+    leftover = _file(tmp_path, "tts_en_old.mp3")
+    cached = _file(tmp_path, "tts_cache_abc.mp3")
+    partial = _file(tmp_path, ".tmp123.tmp")
+    (tmp_path / "subdir").mkdir()
+    # Two hours old by the fake clock, so past its one-hour lifetime
+    os.utime(leftover, (clock.now - 7200, clock.now - 7200))
+
+    store = _store()
+    store.adopt(tmp_path)
+    assert len(store) == 1
+    assert store.reap() == 1
+    assert not os.path.exists(leftover)
+    assert os.path.exists(cached) and os.path.exists(partial)
+
+def test_adopted_files_are_older_than_registered_ones(clock, tmp_path):
+    store = _store(max_files=1)
+    fresh = store.register(_file(tmp_path, "fresh.mp3"))
+    leftovers = tmp_path / "leftovers"
+    leftovers.mkdir()
+    old = _file(leftovers, "old.mp3")
+    os.utime(old, (clock.now - 60, clock.now - 60))
+
+    store.adopt(leftovers)
+    assert store.reap() == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(fresh)
+
+def test_reaper_thread_adopts_and_enforces_quotas(tmp_path):
+    leftovers = tmp_path / "leftovers"
+    leftovers.mkdir()
+    old = _file(leftovers, "old.mp3")
+    store = ArtifactStore(
+        max_age_hours=1,
+        max_files=1,
+        max_bytes=1 << 20,
+        interval=3600,
+        adopt_dirs=(leftovers,)
+    )
+    # The first registration starts the thread, which adopts the leftover
+    # and then removes it to get back under the count quota
+    fresh = store.register(_file(tmp_path, "fresh.mp3"))
+
+    deadline = time.monotonic() + 5
+    while os.path.exists(old) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(old)
+    assert os.path.exists(fresh)
+    assert len(store) == 1
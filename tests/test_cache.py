@@ -0,0 +1,80 @@
+"""Tests for app.cache."""
+
+import os
+import threading
+import pytest
+from app.cache import FileCache, SQLiteCache
+
+def test_put_bytes_and_get(tmp_path):
+    cache = FileCache(tmp_path, max_bytes=1 << 20)
+    path = cache.put("abc", ".mp3", b"audio")
+    assert path.read_bytes() == b"audio"
+    assert cache.get("abc", ".mp3") == path
+    assert cache.get("missing", ".mp3") is None
+
+def test_put_copies_file(tmp_path):
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"audio")
+    cache = FileCache(tmp_path / "cache", max_bytes=1 << 20)
+    path = cache.put("abc", ".mp3", source)
+    assert path.read_bytes() == b"audio"
+    assert source.exists()
+
+def test_concurrent_puts_of_one_key(tmp_path):
+    cache = FileCache(tmp_path, max_bytes=1 << 20)
+    content = b"x" * 100_000
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def put():
+        barrier.wait()
+        try:
+            for _ in range(20):
+                cache.put("same", ".mp3", content)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.get("same", ".mp3").read_bytes() == content
+    # No temporary files are left behind
+    assert [path.name for path in tmp_path.iterdir()] == ["cache_same.mp3"]
+    assert cache.total_bytes == len(content)
+
+def test_eviction_keeps_byte_budget(tmp_path):
+    cache = FileCache(tmp_path, max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.put(key, ".mp3", b"x" * 100)
+    assert cache.get("a", ".mp3") is None
+    assert cache.get("b", ".mp3") is not None
+    assert cache.get("c", ".mp3") is not None
+    assert cache.total_bytes == 200
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_sqlite_cache_reconnects_in_forked_child(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.set("parent", "before fork")
+    parent_conn = cache._conn
+
+    pid = os.fork()
+    if pid == 0:
+        # Exit without running pytest's teardown in the child
+        code = 1
+        try:
+            cache.set("child", "from child")
+            if cache._conn is not parent_conn and cache.get("parent") == "before fork":
+                code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert cache._conn is parent_conn
+    assert cache.get("child") == "from child"
+    cache.set("parent", "after fork")
+    assert cache.get("parent") == "after fork"
@@ -0,0 +1,78 @@
+"""Tests for app.cli with stubbed stages."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from app import cli
+
+class StubSTT:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def transcribe_with_language(self, path, language=None):
+        name = Path(path).stem
+        self.calls.append(name)
+        if name in self.failing:
+            raise RuntimeError(f"cannot decode {name}")
+        return f"hola {name}", "es"
+
+class StubTranslator:
+    def translate_text(self, text, source_lang, target_lang):
+        return f"[{target_lang}] {text}"
+
+class StubTTS:
+    def synthesize_speech(self, text, lang_code, output_path):
+        Path(output_path).write_bytes(text.encode("utf-8"))
+        return str(output_path)
+
+@pytest.fixture
+def stt(monkeypatch):
+    stt = StubSTT(failing={"b"})
+
+    def init_worker(model_name, precision, threads, log_json):
+        cli._worker.update(stt=stt, translator=StubTranslator(), tts=StubTTS())
+
+    # Threads share the stubs, and nothing is loaded
+    monkeypatch.setattr(cli, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(cli, "_init_worker", init_worker)
+    monkeypatch.setattr(cli, "_worker", {})
+    return stt
+
+def _records(manifest: Path) -> list[dict]:
+    return [json.loads(line) for line in manifest.read_text(encoding="utf-8").splitlines()]
+
+def test_rerun_skips_items_that_succeeded(stt, tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    for name in ("a", "b", "c"):
+        (inputs / f"{name}.mp3").write_bytes(b"audio")
+    output = tmp_path / "out"
+
+    assert cli.run_batch(inputs, output, "auto", "en", workers=2) == (2, 1, 0)
+    records = _records(output / "manifest.jsonl")
+    assert sorted((Path(r["input"]).stem, r["status"]) for r in records) == [
+        ("a", "ok"), ("b", "error"), ("c", "ok")
+    ]
+    assert (output / "a.en.txt").read_text(encoding="utf-8") == "[en] hola a"
+    assert (output / "c.en.mp3").read_bytes() == b"[en] hola c"
+
+    # A crash mid-write leaves a partial last line, which is ignored
+    with open(output / "manifest.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id": "')
+    stt.failing.clear()
+    stt.calls.clear()
+    assert cli.run_batch(inputs, output, "auto", "en", workers=2) == (1, 0, 2)
+    # Only the failed item was processed again
+    assert stt.calls == ["b"]
+    assert (output / "b.en.txt").read_text(encoding="utf-8") == "[en] hola b"
+    # The new record did not land on the partial line
+    stt.calls.clear()
+    assert cli.run_batch(inputs, output, "auto", "en", workers=2) == (0, 0, 3)
+    assert stt.calls == []
+
+    # Another language pair is a different unit of work
+    stt.calls.clear()
+    assert cli.run_batch(inputs, output, "auto", "fr", workers=1) == (3, 0, 0)
+    assert sorted(stt.calls) == ["a", "b", "c"]
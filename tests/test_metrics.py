@@ -0,0 +1,43 @@
+"""Tests for app.metrics."""
+
+import pytest
+from app import metrics
+from app.metrics import default_metrics, profiled, stage
+
+def _errors(name: str) -> float:
+    return default_metrics.value("stage_errors_total", stage=name)
+
+def test_stage_counts_exceptions_as_errors():
+    with pytest.raises(ValueError):
+        with stage("test_failing"):
+            raise ValueError("bad input")
+    assert _errors("test_failing") == 1
+
+def test_stage_passes_interrupts_through_uncounted():
+    with pytest.raises(KeyboardInterrupt):
+        with stage("test_interrupted"):
+            raise KeyboardInterrupt
+
+    def stream():
+        with stage("test_closed"):
+            yield 1
+            yield 2
+
+    items = stream()
+    next(items)
+    # Closing the generator raises GeneratorExit inside the stage
+    items.close()
+    assert _errors("test_interrupted") == 0
+    assert _errors("test_closed") == 0
+
+def test_profiled_writes_to_the_configured_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, "PROFILE_DIR", str(tmp_path))
+    with profiled("request"):
+        sum(range(1000))
+    assert [path.suffix for path in tmp_path.iterdir()] == [".prof"]
+
+def test_profiled_is_off_without_a_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, "PROFILE_DIR", None)
+    with profiled("request"):
+        pass
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,80 @@
+"""Tests for app.pipeline with stubbed stages."""
+
+import itertools
+import threading
+import pytest
+from app.pipeline import StreamingPipeline
+
+class StubSTT:
+    """Yields fixed segments, reporting ``detected`` as the spoken language."""
+
+    def __init__(self, segments, detected="es"):
+        self.segments = segments
+        self.detected = detected
+        self.yielded = 0
+        self.closed = threading.Event()
+
+    def iter_segments(self, audio_path, language=None, on_language=None):
+        try:
+            if on_language is not None:
+                on_language(language if language not in (None, "auto") else self.detected)
+            for segment in self.segments:
+                self.yielded += 1
+                yield segment
+        finally:
+            self.closed.set()
+
+class StubTranslator:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+
+    def translate_text(self, text, source_lang, target_lang):
+        self.calls.append((text, source_lang, target_lang))
+        if text == self.fail_on:
+            raise RuntimeError(f"cannot translate {text!r}")
+        return f"[{target_lang}] {text}"
+
+class StubTTS:
+    def synthesize_speech(self, text, lang_code, **kwargs):
+        return text.encode("utf-8")
+
+def _pipeline(stt, translator=None, queue_size=8):
+    return StreamingPipeline(stt, translator or StubTranslator(), StubTTS(), queue_size=queue_size)
+
+def test_chunks_come_out_in_sentence_order():
+    stt = StubSTT(["Hola a todos. Qué", "tal estáis? Bien", "gracias."])
+    translator = StubTranslator()
+    chunks = list(_pipeline(stt, translator).run(b"audio", "auto", "en"))
+
+    assert [chunk.index for chunk in chunks] == [0, 1, 2]
+    assert [chunk.transcript for chunk in chunks] == [
+        "Hola a todos.", "Qué tal estáis?", "Bien gracias."
+    ]
+    assert [chunk.audio_path for chunk in chunks] == [
+        f"[en] {chunk.transcript}".encode("utf-8") for chunk in chunks
+    ]
+    # The detected language reaches the translator and the chunks
+    assert {call[1] for call in translator.calls} == {"es"}
+    assert {chunk.source_lang for chunk in chunks} == {"es"}
+
+def test_consumer_stopping_early_stops_the_workers():
+    stt = StubSTT(f"Frase número {n}." for n in itertools.count())
+    results = _pipeline(stt, queue_size=2).run(b"audio", "es", "en")
+
+    first = next(results)
+    assert first.transcript == "Frase número 0."
+    results.close()
+
+    # The transcription worker gives up on its full queue and drops the source
+    assert stt.closed.wait(5)
+    # Only the bounded queues' worth of sentences was ever produced
+    assert stt.yielded < 20
+
+def test_stage_errors_reach_the_consumer():
+    stt = StubSTT(["Uno.", "Dos.", "Tres."])
+    results = _pipeline(stt, StubTranslator(fail_on="Dos.")).run(b"audio", "es", "en")
+
+    assert next(results).transcript == "Uno."
+    with pytest.raises(RuntimeError, match="cannot translate 'Dos.'"):
+        next(results)
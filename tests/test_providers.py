@@ -0,0 +1,162 @@
+"""Tests for app.providers, with a fake clock and a local stub server."""
+
+import pytest
+from app.providers import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderClient,
+    ProviderError,
+    TokenBucket,
+    backoff_delay
+)
+from benchmarks.stubs import TranslateStub
+
+class FakeClock:
+    """Monotonic time that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+def test_token_bucket_allows_bursts_then_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert not bucket.acquire(timeout=0)
+    # Half a second adds one token at two per second
+    clock.advance(0.5)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+    # Idle time never stores more than the capacity
+    clock.advance(60)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert not bucket.acquire(timeout=0)
+
+def test_token_bucket_without_rate_is_unlimited():
+    bucket = TokenBucket(rate=0, capacity=1, clock=FakeClock())
+    assert all(bucket.acquire(timeout=0) for _ in range(100))
+
+def test_breaker_opens_at_threshold_and_half_opens_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 10
+
+    clock.advance(10)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+def test_breaker_reopens_after_failed_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.advance(5)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 5
+
+def test_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=FakeClock())
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_disabled_with_zero_threshold():
+    breaker = CircuitBreaker(failure_threshold=0, reset_timeout=5, clock=FakeClock())
+    for _ in range(100):
+        breaker.record_failure()
+    assert breaker.allow()
+
+def test_backoff_delay_is_jittered_below_the_exponential_cap():
+    for attempt in range(8):
+        delays = [backoff_delay(attempt, 0.5, cap=10) for _ in range(200)]
+        assert all(0 <= delay <= min(10, 0.5 * 2 ** attempt) for delay in delays)
+    assert len(set(backoff_delay(3, 1.0) for _ in range(20))) > 1
+
+@pytest.fixture
+def stub():
+    with TranslateStub(latency=0) as server:
+        yield server
+
+def _provider(**kwargs) -> ProviderClient:
+    kwargs.setdefault("rate_limit", 0)
+    kwargs.setdefault("retry_backoff", 0)
+    return ProviderClient("test_provider", **kwargs)
+
+def test_client_reuses_connections(stub):
+    provider = _provider()
+    for _ in range(5):
+        assert provider.request("GET", stub.url, params={"q": "hi", "tl": "es"}).status_code == 200
+    assert stub.requests == 5
+    assert stub.connections == 1
+
+def test_client_retries_throttling(stub):
+    stub.error_rate = 1.0
+    provider = _provider(max_retries=2, failure_threshold=0)
+    with pytest.raises(ProviderError) as info:
+        provider.request("GET", stub.url)
+    assert info.value.status == 429
+    assert info.value.retriable
+    assert stub.requests == 3
+
+def test_client_does_not_retry_bad_requests(stub):
+    stub.error_rate = 1.0
+    stub.error_status = 400
+    provider = _provider(max_retries=2, failure_threshold=1)
+    with pytest.raises(ProviderError) as info:
+        provider.request("GET", stub.url)
+    assert not info.value.retriable
+    assert stub.requests == 1
+    # The provider answered, so it is not considered unhealthy
+    assert provider.breaker.state == CircuitBreaker.CLOSED
+
+def test_client_fails_fast_once_the_circuit_opens(stub):
+    stub.error_rate = 1.0
+    stub.error_status = 503
+    provider = _provider(max_retries=0, failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ProviderError):
+            provider.request("GET", stub.url)
+    with pytest.raises(CircuitOpenError):
+        provider.request("GET", stub.url)
+    assert stub.requests == 2
+
+def test_unexpected_error_during_probe_does_not_keep_circuit_open(stub):
+    clock = FakeClock()
+    provider = _provider(max_retries=0)
+    provider.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    provider.breaker.record_failure()
+    clock.advance(10)
+
+    class BrokenSession:
+        def request(self, *args, **kwargs):
+            raise RuntimeError("not a requests error")
+
+    session = provider.session
+    provider._session = BrokenSession()
+    with pytest.raises(RuntimeError):
+        provider.request("GET", stub.url)
+
+    # The next caller may probe again, and a success closes the circuit
+    provider._session = session
+    assert provider.request("GET", stub.url).status_code == 200
+    assert provider.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,82 @@
+"""Tests for app.segmenter."""
+
+import pytest
+from app.segmenter import (
+    ends_sentence,
+    join_sentences,
+    pack,
+    segment_text,
+    split_complete,
+    split_sentences
+)
+
+@pytest.mark.parametrize("text, lang, expected", [
+    # Abbreviations
+    ("Dr. Smith arrived. He sat down.", "en", ["Dr. Smith arrived.", "He sat down."]),
+    ("Bring fruit, e.g. apples. Thanks.", "en", ["Bring fruit, e.g. apples.", "Thanks."]),
+    ("Der Zug kommt ca. um neun. Gut.", "de", ["Der Zug kommt ca. um neun.", "Gut."]),
+    ("Hola Sra. García. Adiós.", "es", ["Hola Sra. García.", "Adiós."]),
+    # Decimals, versions and URLs stay whole
+    ("It costs 3.50 dollars. Cheap.", "en", ["It costs 3.50 dollars.", "Cheap."]),
+    ("See example.com for v1.2. Done.", "en", ["See example.com for v1.2.", "Done."]),
+    # Ellipses
+    ("Wait... what? Yes.", "en", ["Wait... what?", "Yes."]),
+    ("Wait… Then go.", "en", ["Wait…", "Then go."]),
+    ("Well... I think so. Right.", "en", ["Well...", "I think so.", "Right."]),
+    # Single letters: initials versus words ending a sentence
+    ("The answer is A. Next question.", "en", ["The answer is A.", "Next question."]),
+    ("I met John F. Kennedy there. Wow.", "en", ["I met John F. Kennedy there.", "Wow."]),
+    ("J. R. R. Tolkien wrote it. Yes.", "en", ["J. R. R. Tolkien wrote it.", "Yes."]),
+    ("Pick option b. Then go.", "en", ["Pick option b.", "Then go."]),
+    # Question and exclamation marks, closing quotes
+    ("Really?! Yes. \"Stop.\" Then.", "en", ["Really?!", "Yes.", "\"Stop.\"", "Then."]),
+    # CJK punctuation ends sentences without spaces
+    ("你好。今天天气很好！你呢？", "zh", ["你好。", "今天天气很好！", "你呢？"]),
+    ("こんにちは。元気ですか？", "ja", ["こんにちは。", "元気ですか？"]),
+    ("안녕하세요. 반갑습니다！", "ko", ["안녕하세요.", "반갑습니다！"]),
+])
+def test_split_sentences(text, lang, expected):
+    assert split_sentences(text, lang) == expected
+
+def test_unknown_language_uses_every_terminator():
+    assert split_sentences("Hi。There.", None) == ["Hi。", "There."]
+
+def test_split_complete_keeps_unfinished_remainder():
+    assert split_complete("One. Two. Thr", "en") == (["One.", "Two."], "Thr")
+    assert split_complete("One. Two.", "en") == (["One.", "Two."], "")
+    assert ends_sentence("Done!  ", "en")
+    assert not ends_sentence("Dr.", "en")
+
+def test_join_sentences_follows_spacing():
+    assert join_sentences(["One.", "Two."], "en") == "One. Two."
+    assert join_sentences(["你好。", "再见。"], "zh") == "你好。再见。"
+
+def test_pack_fills_chunks_up_to_the_limit():
+    sentences = ["a" * 40 + ".", "b" * 40 + ".", "c" * 40 + "."]
+    chunks = pack(sentences, 100, "en")
+    assert chunks == [sentences[0] + " " + sentences[1], sentences[2]]
+
+def test_pack_splits_long_sentences_at_clauses_then_words():
+    sentence = "one two three, four five six, seven eight nine."
+    chunks = pack([sentence], 20, "en")
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert " ".join(chunks) == sentence
+    assert chunks[0] == "one two three,"
+
+def test_pack_cuts_words_longer_than_the_limit():
+    assert pack(["x" * 25], 10) == ["x" * 10, "x" * 10, "x" * 5]
+
+def test_pack_rejects_non_positive_limit():
+    with pytest.raises(ValueError):
+        pack(["a."], 0)
+
+@pytest.mark.parametrize("lang", ["en", "zh", None])
+def test_segment_text_respects_limit_and_keeps_text(lang):
+    text = "这是一个很长的句子。" * 30 if lang == "zh" else "This is a fairly long sentence. " * 30
+    chunks = segment_text(text, lang, max_chars=100)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    joiner = "" if lang == "zh" else " "
+    assert joiner.join(chunks) == text.strip()
+    # Greedy packing leaves no two neighbours that would fit together
+    for first, second in zip(chunks, chunks[1:]):
+        assert len(first + joiner + second) > 100
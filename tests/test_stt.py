@@ -0,0 +1,255 @@
+"""Tests for app.stt that run without Whisper."""
+
+import sys
+import threading
+import time
+import types
+import numpy as np
+import pytest
+from app import stt as stt_module
+from app.cache import SQLiteCache
+from app.stt import ModelRegistry, SpeechToText, _merge_overlap
+from app.utils import SAMPLE_RATE
+
+class FakeModel:
+    """Stands in for Whisper: the text names the audio it was given."""
+
+    def transcribe(self, audio, language=None, fp16=False):
+        time.sleep(0.05)
+        return {"text": f"clip{round(float(audio.mean()))}", "language": language or "en"}
+
+def test_merge_overlap_drops_repeated_words():
+    assert _merge_overlap("the quick brown fox", "Brown fox jumps") == "the quick brown fox jumps"
+    assert _merge_overlap("", "hello") == "hello"
+
+def load_fake_model(name: str, device: str) -> FakeModel:
+    """Registry loader the pool workers can unpickle."""
+    return FakeModel()
+
+def test_concurrent_parallel_transcriptions_keep_their_audio(monkeypatch, tmp_path):
+    # Pool workers start from a fresh interpreter, where only the path
+    # reaches them; give them a torch that can set its thread count
+    (tmp_path / "torch.py").write_text(
+        "def get_num_threads():\n    return 0\n\n"
+        "def set_num_threads(threads):\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(
+        stt_module,
+        "decode_audio",
+        lambda audio: np.full(90 * SAMPLE_RATE, int(audio), dtype=np.float32)
+    )
+    processor = SpeechToText(
+        registry=ModelRegistry(loader=load_fake_model),
+        device="cpu",
+        parallel_workers=2,
+        parallel_min_seconds=60,
+        threads=1
+    )
+    assert processor._use_parallel(90)
+    barrier = threading.Barrier(2)
+    results = {}
+    errors = []
+
+    def transcribe(clip: int):
+        barrier.wait()
+        try:
+            results[clip] = processor.transcribe_with_language(str(clip).encode(), "en")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=transcribe, args=(clip,)) for clip in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    # Overlapping windows repeat the same word, which the merge collapses
+    assert results[1] == ("clip1", "en")
+    assert results[2] == ("clip2", "en")
+
+class LoadedModel:
+    """What the fake loader hands out."""
+
+    def __init__(self, name: str, device: str):
+        self.name = name
+        self.device = device
+
+    def modules(self):
+        return [self]
+
+class FakeLoader:
+    """Counts loads; loads of names in ``blocked`` wait for ``release``."""
+
+    def __init__(self, blocked=()):
+        self.loads = []
+        self.blocked = set(blocked)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, name: str, device: str):
+        self.loads.append((name, device))
+        if name in self.blocked:
+            self.started.set()
+            assert self.release.wait(5)
+        return LoadedModel(name, device)
+
+def test_registry_loads_once_and_evicts_least_recently_used():
+    loader = FakeLoader()
+    registry = ModelRegistry(max_models=2, loader=loader)
+    tiny = registry.get("tiny", "cpu")
+    assert registry.get("tiny", "cpu") is tiny
+    registry.get("base", "cpu")
+    # Using tiny again makes base the least recently used
+    registry.get("tiny", "cpu")
+    registry.get("small", "cpu")
+    assert registry.loaded() == [("tiny", "cpu", "fp32"), ("small", "cpu", "fp32")]
+    assert loader.loads == [("tiny", "cpu"), ("base", "cpu"), ("small", "cpu")]
+    # An evicted model is loaded again on demand
+    registry.get("base", "cpu")
+    assert loader.loads[-1] == ("base", "cpu")
+
+def test_registry_keys_models_by_device_and_precision():
+    registry = ModelRegistry(max_models=4, loader=FakeLoader())
+    assert registry.get("base", "cpu") is not registry.get("base", "cuda")
+    assert registry.get("base", "cuda", "fp16").device == "cuda"
+    assert len(registry.loaded()) == 3
+
+def test_registry_load_does_not_block_other_models():
+    loader = FakeLoader(blocked={"small"})
+    registry = ModelRegistry(max_models=2, loader=loader)
+    tiny = registry.get("tiny", "cpu")
+    waiters = [threading.Thread(target=registry.get, args=("small", "cpu")) for _ in range(2)]
+    for thread in waiters:
+        thread.start()
+    assert loader.started.wait(5)
+
+    # While small is loading, tiny is served and its lock handed out
+    start = time.perf_counter()
+    assert registry.get("tiny", "cpu") is tiny
+    registry.inference_lock("tiny", "cpu")
+    assert time.perf_counter() - start < 1
+
+    loader.release.set()
+    for thread in waiters:
+        thread.join()
+    # Concurrent callers of one model share a single load
+    assert loader.loads.count(("small", "cpu")) == 1
+
+def test_short_and_long_clips_pick_their_models():
+    processor = SpeechToText(
+        model_name="base",
+        short_model="tiny",
+        long_model="small",
+        long_audio_threshold=30.0
+    )
+    assert processor.select_model_name(5.0) == "tiny"
+    assert processor.select_model_name(30.0) == "small"
+    assert SpeechToText(model_name="base").select_model_name(600.0) == "base"
+    # Cache keys cover the whole model configuration
+    assert processor._cache_key("hash", None) != SpeechToText(model_name="base")._cache_key("hash", None)
+
+@pytest.fixture
+def fake_torch(monkeypatch):
+    """Minimal torch and whisper.model modules for the quantization path."""
+    torch = types.ModuleType("torch")
+    torch.qint8 = "qint8"
+    torch.nn = types.SimpleNamespace(Linear=type("Linear", (), {}))
+    torch.cuda = types.SimpleNamespace(is_available=lambda: False)
+    calls = []
+
+    def quantize_dynamic(model, layers, dtype):
+        calls.append((model, layers, dtype))
+        return ("quantized", model)
+
+    torch.quantization = types.SimpleNamespace(quantize_dynamic=quantize_dynamic)
+    torch.calls = calls
+
+    whisper_model = types.ModuleType("whisper.model")
+    # Whisper's own Linear subclasses torch's
+    whisper_model.Linear = type("Linear", (torch.nn.Linear,), {})
+    whisper = types.ModuleType("whisper")
+    whisper.model = whisper_model
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    monkeypatch.setitem(sys.modules, "whisper", whisper)
+    monkeypatch.setitem(sys.modules, "whisper.model", whisper_model)
+    return torch
+
+class LayeredModel:
+    """A model whose modules() lists Whisper and plain layers."""
+
+    def __init__(self, layers):
+        self.layers = layers
+
+    def modules(self):
+        return [self, *self.layers]
+
+def test_quantize_swaps_whisper_linear_layers(fake_torch):
+    from whisper.model import Linear
+
+    other = object()
+    model = LayeredModel([Linear(), Linear(), other])
+    quantized = stt_module._quantize(model)
+
+    assert quantized == ("quantized", model)
+    assert [type(layer) for layer in model.layers[:2]] == [fake_torch.nn.Linear] * 2
+    assert model.layers[2] is other
+    assert fake_torch.calls == [(model, {fake_torch.nn.Linear}, "qint8")]
+
+def test_registry_quantizes_int8_models_on_cpu(fake_torch):
+    loader = FakeLoader()
+    registry = ModelRegistry(loader=loader)
+    model = registry.get("base", None, "int8")
+    assert model[0] == "quantized"
+    assert loader.loads == [("base", "cpu")]
+    assert registry.loaded() == [("base", "cpu", "int8")]
+    with pytest.raises(ValueError):
+        registry.get("base", "cuda", "int8")
+    with pytest.raises(ValueError):
+        SpeechToText(precision="int4")
+
+class Mel:
+    def to(self, device):
+        return self
+
+    def half(self):
+        return self
+
+class MultilingualModel:
+    """Detects Latin first, which the app does not support, then Spanish."""
+
+    is_multilingual = True
+    dims = types.SimpleNamespace(n_mels=80)
+    device = "cpu"
+
+    def __init__(self):
+        self.calls = []
+
+    def detect_language(self, mel):
+        return None, {"la": 0.6, "es": 0.3, "en": 0.1}
+
+    def transcribe(self, audio, language=None, fp16=False):
+        self.calls.append(language)
+        return {"text": " hola ", "language": language}
+
+def test_auto_language_detection_picks_a_supported_language(monkeypatch, tmp_path):
+    whisper = types.ModuleType("whisper")
+    whisper.pad_or_trim = lambda audio: audio
+    whisper.log_mel_spectrogram = lambda audio, n_mels: Mel()
+    monkeypatch.setitem(sys.modules, "whisper", whisper)
+    monkeypatch.setattr(stt_module, "decode_audio", lambda audio: np.zeros(5 * SAMPLE_RATE, np.float32))
+
+    model = MultilingualModel()
+    processor = SpeechToText(
+        registry=ModelRegistry(loader=lambda name, device: model),
+        device="cpu",
+        transcript_cache=SQLiteCache(tmp_path / "transcripts.sqlite3"),
+        parallel_workers=1
+    )
+    assert processor.transcribe_with_language(b"audio", "auto") == ("hola", "es")
+    # The whole recording is transcribed once, in the detected language
+    assert model.calls == ["es"]
+    # The detected language is cached with the transcript
+    assert processor.transcribe_with_language(b"audio") == ("hola", "es")
+    assert model.calls == ["es"]
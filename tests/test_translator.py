@@ -0,0 +1,100 @@
+"""Tests for app.translator against a local Google Translate stub."""
+
+import pytest
+from app.providers import ProviderClient
+from app.translator import MAX_REQUEST_CHARS, GoogleWebClient, Translator
+from benchmarks.stubs import TranslateStub, translate_client_factory
+
+@pytest.fixture
+def stub():
+    with TranslateStub(latency=0, detected_lang="es") as server:
+        yield server
+
+def _client(stub, **provider_kwargs) -> GoogleWebClient:
+    provider = ProviderClient("test_translate", rate_limit=0, **provider_kwargs)
+    return GoogleWebClient(
+        "auto",
+        "en",
+        base_url=stub.url,
+        provider=provider,
+        detect_url=f"{stub.url}/translate_a/single"
+    )
+
+def test_translate(stub):
+    assert _client(stub).translate("hola") == "[en] hola"
+
+def test_detect_language(stub):
+    client = _client(stub)
+    assert client.detect_language("hola amigos") == "es"
+    # Region suffixes are dropped
+    assert client.detect_language("你好") == "zh"
+    assert client.detect_language("   ") is None
+
+def test_translator_detect_language_uses_its_client_factory(stub):
+    translator = Translator(client_factory=translate_client_factory(stub.url))
+    assert translator.detect_language("hola amigos") == "es"
+    assert translator.translate_text("hola", source_lang="es", target_lang="en") == "[en] hola"
+
+def test_translator_detect_language_returns_none_when_provider_fails(stub):
+    stub.error_rate = 1.0
+    stub.error_status = 503
+    provider = ProviderClient("test_translate", rate_limit=0, max_retries=0)
+    translator = Translator(client_factory=translate_client_factory(stub.url, provider))
+    assert translator.detect_language("hola amigos") is None
+
+def test_unsupported_detected_language_is_none(stub):
+    stub.detected_lang = "xx"
+    translator = Translator(client_factory=translate_client_factory(stub.url))
+    assert translator.detect_language("qwerty") is None
+
+class DroppedLineStub(TranslateStub):
+    """Loses the last line of multi-line requests, as the real page sometimes does."""
+
+    def respond(self, path, body):
+        status, content_type, page = super().respond(path, body)
+        text = page.decode("utf-8")
+        if "\n" in text:
+            text = text[:text.rindex("\n")] + "</div></body></html>"
+        return status, content_type, text.encode("utf-8")
+
+def test_batch_keeps_order_and_translates_duplicates_once(stub):
+    translator = Translator(client_factory=translate_client_factory(stub.url))
+    results = translator.translate_batch(["uno", "dos", " uno ", "", "tres"], "es", "en")
+    assert [result.translation for result in results] == [
+        "[en] uno", "[en] dos", "[en] uno", "", "[en] tres"
+    ]
+    assert all(result.ok for result in results)
+    # Everything fits in one packed request
+    assert stub.requests == 1
+
+def test_batch_splits_requests_at_the_character_limit(stub):
+    texts = [f"{index}" + "x" * 999 for index in range(9)]
+    translator = Translator(client_factory=translate_client_factory(stub.url))
+    packs = translator.backend._pack(list(enumerate(texts)))
+    assert [len(pack) for pack in packs] == [4, 4, 1]
+    assert all(sum(len(text) + 1 for _, text in pack) - 1 <= MAX_REQUEST_CHARS for pack in packs)
+
+    results = translator.translate_batch(texts, "es", "en")
+    assert [result.translation for result in results] == [f"[en] {text}" for text in texts]
+    assert stub.requests == 3
+
+def test_batch_falls_back_to_single_items_on_wrong_line_count():
+    with DroppedLineStub(latency=0) as stub:
+        translator = Translator(client_factory=translate_client_factory(stub.url))
+        results = translator.translate_batch(["uno", "dos", "tres"], "es", "en")
+        assert [result.translation for result in results] == ["[en] uno", "[en] dos", "[en] tres"]
+        # The packed request, then one request per item
+        assert stub.requests == 4
+
+def test_cache_hits_skip_the_network(stub, tmp_path):
+    factory = translate_client_factory(stub.url)
+    translator = Translator(client_factory=factory, cache_path=tmp_path / "translations.sqlite3")
+    assert translator.translate_text("hola", "es", "en") == "[en] hola"
+    assert translator.translate_text("  hola ", "es", "en") == "[en] hola"
+    assert translator.translate_batch(["hola"], "es", "en")[0].translation == "[en] hola"
+    assert stub.requests == 1
+
+    # A new process finds it in the disk cache
+    restarted = Translator(client_factory=factory, cache_path=tmp_path / "translations.sqlite3")
+    assert restarted.translate_text("hola", "es", "en") == "[en] hola"
+    assert stub.requests == 1
@@ -0,0 +1,144 @@
+"""Tests for app.tts."""
+
+import base64
+import inspect
+import json
+import struct
+import types
+from pathlib import Path
+from urllib.parse import parse_qs
+import pytest
+from app.cache import FileCache
+from app.tts import (
+    GTTSBackend,
+    SpeechAudio,
+    TextToSpeech,
+    TTSBackend,
+    _GTTS_AUDIO,
+    _mp3_audio_span,
+)
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, no padding, joint stereo, no CRC
+FRAME_HEADER = b"\xff\xfb\x90\x40"
+FRAME_LENGTH = 144 * 128000 // 44100
+SAMPLES_PER_FRAME = 1152
+
+def _frame(fill: int) -> bytes:
+    return FRAME_HEADER + bytes([fill]) * (FRAME_LENGTH - 4)
+
+def _info_frame(frames: int) -> bytes:
+    """A LAME-style Info frame: empty side information, then the tag."""
+    body = bytes(32) + b"Info" + struct.pack(">II", 0x03, frames)
+    return FRAME_HEADER + body + bytes(FRAME_LENGTH - 4 - len(body))
+
+def _mp3(frames: int, fill: int) -> bytes:
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10)
+    return id3 + _info_frame(frames) + _frame(fill) * frames + b"TAG" + bytes(125)
+
+def _duration(data: bytes) -> float:
+    """Seconds of audio in a bare stream of the frames above, skipping header frames."""
+    assert len(data) % FRAME_LENGTH == 0
+    frames = 0
+    for offset in range(0, len(data), FRAME_LENGTH):
+        frame = data[offset:offset + FRAME_LENGTH]
+        assert frame[:4] == FRAME_HEADER
+        if frame[36:40] not in (b"Xing", b"Info"):
+            frames += 1
+    return frames * SAMPLES_PER_FRAME / 44100
+
+def test_span_skips_tags_and_info_frame():
+    data = _mp3(5, 0x11)
+    start, end, _ = _mp3_audio_span(data)
+    assert data[start:end] == _frame(0x11) * 5
+
+def test_span_without_info_frame():
+    data = _frame(0x11) * 3
+    assert _mp3_audio_span(data)[:2] == (0, len(data))
+
+def test_join_has_no_stray_header_frames():
+    tts = TextToSpeech(backend=object())
+    parts = [_mp3(5, 0x11), _mp3(7, 0x22), _mp3(3, 0x33)]
+    joined = tts.combine_audio_files(parts, return_type="bytes")
+    assert joined == _frame(0x11) * 5 + _frame(0x22) * 7 + _frame(0x33) * 3
+    # Every frame counts towards the duration, and there is no Info frame
+    # describing only the first segment
+    assert b"Info" not in joined
+    assert _duration(joined) == 15 * SAMPLES_PER_FRAME / 44100
+
+class CountingBackend(TTSBackend):
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def synthesize(self, text, lang_code, slow=False):
+        self.calls += 1
+        return SpeechAudio(data=_mp3(2, 0x11), format="mp3")
+
+class VanishingCache(FileCache):
+    """Deletes each file right after looking it up, as a concurrent cleanup could."""
+
+    def get(self, key, extension):
+        path = super().get(key, extension)
+        if path is not None:
+            path.unlink()
+        return path
+
+def test_cached_file_removed_after_lookup_is_a_miss(tmp_path):
+    backend = CountingBackend()
+    cache = VanishingCache(tmp_path / "cache", max_bytes=1 << 20)
+    tts = TextToSpeech(audio_cache=cache, backend=backend)
+
+    assert tts.synthesize_speech("hello", "en", return_type="bytes") == _mp3(2, 0x11)
+    assert backend.calls == 1
+    # The lookup hits, the read finds the file gone, and the audio is made again
+    output = tmp_path / "out.mp3"
+    assert tts.synthesize_speech("hello", "en", output_path=output) == str(output)
+    assert output.read_bytes() == _mp3(2, 0x11)
+    assert backend.calls == 2
+    assert cache.total_bytes == len(_mp3(2, 0x11))
+
+def _pinned_version(package: str) -> str:
+    requirements = Path(__file__).parent.parent / "requirements.txt"
+    for line in requirements.read_text().splitlines():
+        name, _, version = line.partition("==")
+        if name.strip().lower() == package:
+            return version.strip()
+    raise AssertionError(f"{package} is not pinned in requirements.txt")
+
+def test_installed_gtts_is_the_pinned_version():
+    gtts = pytest.importorskip("gtts")
+    # GTTSBackend uses gTTS internals: when the pin moves, check the tests
+    # below against the new version before updating it
+    assert gtts.__version__ == _pinned_version("gtts")
+
+def test_gtts_parses_responses_with_the_backend_pattern():
+    gtts_tts = pytest.importorskip("gtts.tts")
+    assert _GTTS_AUDIO.pattern in inspect.getsource(gtts_tts)
+
+class RecordingProvider:
+    """Answers each request with a batchexecute line holding numbered audio."""
+
+    def __init__(self):
+        self.texts = []
+
+    def request(self, method, url, data=None, headers=None):
+        assert method == "POST"
+        request = json.loads(parse_qs(data)["f.req"][0])
+        text = json.loads(request[0][0][1])[0]
+        self.texts.append(text)
+        audio = base64.b64encode(f"<mp3 {len(self.texts)}>".encode()).decode("ascii")
+        line = '[["wrb.fr","jQ1olc","[\\"' + audio + '\\"]",null,null,null,"generic"]]'
+        return types.SimpleNamespace(text=f")]}}'\n\n{len(line)}\n{line}\n")
+
+def test_gtts_backend_sends_prepared_requests_through_the_provider():
+    pytest.importorskip("gtts")
+    provider = RecordingProvider()
+    text = " ".join(f"Sentence number {n} is here." for n in range(12))
+    audio = GTTSBackend(provider).synthesize(text, "en")
+
+    assert audio.format == "mp3"
+    assert len(provider.texts) > 1
+    assert all(len(part) <= GTTSBackend.max_chars for part in provider.texts)
+    assert " ".join(provider.texts) == text
+    assert audio.data == b"".join(f"<mp3 {n}>".encode() for n in range(1, len(provider.texts) + 1))